@@ -0,0 +1,68 @@
+"""
+Benchmark: plain-text export of ANSI frames
+Compares ansi_parser.strip_ansi against rich's Text.from_ansi(...).plain
+
+Run from the repository root:
+    python benchmarks/bench_strip_ansi.py [frames] [columns] [rows]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from ansi_parser import strip_ansi
+
+CHARS = ' .:-=+*#%@'
+COLOR_CODES = [f'\x1b[{code}m' for code in list(range(30, 38)) + list(range(90, 98))]
+
+
+def make_frame(rng: random.Random, columns: int, rows: int) -> str:
+    """Build a frame shaped like ascii_magic terminal output (one color code per character)"""
+    lines = []
+    for _ in range(rows):
+        cells = [rng.choice(COLOR_CODES) + rng.choice(CHARS) for _ in range(columns)]
+        lines.append(''.join(cells) + '\x1b[39m')
+    return '\n'.join(lines)
+
+
+def time_path(name: str, strip, frames) -> list:
+    """Strip every frame, print timing and return the results"""
+    start = time.perf_counter()
+    results = [strip(frame) for frame in frames]
+    elapsed = time.perf_counter() - start
+    
+    print(f"{name:<12} {elapsed * 1000:>9.1f} ms total   {elapsed * 1000 / len(frames):>7.3f} ms/frame")
+    return results
+
+
+def main():
+    frame_count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    columns = int(sys.argv[2]) if len(sys.argv) > 2 else 120
+    rows = int(sys.argv[3]) if len(sys.argv) > 3 else 50
+    
+    rng = random.Random(0)
+    frames = [make_frame(rng, columns, rows) for _ in range(frame_count)]
+    size_mb = sum(len(frame) for frame in frames) / (1024 * 1024)
+    print(f"{frame_count} frames, {columns}x{rows} cells, {size_mb:.1f} MB of ANSI text\n")
+    
+    fast = time_path('strip_ansi', strip_ansi, frames)
+    
+    try:
+        from rich.text import Text
+    except ImportError:
+        print("rich is not installed, skipping comparison")
+        return
+    
+    slow = time_path('rich', lambda frame: Text.from_ansi(frame).plain, frames)
+    
+    if fast != slow:
+        print("\nMISMATCH: outputs differ")
+        sys.exit(1)
+    print("\nOutputs identical")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,135 @@
+"""
+Animation Assets
+Reference-counted registry of converted animations shared by players and widgets
+"""
+
+import itertools
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional
+
+
+class AnimationAsset:
+    """
+    One converted animation and the render caches built from it
+    
+    Frames and delays are held by reference, never copied, and must not
+    be modified once registered. Rendered frames are cached per render
+    key (font, theme, size...) so every widget displaying the asset with
+    the same settings reuses the same pixmaps.
+    """
+    
+    # Memory budget for rendered frames of one asset (across all render keys)
+    RENDER_CACHE_BYTES = 64 * 1024 * 1024
+    
+    def __init__(self, asset_id: int, frames: List[str], delays: List[int]):
+        self.asset_id = asset_id
+        self.frames = frames
+        self.delays = delays
+        self.subscribers = set()
+        
+        # (render_key, frame index) -> (pixmap, cost)
+        self._rendered: OrderedDict = OrderedDict()
+        self._rendered_bytes = 0
+    
+    def get_rendered(self, render_key: Hashable, index: int):
+        """Get a rendered frame and mark it as recently used"""
+        key = (render_key, index)
+        entry = self._rendered.get(key)
+        if entry is None:
+            return None
+        self._rendered.move_to_end(key)
+        return entry[0]
+    
+    def put_rendered(self, render_key: Hashable, index: int, pixmap, cost: int):
+        """Store a rendered frame, evicting least recently used ones"""
+        if cost > self.RENDER_CACHE_BYTES:
+            return
+        
+        key = (render_key, index)
+        old = self._rendered.pop(key, None)
+        if old is not None:
+            self._rendered_bytes -= old[1]
+        
+        while self._rendered and self._rendered_bytes + cost > self.RENDER_CACHE_BYTES:
+            _, (_, evicted_cost) = self._rendered.popitem(last=False)
+            self._rendered_bytes -= evicted_cost
+        
+        self._rendered[key] = (pixmap, cost)
+        self._rendered_bytes += cost
+    
+    def clear_rendered(self):
+        """Drop all rendered frames"""
+        self._rendered.clear()
+        self._rendered_bytes = 0
+    
+    def __len__(self) -> int:
+        return len(self.frames)
+
+
+class AnimationAssetRegistry:
+    """
+    Application-wide registry of animation assets
+    
+    Players and widgets subscribe to an asset by id; the asset and its
+    caches are released when the last subscriber unsubscribes.
+    """
+    
+    _instance = None
+    
+    @classmethod
+    def instance(cls) -> 'AnimationAssetRegistry':
+        """Get the application-wide registry"""
+        if cls._instance is None:
+            cls._instance = AnimationAssetRegistry()
+        return cls._instance
+    
+    def __init__(self):
+        self._assets: Dict[int, AnimationAsset] = {}
+        self._ids = itertools.count(1)
+    
+    def register(self, frames: List[str], delays: List[int], subscriber) -> AnimationAsset:
+        """
+        Register a new animation and subscribe to it
+        
+        Args:
+            frames: ANSI frame strings (shared, not copied)
+            delays: Frame delays in milliseconds
+            subscriber: First owner of the asset
+        
+        Returns:
+            The new asset
+        """
+        asset = AnimationAsset(next(self._ids), frames, delays)
+        self._assets[asset.asset_id] = asset
+        asset.subscribers.add(subscriber)
+        return asset
+    
+    def subscribe(self, asset_id: int, subscriber) -> Optional[AnimationAsset]:
+        """
+        Subscribe to a registered asset
+        
+        Returns:
+            The asset, or None if it was already released
+        """
+        asset = self._assets.get(asset_id)
+        if asset is not None:
+            asset.subscribers.add(subscriber)
+        return asset
+    
+    def unsubscribe(self, asset_id: int, subscriber):
+        """Unsubscribe from an asset, releasing it if this was the last subscriber"""
+        asset = self._assets.get(asset_id)
+        if asset is None:
+            return
+        
+        asset.subscribers.discard(subscriber)
+        if not asset.subscribers:
+            del self._assets[asset_id]
+            asset.clear_rendered()
+    
+    def get(self, asset_id: int) -> Optional[AnimationAsset]:
+        """Get a registered asset without subscribing"""
+        return self._assets.get(asset_id)
+    
+    def __len__(self) -> int:
+        return len(self._assets)
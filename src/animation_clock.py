@@ -0,0 +1,105 @@
+"""
+Animation Clock
+Single application-wide timer that drives every animation player and widget
+"""
+
+import math
+import time
+
+from PyQt6.QtCore import QObject, QTimer, Qt
+
+
+class AnimationClock(QObject):
+    """
+    Shared clock for all animations
+    
+    Subscribers schedule the monotonic time at which their next frame is
+    due and receive on_clock_tick(frame_time) when it arrives. Due times
+    are rounded up to shared frame boundaries (FRAME_RATE per second), and
+    one precise timer is armed for the earliest boundary only, so every
+    subscriber due at that boundary is ticked in the same wakeup and their
+    repaints are coalesced.
+    """
+    
+    # Frame boundaries per second that due times are rounded up to
+    FRAME_RATE = 60
+    
+    # Timer slack tolerated when deciding who is due
+    TOLERANCE_MS = 1
+    
+    _instance = None
+    
+    @classmethod
+    def instance(cls) -> 'AnimationClock':
+        """Get the application-wide clock"""
+        if cls._instance is None:
+            cls._instance = AnimationClock()
+        return cls._instance
+    
+    def __init__(self):
+        super().__init__()
+        self._due = {}
+        self._ticking = False
+        self.wakeups = 0
+        
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self._timer.timeout.connect(self._tick)
+    
+    @staticmethod
+    def now() -> float:
+        """Current clock time in seconds"""
+        return time.monotonic()
+    
+    def schedule(self, subscriber, due_time: float):
+        """
+        Schedule subscriber's next tick
+        
+        Args:
+            subscriber: Object with an on_clock_tick(frame_time) method
+            due_time: Monotonic time in seconds when the next frame is due
+        """
+        boundary = math.ceil(due_time * self.FRAME_RATE) / self.FRAME_RATE
+        self._due[subscriber] = boundary
+        self._restart_timer()
+    
+    def cancel(self, subscriber):
+        """Remove subscriber's pending tick"""
+        if self._due.pop(subscriber, None) is not None:
+            self._restart_timer()
+    
+    def is_scheduled(self, subscriber) -> bool:
+        """Check if subscriber has a pending tick"""
+        return subscriber in self._due
+    
+    def _restart_timer(self):
+        """Arm the timer for the earliest due subscriber"""
+        if self._ticking:
+            return
+        
+        if not self._due:
+            self._timer.stop()
+            return
+        
+        earliest = min(self._due.values())
+        delay_ms = max(0, math.ceil((earliest - self.now()) * 1000))
+        self._timer.start(delay_ms)
+    
+    def _tick(self):
+        """Tick every subscriber that is due at this frame boundary"""
+        self.wakeups += 1
+        frame_time = self.now() + self.TOLERANCE_MS / 1000.0
+        
+        due = [subscriber for subscriber, due_time in self._due.items() if due_time <= frame_time]
+        for subscriber in due:
+            del self._due[subscriber]
+        
+        self._ticking = True
+        try:
+            for subscriber in due:
+                subscriber.on_clock_tick(frame_time)
+        finally:
+            self._ticking = False
+        
+        self._restart_timer()
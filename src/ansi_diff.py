@@ -0,0 +1,156 @@
+"""
+ANSI Frame Diff
+Turns a sequence of ANSI frames into minimal cursor-addressed terminal updates
+"""
+
+from itertools import repeat
+from typing import List, Optional, Tuple
+
+from ansi_parser import ColorKey, ESCAPE_PATTERN, tokenize
+
+# One character cell: (character, color key)
+Cell = Tuple[str, ColorKey]
+
+# Reset colors, clear the screen and home the cursor
+CLEAR_SCREEN = '\x1b[0m\x1b[2J\x1b[H'
+HIDE_CURSOR = '\x1b[?25l'
+SHOW_CURSOR = '\x1b[?25h'
+RESET = '\x1b[0m'
+CLEAR_TO_END_OF_LINE = '\x1b[K'
+
+# Synchronized output (DEC mode 2026): the terminal holds the screen
+# until the frame is complete; terminals without support ignore it
+BEGIN_SYNCHRONIZED_UPDATE = '\x1b[?2026h'
+END_SYNCHRONIZED_UPDATE = '\x1b[?2026l'
+
+
+def color_sgr(key: ColorKey) -> str:
+    """Get the SGR sequence that selects a foreground color key"""
+    if key is None:
+        return '\x1b[39m'
+    if isinstance(key, int):
+        return f'\x1b[{30 + key if key < 8 else 90 + key - 8}m'
+    return f'\x1b[38;2;{int(key[1:3], 16)};{int(key[3:5], 16)};{int(key[5:7], 16)}m'
+
+
+def move_to(row: int, column: int) -> str:
+    """Get the sequence that moves the cursor to a 0-based cell"""
+    return f'\x1b[{row + 1};{column + 1}H'
+
+
+def get_cells(frame: str) -> List[List[Cell]]:
+    """
+    Split an ANSI frame into rows of (character, color) cells
+    
+    Escape sequences other than colors are dropped.
+    """
+    rows = [[]]
+    for key, segment in tokenize(frame):
+        if '\x1b' in segment:
+            segment = ESCAPE_PATTERN.sub('', segment)
+        lines = segment.replace('\r', '').split('\n')
+        rows[-1].extend(zip(lines[0], repeat(key)))
+        for line in lines[1:]:
+            rows.append(list(zip(line, repeat(key))))
+    return rows
+
+
+class FrameDiffer:
+    """
+    Produces the terminal output that turns the previous frame into the next
+    
+    Only changed cells are written. Cursor moves jump over unchanged
+    cells, except short gaps that are cheaper to rewrite than to jump.
+    Assumes the terminal starts cleared with default colors and that
+    nothing else writes to it in between. Frames can be cropped to the
+    terminal size with set_size().
+    """
+    
+    # Unchanged runs up to this long are rewritten instead of skipped
+    # (a cursor move costs 6-8 bytes)
+    MAX_REWRITE_GAP = 4
+    
+    def __init__(self):
+        self.max_columns: Optional[int] = None
+        self.max_rows: Optional[int] = None
+        self.reset()
+    
+    def set_size(self, columns: Optional[int], rows: Optional[int]):
+        """Crop frames to columns x rows (None for no limit) and forget the screen"""
+        self.max_columns = columns
+        self.max_rows = rows
+        self.reset()
+    
+    def reset(self):
+        """Forget the screen contents (call after clearing the terminal)"""
+        self.frame: Optional[str] = None
+        self.rows: List[List[Cell]] = []
+        self.cursor: Optional[Tuple[int, int]] = None
+        self.color: ColorKey = None
+    
+    def diff(self, frame: str) -> str:
+        """
+        Get the output that updates the screen from the last frame to this one
+        
+        Args:
+            frame: ANSI frame
+        
+        Returns:
+            Escape sequences and characters to write (empty if unchanged)
+        """
+        if frame == self.frame:
+            return ''
+        
+        rows = get_cells(frame)
+        if self.max_rows is not None:
+            rows = rows[:self.max_rows]
+        if self.max_columns is not None:
+            rows = [row[:self.max_columns] for row in rows]
+        
+        out = []
+        for y, row in enumerate(rows):
+            old = self.rows[y] if y < len(self.rows) else []
+            if row != old:
+                self._diff_row(out, y, old, row)
+        
+        # Rows the new frame no longer has
+        for y in range(len(rows), len(self.rows)):
+            if self.rows[y]:
+                self._move(out, y, 0)
+                out.append(CLEAR_TO_END_OF_LINE)
+        
+        self.frame = frame
+        self.rows = rows
+        return ''.join(out)
+    
+    def _move(self, out: List[str], y: int, x: int):
+        if self.cursor != (y, x):
+            out.append(move_to(y, x))
+            self.cursor = (y, x)
+    
+    def _diff_row(self, out: List[str], y: int, old: List[Cell], new: List[Cell]):
+        common = min(len(old), len(new))
+        changed = [x for x in range(common) if old[x] != new[x]]
+        changed.extend(range(common, len(new)))
+        
+        # Group changed cells into runs, bridging short unchanged gaps
+        runs = []
+        for x in changed:
+            if runs and x - runs[-1][1] <= self.MAX_REWRITE_GAP + 1:
+                runs[-1][1] = x
+            else:
+                runs.append([x, x])
+        
+        for start, end in runs:
+            self._move(out, y, start)
+            for char, color in new[start:end + 1]:
+                if color != self.color:
+                    out.append(color_sgr(color))
+                    self.color = color
+                out.append(char)
+            self.cursor = (y, end + 1)
+        
+        # Erase what is left of a longer old row
+        if len(old) > len(new):
+            self._move(out, y, len(new))
+            out.append(CLEAR_TO_END_OF_LINE)
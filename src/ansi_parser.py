@@ -0,0 +1,243 @@
+"""
+ANSI Parser Module
+Shared tokenizer for SGR color sequences in ASCII art output
+"""
+
+import re
+from collections import OrderedDict
+from typing import List, Sequence, Tuple, Union
+
+# Color keys produced by the tokenizer:
+#   None       - default color (reset / no color set)
+#   int 0-15   - standard (30-37) and bright (90-97) palette indexes
+#   str        - '#rrggbb' for 256-color (38;5;n) and truecolor (38;2;r;g;b)
+ColorKey = Union[None, int, str]
+
+SGR_PATTERN = re.compile(r'\x1b\[([0-9;]*)m')
+
+# Any CSI sequence (colors, cursor moves, clears)
+CSI_PATTERN = re.compile(r'\x1b\[[0-9;?]*[A-Za-z]')
+
+# Every escape sequence a terminal would swallow: CSI, OSC (BEL or ST
+# terminated), charset selection and two-character escapes
+ESCAPE_PATTERN = re.compile(
+    r'\x1b(?:\[[0-9;?]*[ -/]*[@-~]|\][^\x07\x1b]*(?:\x07|\x1b\\)|[()][0-9A-Za-z]|[@-Z\\-_])'
+)
+
+# Maximum characters kept in the span cache
+SPAN_CACHE_CHARS = 32 * 1024 * 1024
+
+_CUBE_LEVELS = (0, 95, 135, 175, 215, 255)
+
+# Maximum distinct SGR parameter strings kept in the code cache
+CODE_CACHE_SIZE = 4096
+
+_UNCHANGED = object()
+
+_span_cache: OrderedDict = OrderedDict()
+_span_cache_chars = 0
+_code_cache = {}
+
+
+def xterm_256_to_hex(n: int) -> ColorKey:
+    """
+    Convert an xterm 256-color index to a color key
+    
+    Args:
+        n: Color index (0-255)
+    
+    Returns:
+        Palette index for 0-15, '#rrggbb' otherwise
+    """
+    if n < 16:
+        return n
+    if n < 232:
+        n -= 16
+        r, g, b = _CUBE_LEVELS[n // 36], _CUBE_LEVELS[(n // 6) % 6], _CUBE_LEVELS[n % 6]
+    else:
+        r = g = b = 8 + (n - 232) * 10
+    return f'#{r:02x}{g:02x}{b:02x}'
+
+
+def parse_sgr(params: str, current: ColorKey = None) -> ColorKey:
+    """
+    Apply an SGR parameter string to the current foreground color
+    
+    Args:
+        params: Parameters between '\\x1b[' and 'm' (e.g. '31', '38;5;202')
+        current: Color key before this sequence
+    
+    Returns:
+        New color key
+    """
+    if not params:
+        return None
+    
+    values = params.split(';')
+    color = current
+    i = 0
+    while i < len(values):
+        try:
+            code = int(values[i]) if values[i] else 0
+        except ValueError:
+            return color
+        
+        if code == 0 or code == 39:
+            color = None
+        elif 30 <= code <= 37:
+            color = code - 30
+        elif 90 <= code <= 97:
+            color = code - 90 + 8
+        elif code == 38 and i + 1 < len(values):
+            try:
+                if values[i + 1] == '5' and i + 2 < len(values):
+                    color = xterm_256_to_hex(max(0, min(255, int(values[i + 2]))))
+                    i += 2
+                elif values[i + 1] == '2' and i + 4 < len(values):
+                    r, g, b = (max(0, min(255, int(v))) for v in values[i + 2:i + 5])
+                    color = f'#{r:02x}{g:02x}{b:02x}'
+                    i += 4
+            except ValueError:
+                return color
+        elif code == 48 and i + 1 < len(values):
+            # Skip background color arguments
+            i += 2 if values[i + 1] == '5' else 4 if values[i + 1] == '2' else 0
+        i += 1
+    
+    return color
+
+
+def tokenize(text: str) -> List[Tuple[ColorKey, str]]:
+    """
+    Split ANSI text into color spans
+    
+    Adjacent spans with the same color are merged.
+    
+    Args:
+        text: Text with SGR escape sequences
+    
+    Returns:
+        List of (color_key, text) tuples
+    """
+    parts = SGR_PATTERN.split(text)
+    spans = []
+    span_color = None
+    span_parts = [parts[0]] if parts[0] else []
+    color = None
+    
+    for i in range(1, len(parts), 2):
+        # Results are cached per parameter string; _UNCHANGED marks sequences
+        # that don't touch the foreground color (e.g. bold only)
+        params = parts[i]
+        result = _code_cache.get(params)
+        if result is None:
+            if len(_code_cache) >= CODE_CACHE_SIZE:
+                _code_cache.clear()
+            result = _code_cache[params] = (parse_sgr(params, _UNCHANGED),)
+        if result[0] is not _UNCHANGED:
+            color = result[0]
+        
+        segment = parts[i + 1]
+        if not segment:
+            continue
+        
+        if color != span_color:
+            if span_parts:
+                spans.append((span_color, ''.join(span_parts)))
+            span_color = color
+            span_parts = []
+        span_parts.append(segment)
+    
+    if span_parts:
+        spans.append((span_color, ''.join(span_parts)))
+    
+    return spans
+
+
+def tokenize_cached(text: str) -> List[Tuple[ColorKey, str]]:
+    """
+    Tokenize with an LRU cache keyed by the frame string
+    
+    Animation frames are displayed many times, so their spans are only
+    parsed once. The returned list is shared and must not be modified.
+    """
+    global _span_cache_chars
+    
+    spans = _span_cache.get(text)
+    if spans is not None:
+        _span_cache.move_to_end(text)
+        return spans
+    
+    spans = tokenize(text)
+    if len(text) <= SPAN_CACHE_CHARS:
+        while _span_cache and _span_cache_chars + len(text) > SPAN_CACHE_CHARS:
+            evicted, _ = _span_cache.popitem(last=False)
+            _span_cache_chars -= len(evicted)
+        _span_cache[text] = spans
+        _span_cache_chars += len(text)
+    return spans
+
+
+def clear_cache():
+    """Drop all cached span lists"""
+    global _span_cache_chars
+    _span_cache.clear()
+    _span_cache_chars = 0
+
+
+def resolve_color(key: ColorKey, palette: Sequence[str], default: str) -> str:
+    """
+    Map a color key to a hex color using a widget palette
+    
+    Args:
+        key: Color key from tokenize()
+        palette: 8 or 16 hex colors for the standard/bright indexes
+        default: Hex color for the default key
+    
+    Returns:
+        Hex color string
+    """
+    if key is None:
+        return default
+    if isinstance(key, int):
+        if key >= len(palette):
+            key -= 8
+        return palette[key]
+    return key
+
+
+def resolve_spans(spans: List[Tuple[ColorKey, str]], palette: Sequence[str], default: str) -> List[Tuple[str, str]]:
+    """
+    Map span color keys to hex colors, merging spans that end up the same color
+    
+    Args:
+        spans: Output of tokenize()
+        palette: 8 or 16 hex colors
+        default: Hex color for the default key
+    
+    Returns:
+        List of (hex_color, text) tuples
+    """
+    colors = {}
+    runs = []
+    for key, segment in spans:
+        color = colors.get(key)
+        if color is None:
+            color = colors[key] = resolve_color(key, palette, default)
+        if runs and runs[-1][0] == color:
+            runs[-1] = (color, runs[-1][1] + segment)
+        else:
+            runs.append((color, segment))
+    return runs
+
+
+def strip_ansi(text: str) -> str:
+    """
+    Remove all escape sequences from text
+    
+    Single regex pass, used for plain-text export instead of building a
+    rich Text object per frame.
+    """
+    if '\x1b' not in text:
+        return text
+    return ESCAPE_PATTERN.sub('', text)
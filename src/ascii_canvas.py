@@ -0,0 +1,386 @@
+"""
+ASCII Canvas Widget
+Paints ASCII art as a grid of cached glyphs instead of a rich-text document
+"""
+
+import sys
+from collections import OrderedDict
+from typing import List, Optional, Tuple
+
+from PyQt6.QtWidgets import QAbstractScrollArea, QApplication
+from PyQt6.QtCore import Qt, QRect, QTimer
+from PyQt6.QtGui import QColor, QFontMetrics, QKeySequence, QPainter, QPixmap, QRegion
+from cyberpunk_redesign import get_cyberpunk_mono_font, CyberpunkColors
+from ansi_parser import tokenize, resolve_spans
+
+
+class FrameCache:
+    """
+    LRU cache of parsed frames with a memory budget
+    
+    Keys are the ANSI frame strings themselves; Python caches string
+    hashes, so repeated lookups of the same frame object are cheap. The
+    keys count toward the budget, since an ANSI frame is often larger
+    than its parsed cells.
+    """
+    
+    # Rough per-cell cost: one character plus one tuple slot
+    BYTES_PER_CELL = 9
+    BYTES_PER_ROW = 120
+    
+    def __init__(self, max_bytes: int = 64 * 1024 * 1024):
+        self.max_bytes = max_bytes
+        self.current_bytes = 0
+        self._entries: OrderedDict = OrderedDict()
+    
+    @classmethod
+    def estimate_size(cls, rows: List[str]) -> int:
+        """Estimate memory used by a parsed frame"""
+        return sum(len(row) for row in rows) * cls.BYTES_PER_CELL + len(rows) * cls.BYTES_PER_ROW
+    
+    def get(self, key: str) -> Optional[tuple]:
+        """Get parsed frame and mark it as recently used"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        self._entries.move_to_end(key)
+        return entry[0]
+    
+    def put(self, key: str, value: tuple):
+        """Store parsed (rows, row_colors), evicting least recently used frames"""
+        size = self.estimate_size(value[0]) + sys.getsizeof(key)
+        if size > self.max_bytes:
+            return
+        
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= old[1]
+        
+        while self._entries and self.current_bytes + size > self.max_bytes:
+            _, (_, evicted_size) = self._entries.popitem(last=False)
+            self.current_bytes -= evicted_size
+        
+        self._entries[key] = (value, size)
+        self.current_bytes += size
+    
+    def is_full(self) -> bool:
+        """Check if the memory budget is used up"""
+        return self.current_bytes >= self.max_bytes
+    
+    def clear(self):
+        """Drop all cached frames"""
+        self._entries.clear()
+        self.current_bytes = 0
+    
+    def __contains__(self, key: str) -> bool:
+        return key in self._entries
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class AsciiCanvas(QAbstractScrollArea):
+    """
+    Output area that paints ASCII art cell by cell
+    
+    Each cell is drawn from a glyph atlas (one cached pixmap per
+    character and color), and only cells that differ from the previous
+    frame are repainted.
+    """
+    
+    ANSI_COLORS = [
+        CyberpunkColors.TEXT_DIM,
+        "#d89aa3",
+        CyberpunkColors.CYAN,
+        "#e0c097",
+        CyberpunkColors.PURPLE,
+        "#c5a3d8",
+        CyberpunkColors.GREEN,
+        CyberpunkColors.TEXT_PRIMARY
+    ]
+    
+    MARGIN = 16
+    
+    # More pending dirty rects than this repaint the whole viewport instead
+    # (e.g. frames set while no paint events arrive)
+    MAX_DIRTY_RECTS = 1024
+    
+    # Glyph atlas entries kept; truecolor frames can need one per cell
+    MAX_GLYPHS = 4096
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setFocusPolicy(Qt.FocusPolicy.StrongFocus)
+        self.viewport().setAttribute(Qt.WidgetAttribute.WA_OpaquePaintEvent)
+        self.background = QColor(CyberpunkColors.BG_DARK)
+        
+        # Grid state: one string and one color tuple per row
+        self.rows: List[str] = []
+        self.row_colors: List[Tuple[str, ...]] = []
+        self.columns = 0
+        
+        # Changed-cell rects from set_cells() waiting to be painted
+        self._dirty_rects: List[QRect] = []
+        
+        # Glyph atlas: (char, color) -> pixmap, least recently used first
+        self._glyphs: OrderedDict = OrderedDict()
+        
+        # Parsed frames, so looping animations are only parsed once
+        self.frame_cache = FrameCache()
+        self._preload_queue: List[str] = []
+        self._preload_timer = QTimer(self)
+        self._preload_timer.timeout.connect(self._preload_next_frame)
+        
+        self.setFont(get_cyberpunk_mono_font())
+    
+    def setFont(self, font):
+        """Set font and rebuild glyph atlas"""
+        super().setFont(font)
+        metrics = QFontMetrics(font)
+        self.cell_width = max(1, metrics.horizontalAdvance('M'))
+        self.cell_height = max(1, metrics.lineSpacing())
+        self.ascent = metrics.ascent()
+        self._glyphs.clear()
+        self._update_scrollbars()
+        self.viewport().update()
+    
+    def _get_glyph(self, char, color):
+        """Get cached glyph pixmap, rendering it on first use"""
+        key = (char, color)
+        pixmap = self._glyphs.get(key)
+        if pixmap is not None:
+            self._glyphs.move_to_end(key)
+        else:
+            ratio = self.devicePixelRatioF()
+            pixmap = QPixmap(int(self.cell_width * ratio), int(self.cell_height * ratio))
+            pixmap.setDevicePixelRatio(ratio)
+            pixmap.fill(self.background)
+            
+            painter = QPainter(pixmap)
+            painter.setFont(self.font())
+            painter.setPen(QColor(color))
+            painter.drawText(0, self.ascent, char)
+            painter.end()
+            
+            self._glyphs[key] = pixmap
+            if len(self._glyphs) > self.MAX_GLYPHS:
+                self._glyphs.popitem(last=False)
+        return pixmap
+    
+    def parse_ansi_cells(self, text):
+        """
+        Parse ANSI text into grid rows
+        
+        Args:
+            text: Text with ANSI color codes
+        
+        Returns:
+            (rows, row_colors) where row_colors holds one color per character
+        """
+        rows = []
+        row_colors = []
+        line_parts = []
+        line_colors = []
+        
+        for color, segment in resolve_spans(tokenize(text), self.ANSI_COLORS, CyberpunkColors.TEXT_PRIMARY):
+            lines = segment.split('\n')
+            for j, line in enumerate(lines):
+                if j:
+                    rows.append(''.join(line_parts))
+                    row_colors.append(tuple(line_colors))
+                    line_parts = []
+                    line_colors = []
+                if line:
+                    line_parts.append(line)
+                    line_colors.extend([color] * len(line))
+        
+        if line_parts:
+            rows.append(''.join(line_parts))
+            row_colors.append(tuple(line_colors))
+        
+        return rows, row_colors
+    
+    def set_cells(self, rows, row_colors):
+        """
+        Replace grid contents, repainting only the cells that changed
+        
+        Args:
+            rows: List of row strings
+            row_colors: List of per-character color tuples
+        """
+        old_rows = self.rows
+        old_colors = self.row_colors
+        self.rows = rows
+        self.row_colors = row_colors
+        
+        columns = max((len(row) for row in rows), default=0)
+        if columns != self.columns or len(rows) != len(old_rows):
+            self.columns = columns
+            self._update_scrollbars()
+            self.viewport().update()
+            return
+        
+        x_offset = self.MARGIN - self.horizontalScrollBar().value()
+        y_offset = self.MARGIN - self.verticalScrollBar().value()
+        viewport = self.viewport()
+        
+        for r, (row, colors) in enumerate(zip(rows, row_colors)):
+            old_row = old_rows[r]
+            old_row_colors = old_colors[r]
+            if row == old_row and colors == old_row_colors:
+                continue
+            
+            # Narrow the dirty rect to the first and last differing cells
+            length = max(len(row), len(old_row))
+            first = 0
+            while (first < length and first < len(row) and first < len(old_row)
+                   and row[first] == old_row[first] and colors[first] == old_row_colors[first]):
+                first += 1
+            last = length
+            while (last > first and last <= len(row) and last <= len(old_row)
+                   and row[last - 1] == old_row[last - 1] and colors[last - 1] == old_row_colors[last - 1]):
+                last -= 1
+            
+            rect = QRect(
+                x_offset + first * self.cell_width,
+                y_offset + r * self.cell_height,
+                (last - first) * self.cell_width,
+                self.cell_height
+            )
+            if len(self._dirty_rects) >= self.MAX_DIRTY_RECTS:
+                self._dirty_rects.clear()
+                viewport.update()
+                return
+            self._dirty_rects.append(rect)
+            viewport.update(rect)
+    
+    def get_parsed_frame(self, text):
+        """Get (rows, row_colors) for ANSI text, parsing it only on a cache miss"""
+        parsed = self.frame_cache.get(text)
+        if parsed is None:
+            parsed = self.parse_ansi_cells(text)
+            self.frame_cache.put(text, parsed)
+        return parsed
+    
+    def preload_frames(self, frames):
+        """
+        Parse animation frames in the background while the event loop is idle
+        
+        Stops early once the frame cache budget is used up.
+        
+        Args:
+            frames: List of ANSI frame strings
+        """
+        self._preload_queue = list(reversed(frames))
+        self._preload_timer.start(0)
+    
+    def _preload_next_frame(self):
+        """Parse one queued frame per idle tick"""
+        if not self._preload_queue or self.frame_cache.is_full():
+            self._preload_queue = []
+            self._preload_timer.stop()
+            return
+        
+        text = self._preload_queue.pop()
+        if text not in self.frame_cache:
+            self.frame_cache.put(text, self.parse_ansi_cells(text))
+    
+    def append_ansi_text(self, text):
+        """Display ANSI text, replacing the current contents"""
+        self.set_cells(*self.get_parsed_frame(text))
+    
+    def insertPlainText(self, text):
+        """Append plain text in the default color"""
+        rows = list(self.rows)
+        row_colors = list(self.row_colors)
+        color = CyberpunkColors.TEXT_PRIMARY
+        
+        for j, line in enumerate(text.split('\n')):
+            if j or not rows:
+                rows.append(line)
+                row_colors.append((color,) * len(line))
+            else:
+                rows[-1] += line
+                row_colors[-1] += (color,) * len(line)
+        
+        self.set_cells(rows, row_colors)
+    
+    def clear(self):
+        """Remove all content"""
+        self.set_cells([], [])
+    
+    def toPlainText(self):
+        """Get displayed text without colors"""
+        return '\n'.join(self.rows)
+    
+    def _update_scrollbars(self):
+        """Fit scrollbar ranges to grid size"""
+        content_width = self.columns * self.cell_width + 2 * self.MARGIN
+        content_height = len(self.rows) * self.cell_height + 2 * self.MARGIN
+        viewport_size = self.viewport().size()
+        
+        self.horizontalScrollBar().setRange(0, max(0, content_width - viewport_size.width()))
+        self.horizontalScrollBar().setPageStep(viewport_size.width())
+        self.horizontalScrollBar().setSingleStep(self.cell_width)
+        self.verticalScrollBar().setRange(0, max(0, content_height - viewport_size.height()))
+        self.verticalScrollBar().setPageStep(viewport_size.height())
+        self.verticalScrollBar().setSingleStep(self.cell_height)
+    
+    def resizeEvent(self, event):
+        super().resizeEvent(event)
+        self._update_scrollbars()
+    
+    def scrollContentsBy(self, dx, dy):
+        self.viewport().update()
+    
+    def keyPressEvent(self, event):
+        if event.matches(QKeySequence.StandardKey.Copy):
+            QApplication.clipboard().setText(self.toPlainText())
+            return
+        super().keyPressEvent(event)
+    
+    def paintEvent(self, event):
+        """Paint only the cells inside the dirty region"""
+        painter = QPainter(self.viewport())
+        x_offset = self.MARGIN - self.horizontalScrollBar().value()
+        y_offset = self.MARGIN - self.verticalScrollBar().value()
+        
+        # Paint the rects set_cells() dirtied one by one: their bounding
+        # rect would repaint every cell in between. PyQt6 can't list the
+        # region's rects, so anything else (expose, scroll, full updates)
+        # falls back to the bounding rect.
+        region = event.region()
+        dirty = QRegion()
+        for rect in self._dirty_rects:
+            dirty = dirty.united(rect)
+        
+        if self._dirty_rects and region.subtracted(dirty).isEmpty():
+            for rect in self._dirty_rects:
+                rect = rect.intersected(region.boundingRect())
+                if not rect.isEmpty():
+                    self._paint_rect(painter, rect, x_offset, y_offset)
+        else:
+            self._paint_rect(painter, region.boundingRect(), x_offset, y_offset)
+        self._dirty_rects.clear()
+        
+        painter.end()
+    
+    def _paint_rect(self, painter: QPainter, rect: QRect, x_offset: int, y_offset: int):
+        """Clear one rect and draw the glyphs of the cells it touches"""
+        painter.fillRect(rect, self.background)
+        painter.setClipRect(rect)
+        
+        first_row = max(0, (rect.top() - y_offset) // self.cell_height)
+        last_row = min(len(self.rows), (rect.bottom() - y_offset) // self.cell_height + 1)
+        first_col = max(0, (rect.left() - x_offset) // self.cell_width)
+        last_col = (rect.right() - x_offset) // self.cell_width + 1
+        
+        get_glyph = self._get_glyph
+        for r in range(first_row, last_row):
+            row = self.rows[r]
+            colors = self.row_colors[r]
+            y = y_offset + r * self.cell_height
+            for c in range(first_col, min(last_col, len(row))):
+                char = row[c]
+                if char != ' ':
+                    painter.drawPixmap(x_offset + c * self.cell_width, y, get_glyph(char, colors[c]))
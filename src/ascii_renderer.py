@@ -0,0 +1,275 @@
+"""
+ASCII Renderer
+Draws ANSI ASCII art to bitmaps from a cached glyph atlas (no Qt required)
+"""
+
+import os
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+from ansi_parser import tokenize, resolve_color, strip_ansi
+
+DEFAULT_FONT_PATH = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+    'assets', 'fonts', 'JetBrainsMono.ttf'
+)
+
+# Same colors as the main window output area
+BACKGROUND = "#0a0e1a"
+FOREGROUND = "#c5d1de"
+ANSI_COLORS = [
+    "#6b7a8f",
+    "#d89aa3",
+    "#0099b3",
+    "#e0c097",
+    "#7c3aed",
+    "#c5a3d8",
+    "#00b359",
+    "#c5d1de",
+]
+
+# Coverage levels per color in indexed (GIF) output
+INDEXED_LEVELS = 15
+
+# Peak working memory of GlyphAtlas.blit_direct per output pixel
+DIRECT_BYTES_PER_PIXEL = 24
+
+
+def hex_to_rgb(color: str) -> Tuple[int, int, int]:
+    """Convert '#rrggbb' to an (r, g, b) tuple"""
+    color = color.lstrip('#')
+    return int(color[0:2], 16), int(color[2:4], 16), int(color[4:6], 16)
+
+
+class GlyphAtlas:
+    """
+    Pre-rendered glyphs in every color used so far
+    
+    Glyph coverage masks are drawn once per character with Pillow. Frames
+    are turned into (rows, columns) grids of glyph and color indexes, and
+    the bitmap is assembled with a single numpy gather from the
+    glyph-by-color tile array instead of drawing text per character.
+    Glyphs and colors are added as they first appear.
+    """
+    
+    def __init__(self, font_path: str = DEFAULT_FONT_PATH, font_size: int = 14,
+                 palette: Sequence[str] = ANSI_COLORS,
+                 foreground: str = FOREGROUND, background: str = BACKGROUND):
+        self.font = ImageFont.truetype(font_path, font_size)
+        self.palette = list(palette)
+        self.foreground = foreground
+        self.background = hex_to_rgb(background)
+        
+        ascent, descent = self.font.getmetrics()
+        self.ascent = ascent
+        self.cell_width = max(1, round(self.font.getlength('M')))
+        self.cell_height = max(1, ascent + descent)
+        
+        # Glyphs: codepoint -> glyph index, coverage masks (n, cell_h, cell_w)
+        self._glyph_lut = np.zeros(128, dtype=np.int32)
+        self._glyph_known = np.zeros(128, dtype=bool)
+        self._masks: List[np.ndarray] = []
+        self._mask_stack: Optional[np.ndarray] = None
+        
+        # Colors: hex -> color index; the base colors come first so indexed
+        # output can use a fixed palette
+        self.colors: List[Tuple[int, int, int]] = []
+        self._color_ids: Dict[str, int] = {}
+        for color in [foreground] + self.palette:
+            self._get_color_id(color)
+        self.base_color_count = len(self.colors)
+        
+        self._tiles: Optional[np.ndarray] = None
+        self._indexed_tiles: Optional[np.ndarray] = None
+        
+        # Space is glyph 0, so padding cells are blank
+        self._add_glyphs(np.array([ord(' ')]))
+    
+    def _get_color_id(self, color: str) -> int:
+        """Get the index of a hex color, adding it on first use"""
+        color_id = self._color_ids.get(color)
+        if color_id is None:
+            color_id = self._color_ids[color] = len(self.colors)
+            self.colors.append(hex_to_rgb(color))
+            self._tiles = None
+            self._indexed_tiles = None
+        return color_id
+    
+    def _add_glyphs(self, codepoints: np.ndarray):
+        """Render coverage masks for codepoints not in the atlas yet"""
+        top = int(codepoints.max()) + 1
+        if top > len(self._glyph_lut):
+            size = max(top, 2 * len(self._glyph_lut))
+            lut = np.zeros(size, dtype=np.int32)
+            known = np.zeros(size, dtype=bool)
+            lut[:len(self._glyph_lut)] = self._glyph_lut
+            known[:len(self._glyph_known)] = self._glyph_known
+            self._glyph_lut = lut
+            self._glyph_known = known
+        
+        new = codepoints[~self._glyph_known[codepoints]]
+        for codepoint in np.unique(new):
+            image = Image.new('L', (self.cell_width, self.cell_height), 0)
+            ImageDraw.Draw(image).text((0, 0), chr(codepoint), font=self.font, fill=255)
+            self._glyph_lut[codepoint] = len(self._masks)
+            self._glyph_known[codepoint] = True
+            self._masks.append(np.asarray(image, dtype=np.uint8))
+            self._mask_stack = None
+            self._tiles = None
+            self._indexed_tiles = None
+    
+    def get_grid(self, text: str) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Convert ANSI text to glyph and color index grids
+        
+        Returns:
+            (glyphs, colors) int arrays of shape (rows, columns); short rows
+            are padded with spaces
+        """
+        pieces = []
+        color_ids = []
+        lengths = []
+        for key, segment in tokenize(text):
+            color = self.foreground if key is None else resolve_color(key, self.palette, self.foreground)
+            pieces.append(segment)
+            color_ids.append(self._get_color_id(color))
+            lengths.append(len(segment))
+        
+        plain = ''.join(pieces)
+        codepoints = np.frombuffer(plain.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        cell_colors = np.repeat(np.array(color_ids, dtype=np.int32), lengths)
+        
+        # Row boundaries
+        breaks = np.flatnonzero(codepoints == ord('\n'))
+        starts = np.concatenate([[0], breaks + 1])
+        ends = np.concatenate([breaks, [len(codepoints)]])
+        columns = int((ends - starts).max()) if len(starts) else 0
+        
+        if len(codepoints):
+            self._add_glyphs(codepoints)
+        glyph_ids = self._glyph_lut[codepoints] if len(codepoints) else codepoints
+        
+        glyphs = np.zeros((len(starts), columns), dtype=np.int32)
+        colors = np.zeros((len(starts), columns), dtype=np.int32)
+        for row, (start, end) in enumerate(zip(starts, ends)):
+            glyphs[row, :end - start] = glyph_ids[start:end]
+            colors[row, :end - start] = cell_colors[start:end]
+        return glyphs, colors
+    
+    def _get_tiles(self) -> np.ndarray:
+        """Glyph-by-color RGB tiles, shape (colors, glyphs, cell_h, cell_w, 3)"""
+        if self._tiles is None:
+            coverage = np.stack(self._masks).astype(np.float32) / 255.0
+            background = np.array(self.background, dtype=np.float32)
+            colors = np.array(self.colors, dtype=np.float32)
+            blend = background + coverage[None, :, :, :, None] * (colors[:, None, None, None, :] - background)
+            self._tiles = np.rint(blend).astype(np.uint8)
+        return self._tiles
+    
+    def _get_indexed_tiles(self) -> np.ndarray:
+        """
+        Glyph-by-color palette index tiles, shape (colors, glyphs, cell_h, cell_w)
+        
+        Index 0 is the background; base color c at coverage level l
+        (1..INDEXED_LEVELS) is 1 + c * INDEXED_LEVELS + (l - 1). Colors
+        added later map to the nearest base color.
+        """
+        if self._indexed_tiles is None:
+            levels = np.rint(np.stack(self._masks).astype(np.float32) * INDEXED_LEVELS / 255.0).astype(np.int32)
+            
+            base = np.array(self.colors[:self.base_color_count], dtype=np.int32)
+            nearest = [
+                int(np.argmin(((base - np.array(color)) ** 2).sum(axis=1)))
+                for color in self.colors
+            ]
+            offsets = np.array(nearest, dtype=np.int32) * INDEXED_LEVELS
+            tiles = np.where(levels[None] > 0, offsets[:, None, None, None] + levels[None], 0)
+            self._indexed_tiles = tiles.astype(np.uint8)
+        return self._indexed_tiles
+    
+    def get_indexed_palette(self) -> List[int]:
+        """Flat RGB palette (256 entries) matching render_indexed()"""
+        background = np.array(self.background, dtype=np.float32)
+        palette = [self.background]
+        for color in self.colors[:self.base_color_count]:
+            for level in range(1, INDEXED_LEVELS + 1):
+                blend = background + (np.array(color, dtype=np.float32) - background) * level / INDEXED_LEVELS
+                palette.append(tuple(int(v) for v in np.rint(blend)))
+        palette += [self.background] * (256 - len(palette))
+        return [value for color in palette for value in color]
+    
+    def blit(self, glyphs: np.ndarray, colors: np.ndarray) -> np.ndarray:
+        """
+        Assemble an RGB bitmap from index grids
+        
+        Returns:
+            uint8 array of shape (rows * cell_h, columns * cell_w, 3)
+        """
+        rows, columns = glyphs.shape
+        cells = self._get_tiles()[colors, glyphs]
+        return cells.transpose(0, 2, 1, 3, 4).reshape(rows * self.cell_height, columns * self.cell_width, 3)
+    
+    def blit_indexed(self, glyphs: np.ndarray, colors: np.ndarray) -> np.ndarray:
+        """Assemble a palette-indexed bitmap (see get_indexed_palette)"""
+        rows, columns = glyphs.shape
+        cells = self._get_indexed_tiles()[colors, glyphs]
+        return cells.transpose(0, 2, 1, 3).reshape(rows * self.cell_height, columns * self.cell_width)
+    
+    def blit_direct(self, glyphs: np.ndarray, colors: np.ndarray) -> np.ndarray:
+        """
+        Assemble an RGB bitmap straight from the coverage masks
+        
+        Same result as blit() (within rounding) without building the
+        glyph-by-color tiles, whose size grows with font size times the
+        number of colors. Use for large fonts; memory is about
+        DIRECT_BYTES_PER_PIXEL per output pixel.
+        """
+        if self._mask_stack is None:
+            self._mask_stack = np.stack(self._masks)
+        
+        rows, columns = glyphs.shape
+        coverage = self._mask_stack[glyphs].astype(np.uint16)[..., None]
+        foreground = np.array(self.colors, dtype=np.uint16)[colors][:, :, None, None, :]
+        background = np.array(self.background, dtype=np.uint16)
+        
+        # (fg * a + bg * (255 - a) + 127) // 255 stays within uint16
+        pixels = coverage * foreground
+        pixels += (255 - coverage) * background
+        pixels += 127
+        pixels //= 255
+        return pixels.astype(np.uint8).transpose(0, 2, 1, 3, 4).reshape(
+            rows * self.cell_height, columns * self.cell_width, 3
+        )
+    
+    def render(self, text: str, columns: int = 0, rows: int = 0) -> np.ndarray:
+        """
+        Render ANSI text to an RGB array
+        
+        Args:
+            text: ANSI frame
+            columns, rows: Minimum grid size (pads so all frames match)
+        """
+        return self.blit(*self.pad_grid(*self.get_grid(text), columns, rows))
+    
+    def render_indexed(self, text: str, columns: int = 0, rows: int = 0) -> np.ndarray:
+        """Render ANSI text to a palette-indexed array"""
+        return self.blit_indexed(*self.pad_grid(*self.get_grid(text), columns, rows))
+    
+    @staticmethod
+    def pad_grid(glyphs: np.ndarray, colors: np.ndarray, columns: int, rows: int) -> Tuple[np.ndarray, np.ndarray]:
+        """Pad index grids with blank cells to at least columns x rows"""
+        pad_rows = max(0, rows - glyphs.shape[0])
+        pad_columns = max(0, columns - glyphs.shape[1])
+        if pad_rows or pad_columns:
+            padding = ((0, pad_rows), (0, pad_columns))
+            glyphs = np.pad(glyphs, padding)
+            colors = np.pad(colors, padding)
+        return glyphs, colors
+
+
+def get_text_size(text: str) -> Tuple[int, int]:
+    """Get (columns, rows) of ANSI text"""
+    lines = strip_ansi(text).split('\n')
+    return max(len(line) for line in lines), len(lines)
@@ -5,11 +5,16 @@ Always-on-top, draggable, resizable window for displaying ASCII art
 """
 
 from PyQt6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QTextEdit, 
-                             QPushButton, QLabel, QSlider, QFrame, QComboBox)
-from PyQt6.QtCore import Qt, QPoint, QTimer, QEvent
-from PyQt6.QtGui import QFont, QColor, QTextCursor
+                             QPushButton, QLabel, QSlider, QFrame, QComboBox, QSizePolicy)
+from PyQt6.QtCore import Qt, QPoint, QEvent, QRectF
+from PyQt6.QtGui import (QFont, QColor, QTextCursor, QTextCharFormat, QTextDocument,
+                         QPixmap, QPainter)
 from styles.compact_theme import get_compact_font, CompactColors
 from settings_manager import ColorTheme
+from animation_clock import AnimationClock
+from animation_assets import AnimationAssetRegistry
+from window_visibility import WindowVisibilityWatcher
+from ansi_parser import tokenize_cached, resolve_spans
 
 
 class FloatingAsciiWidget(QWidget):
@@ -18,6 +23,17 @@ class FloatingAsciiWidget(QWidget):
     Features: Always on top, draggable, semi-transparent
     """
     
+    ANSI_COLORS = [
+        CompactColors.TEXT_DIM,
+        "#d89aa3",
+        CompactColors.GRAPE_BRIGHT,
+        "#e0c097",
+        CompactColors.DUSTY_GRAPE,
+        "#c5a3d8",
+        CompactColors.GRAPE_LIGHT,
+        CompactColors.TEXT_PRIMARY
+    ]
+    
     def eventFilter(self, obj, event):
         if obj == self.text_display.viewport():
             if event.type() == event.Type.MouseButtonPress:
@@ -61,8 +77,18 @@ class FloatingAsciiWidget(QWidget):
         self.animation_frames = []
         self.animation_delays = []
         self.current_frame = 0
-        self.animation_timer = QTimer()
-        self.animation_timer.timeout.connect(self._next_animation_frame)
+        self.is_playing = False
+        self._next_due = None
+        self.clock = AnimationClock.instance()
+        
+        # Rendering is suspended while the widget can't be seen
+        self.is_suspended = False
+        self.visibility = WindowVisibilityWatcher(self)
+        self.visibility.visibility_changed.connect(self.on_visibility_changed)
+        
+        # Shared animation asset; rendered frames are cached on the asset
+        self.registry = AnimationAssetRegistry.instance()
+        self.asset = None
         
         # Setup UI
         self.init_ui()
@@ -91,6 +117,13 @@ class FloatingAsciiWidget(QWidget):
         self.title_bar = self.create_title_bar()
         layout.addWidget(self.title_bar)
         
+        # Animation display: blits pre-rendered frame pixmaps
+        # (created first so eventFilter can reference it)
+        self.frame_view = QLabel()
+        self.frame_view.setAlignment(Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignTop)
+        self.frame_view.setSizePolicy(QSizePolicy.Policy.Ignored, QSizePolicy.Policy.Ignored)
+        self.frame_view.setStyleSheet("QLabel { background-color: transparent; border: none; }")
+        
         # ASCII display area
         self.text_display = QTextEdit()
         self.text_display.setReadOnly(True)
@@ -108,6 +141,10 @@ class FloatingAsciiWidget(QWidget):
         """)
         layout.addWidget(self.text_display, stretch=1)
         
+        self.frame_view.installEventFilter(self)
+        layout.addWidget(self.frame_view, stretch=1)
+        self.frame_view.hide()
+        
         # Control bar (for animations)
         self.control_bar = self.create_control_bar()
         layout.addWidget(self.control_bar)
@@ -359,65 +396,132 @@ class FloatingAsciiWidget(QWidget):
     def set_ascii_text(self, text):
         """Set static ASCII art text"""
         self.is_animated = False
-        self.animation_timer.stop()
+        self._stop_animation()
         self.control_bar.hide()
+        self.release_asset()
+        self.frame_view.hide()
+        self.text_display.show()
+        self._current_text = text
         self._display_text(text)
     
     def set_animation(self, frames, delays):
-        """Set animated ASCII art"""
+        """Set animated ASCII art, registering it as a new shared asset"""
+        self.release_asset()
+        self._load_asset(self.registry.register(frames, delays, self))
+    
+    def set_animation_asset(self, asset_id):
+        """
+        Display a registered animation asset
+        
+        Frames are shared with the main player and other widgets instead
+        of being copied.
+        
+        Returns:
+            True if the asset is still registered
+        """
+        if self.asset is not None and self.asset.asset_id == asset_id:
+            return True
+        
+        asset = self.registry.subscribe(asset_id, self)
+        if asset is None:
+            return False
+        
+        self.release_asset()
+        self._load_asset(asset)
+        return True
+    
+    def release_asset(self):
+        """Unsubscribe from the current animation asset"""
+        self._stop_animation()
+        if self.asset is not None:
+            self.registry.unsubscribe(self.asset.asset_id, self)
+            self.asset = None
+            self.animation_frames = []
+            self.animation_delays = []
+    
+    def _load_asset(self, asset):
+        """Show a subscribed asset"""
+        self.asset = asset
         self.is_animated = True
-        self.animation_frames = frames
-        self.animation_delays = delays
+        self.animation_frames = asset.frames
+        self.animation_delays = asset.delays
         self.current_frame = 0
         self.control_bar.show()
+        self.text_display.hide()
+        self.frame_view.show()
         
-        if frames:
-            self._display_text(frames[0])
-            self.frame_label.setText(f"1/{len(frames)}")
+        if asset.frames:
+            self._show_animation_frame()
+            self.frame_label.setText(f"1/{len(asset.frames)}")
+    
+    def _parse_ansi_runs(self, text):
+        """Parse ANSI text into merged (hex_color, text) runs"""
+        return resolve_spans(tokenize_cached(text), self.ANSI_COLORS, CompactColors.GRAPE_BRIGHT)
+    
+    def _fill_document(self, cursor, text):
+        """Insert ANSI text at cursor in a single edit block"""
+        formats = {}
+        cursor.beginEditBlock()
+        for color, segment in self._parse_ansi_runs(text):
+            char_format = formats.get(color)
+            if char_format is None:
+                char_format = formats[color] = QTextCharFormat()
+                char_format.setForeground(QColor(color))
+            cursor.insertText(segment, char_format)
+        cursor.endEditBlock()
     
     def _display_text(self, text):
         """Display text with ANSI color support"""
         self.text_display.clear()
-        self.text_display.moveCursor(QTextCursor.MoveOperation.End)
-        
-        # Parse ANSI codes
-        parts = text.split('\x1b[')
-        for part in parts:
-            if 'm' in part:
-                try:
-                    code_part, text_part = part.split('m', 1)
-                    if not code_part:
-                        continue
-                    
-                    color_code = int(code_part.split(';')[0])
-                    color = QColor(CompactColors.GRAPE_BRIGHT)
-                    
-                    if 30 <= color_code <= 37:
-                        colors = [
-                            CompactColors.TEXT_DIM,
-                            "#d89aa3",
-                            CompactColors.GRAPE_BRIGHT,
-                            "#e0c097",
-                            CompactColors.DUSTY_GRAPE,
-                            "#c5a3d8",
-                            CompactColors.GRAPE_LIGHT,
-                            CompactColors.TEXT_PRIMARY
-                        ]
-                        color = QColor(colors[color_code - 30])
-                    
-                    self.text_display.setTextColor(color)
-                    self.text_display.insertPlainText(text_part)
-                except:
-                    self.text_display.setTextColor(QColor(CompactColors.GRAPE_BRIGHT))
-                    self.text_display.insertPlainText(part)
-            else:
-                self.text_display.setTextColor(QColor(CompactColors.GRAPE_BRIGHT))
-                self.text_display.insertPlainText(part)
+        self._fill_document(QTextCursor(self.text_display.document()), text)
+    
+    def _render_frame_pixmap(self, text):
+        """Render an animation frame to a transparent pixmap the size of the display area"""
+        size = self.frame_view.size()
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(int(size.width() * ratio), int(size.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.GlobalColor.transparent)
+        
+        document = QTextDocument()
+        document.setUndoRedoEnabled(False)
+        document.setDefaultFont(self.text_display.font())
+        document.setDocumentMargin(14)  # Matches text_display padding + margin
+        self._fill_document(QTextCursor(document), text)
+        
+        painter = QPainter(pixmap)
+        document.drawContents(painter, QRectF(0, 0, size.width(), size.height()))
+        painter.end()
+        return pixmap
+    
+    def _render_key(self):
+        """
+        Settings that affect rendered frames; widgets with equal keys share pixmaps
+        
+        The color theme is left out: frames use the fixed ANSI palette on a
+        transparent background, so switching themes keeps the cache.
+        """
+        size = self.frame_view.size()
+        return (self.font_size, size.width(), size.height(), self.devicePixelRatioF())
+    
+    def _get_frame_pixmap(self, index):
+        """Get rendered frame from the shared asset cache, rendering it on a miss"""
+        render_key = self._render_key()
+        pixmap = self.asset.get_rendered(render_key, index)
+        if pixmap is None:
+            pixmap = self._render_frame_pixmap(self.animation_frames[index])
+            self.asset.put_rendered(render_key, index, pixmap, pixmap.width() * pixmap.height() * 4)
+        return pixmap
+    
+    def _show_animation_frame(self):
+        """Blit current animation frame"""
+        if self.asset is not None and self.animation_frames and self.frame_view.isVisible():
+            self.frame_view.setPixmap(self._get_frame_pixmap(self.current_frame))
     
     def toggle_animation(self):
         """Toggle animation play/pause"""
-        if self.animation_timer.isActive():
-            self.animation_timer.stop()
+        if self.is_playing:
+            self._stop_animation()
             self.play_pause_btn.setText("▶")
         else:
             self._play_animation()
@@ -427,23 +531,89 @@ class FloatingAsciiWidget(QWidget):
         """Start animation playback"""
         if not self.animation_frames:
             return
+        self.is_playing = True
+        self._next_due = None
         self._schedule_next_frame()
     
+    def _stop_animation(self):
+        """Stop animation playback"""
+        self.is_playing = False
+        self.clock.cancel(self)
+    
+    def on_clock_tick(self, frame_time):
+        """Called by AnimationClock when the next frame is due"""
+        if self.is_playing and not self.is_suspended:
+            self._next_animation_frame()
+    
+    def on_visibility_changed(self, on_screen):
+        """Suspend rendering while hidden, minimized, covered or transparent"""
+        self.is_suspended = not on_screen
+        if self.is_suspended:
+            # Keep _next_due so the timeline position survives
+            self.clock.cancel(self)
+        elif self.is_playing:
+            self._catch_up()
+    
+    def _catch_up(self):
+        """Jump straight to the frame that is due now after being suspended"""
+        if self._next_due is None:
+            self._schedule_next_frame()
+            return
+        
+        now = self.clock.now()
+        if self._next_due <= now:
+            # Skip whole loops at once, then step through the rest
+            loop_duration = 0.0
+            for index in range(len(self.animation_frames)):
+                delay = self._get_frame_delay(index)
+                if delay is None:
+                    loop_duration = 0.0
+                    break
+                loop_duration += delay
+            if loop_duration > 0:
+                self._next_due += (now - self._next_due) // loop_duration * loop_duration
+            
+            while self._next_due <= now:
+                self.current_frame = (self.current_frame + 1) % len(self.animation_frames)
+                delay = self._get_frame_delay(self.current_frame)
+                if delay is None:
+                    break
+                self._next_due += delay
+        
+        self._show_animation_frame()
+        self.frame_label.setText(f"{self.current_frame + 1}/{len(self.animation_frames)}")
+        if self._get_frame_delay(self.current_frame) is not None:
+            self.clock.schedule(self, self._next_due)
+    
     def _next_animation_frame(self):
         """Show next animation frame"""
         self.current_frame = (self.current_frame + 1) % len(self.animation_frames)
-        self._display_text(self.animation_frames[self.current_frame])
+        self._show_animation_frame()
         self.frame_label.setText(f"{self.current_frame + 1}/{len(self.animation_frames)}")
         self._schedule_next_frame()
     
+    def _get_frame_delay(self, index):
+        """Get display time of a frame in seconds at the current speed, or None"""
+        if index >= len(self.animation_delays):
+            return None
+        speed = self.speed_slider.value() / 100.0
+        adjusted_delay = int(self.animation_delays[index] / speed)
+        return max(10, adjusted_delay) / 1000.0
+    
     def _schedule_next_frame(self):
         """Schedule next frame based on delay and speed"""
-        if self.current_frame < len(self.animation_delays):
-            base_delay = self.animation_delays[self.current_frame]
-            speed = self.speed_slider.value() / 100.0
-            adjusted_delay = int(base_delay / speed)
-            adjusted_delay = max(10, adjusted_delay)
-            self.animation_timer.start(adjusted_delay)
+        if self.is_suspended:
+            return
+        
+        adjusted_delay = self._get_frame_delay(self.current_frame)
+        if adjusted_delay is not None:
+            # Count from the previous due time so ticks don't drift;
+            # resync if we fell more than a frame behind
+            now = self.clock.now()
+            if self._next_due is None or self._next_due + adjusted_delay < now:
+                self._next_due = now
+            self._next_due += adjusted_delay
+            self.clock.schedule(self, self._next_due)
     
     def update_animation_speed(self, value):
         """Update animation speed"""
@@ -461,6 +631,8 @@ class FloatingAsciiWidget(QWidget):
             font = get_compact_font()
             font.setPointSize(size)
             self.text_display.setFont(font)
+            if self.is_animated:
+                self._show_animation_frame()
 
     def change_theme(self, index):
         """Change color theme"""
@@ -495,17 +667,20 @@ class FloatingAsciiWidget(QWidget):
         
         # Re-display current content with new colors
         if self.is_animated and self.animation_frames:
-            self._display_text(self.animation_frames[self.current_frame])
+            self._show_animation_frame()
         elif hasattr(self, '_current_text'):
             self._display_text(self._current_text)
 
     def eventFilter(self, obj, event):
-        """Filter events for text display viewport"""
-        if obj == self.text_display.viewport():
+        """Filter events for text display viewport and animation view"""
+        if obj == self.text_display.viewport() or obj == self.frame_view:
             if event.type() == QEvent.Type.MouseButtonPress:
                 if not self.ui_visible:
                     self.toggle_ui_visibility()
                     return True
+        if obj == self.frame_view:
+            if event.type() in (QEvent.Type.Resize, QEvent.Type.Show):
+                self._show_animation_frame()
         return super().eventFilter(obj, event)
     
     def toggle_ui_visibility(self):
@@ -577,6 +752,11 @@ class FloatingAsciiWidget(QWidget):
                     }}
                 """)
     
+    def closeEvent(self, event):
+        """Stop ticking and release the shared asset when the widget is closed"""
+        self.release_asset()
+        super().closeEvent(event)
+    
     # Mouse events for dragging
     def mousePressEvent(self, event):
         """Handle mouse press for dragging, resizing, and UI toggle"""
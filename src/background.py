@@ -1,13 +1,22 @@
 import logging
-from rembg import remove
+from rembg import new_session, remove
 from PIL import Image
 
+_session = None
+
+def get_session():
+    """Get the rembg session, loading the model on first use (once per process)"""
+    global _session
+    if _session is None:
+        _session = new_session()
+    return _session
+
 def remove_background_from_image(input_path: str) -> Image.Image:
     try:
         logging.info(f"Rembg: Otvaram sliku sa putanje: {input_path}")
         with Image.open(input_path) as img:
             logging.info("Rembg: Slika uspješno otvorena. Započinjem uklanjanje pozadine...")
-            output_image = remove(img)
+            output_image = remove(img, session=get_session())
             logging.info(f"Rembg: Pozadina uspješno uklonjena. Vraćam PIL Image objekat tipa: {type(output_image)}")
             return output_image
     except Exception as e:
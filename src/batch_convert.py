@@ -0,0 +1,428 @@
+"""
+Batch Converter
+Converts files, globs and directories of images and GIFs to TXT, ANSI or HTML
+from the command line, in parallel and without Qt
+
+Usage:
+    python src/batch_convert.py assets/ "more/*.gif" -f html -o out/ --width 100
+"""
+
+import argparse
+import glob
+import json
+import multiprocessing
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn, TimeRemainingColumn
+
+from ansi_parser import strip_ansi
+from character_sets import CharacterSet
+from conversion import (IMAGE_EXTENSIONS, ANIMATED_EXTENSIONS, convert_image, convert_gif,
+                        convert_frame, get_char_set, load_frames, preprocess_image, render_image)
+from gif_exporter import GifExporter, atomic_write
+from pipeline import Pipeline, Stage
+from settings_manager import SettingsManager, AspectRatioMode
+
+# Output formats: extension and exporter for animations
+OUTPUT_FORMATS = {
+    'txt': ('.txt', GifExporter.export_to_single_txt),
+    'ansi': ('.ans', GifExporter.export_to_ansi),
+    'html': ('.html', GifExporter.export_to_colored_html),
+}
+
+# Items waiting between two pipeline stages
+PIPELINE_QUEUE_SIZE = 2
+
+# Settings that affect conversion (subset of SettingsManager.DEFAULT_SETTINGS)
+CONVERSION_SETTINGS = ('width', 'character_set', 'brightness', 'contrast', 'invert',
+                       'remove_background', 'aspect_ratio')
+
+
+class ConversionResult:
+    """Outcome of converting one file"""
+    
+    def __init__(self, source: str, output: str):
+        self.source = source
+        self.output = output
+        self.frames = 0
+        self.seconds = 0.0
+        self.error: Optional[str] = None
+
+
+class BatchReport:
+    """Totals over a batch run"""
+    
+    def __init__(self):
+        self.results: List[ConversionResult] = []
+        self.seconds = 0.0
+    
+    @property
+    def failures(self) -> List[ConversionResult]:
+        return [result for result in self.results if result.error]
+    
+    @property
+    def frame_count(self) -> int:
+        return sum(result.frames for result in self.results if not result.error)
+
+
+def get_conversion_settings(overrides: Dict) -> Dict:
+    """DEFAULT_SETTINGS conversion values with overrides applied"""
+    settings = {key: SettingsManager.DEFAULT_SETTINGS[key] for key in CONVERSION_SETTINGS}
+    settings.update({key: value for key, value in overrides.items() if key in CONVERSION_SETTINGS})
+    return settings
+
+
+def write_static(art: str, output_path: str, output_format: str):
+    """Write one converted static image in an output format"""
+    if output_format == 'html':
+        if not GifExporter.export_to_colored_html([art], [0], output_path):
+            raise RuntimeError("HTML export failed")
+        return
+    
+    with atomic_write(output_path) as f:
+        if output_format == 'ansi':
+            f.write(art + '\x1b[0m\n')
+        else:
+            f.write(strip_ansi(art))
+
+
+def convert_file(source: str, output_path: str, output_format: str, settings: Dict) -> ConversionResult:
+    """
+    Convert one file and write the result (runs in a worker process)
+    
+    Never raises; errors are returned in the result.
+    """
+    started = time.perf_counter()
+    result = ConversionResult(source, output_path)
+    try:
+        char_set = get_char_set(settings['character_set'])
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        
+        if source.lower().endswith(ANIMATED_EXTENSIONS):
+            frames, delays = convert_gif(
+                source, settings['width'], char_set=char_set,
+                brightness=settings['brightness'], contrast=settings['contrast'],
+                invert=settings['invert'], aspect_ratio=settings['aspect_ratio']
+            )
+            if not frames:
+                raise RuntimeError("no frames converted")
+            if not OUTPUT_FORMATS[output_format][1](frames, delays, output_path):
+                raise RuntimeError(f"{output_format} export failed")
+            result.frames = len(frames)
+        else:
+            art = convert_image(
+                source, settings['width'], remove_bg=settings['remove_background'], char_set=char_set,
+                brightness=settings['brightness'], contrast=settings['contrast'],
+                invert=settings['invert'], aspect_ratio=settings['aspect_ratio']
+            )
+            if not art:
+                raise RuntimeError("conversion failed")
+            write_static(art, output_path, output_format)
+            result.frames = 1
+    except Exception as e:
+        result.error = str(e) or type(e).__name__
+    
+    result.seconds = time.perf_counter() - started
+    return result
+
+
+def find_sources(inputs: List[str], recursive: bool = True) -> List[Tuple[str, str]]:
+    """
+    Expand files, globs and directories into image files
+    
+    Returns:
+        (source path, path relative to its input root) pairs, in order,
+        without duplicates
+    """
+    sources = {}
+    for item in inputs:
+        if os.path.isdir(item):
+            pattern = '**/*' if recursive else '*'
+            for path in sorted(Path(item).glob(pattern)):
+                if path.is_file() and path.suffix.lower() in IMAGE_EXTENSIONS:
+                    sources.setdefault(str(path), str(path.relative_to(item)))
+            continue
+        
+        matches = sorted(glob.glob(item, recursive=True)) if glob.has_magic(item) else [item]
+        for match in matches:
+            if os.path.isfile(match) and match.lower().endswith(IMAGE_EXTENSIONS):
+                sources.setdefault(match, os.path.basename(match))
+    return list(sources.items())
+
+
+def plan_outputs(sources: List[Tuple[str, str]], output_format: str,
+                 output_dir: Optional[str]) -> List[Tuple[str, str]]:
+    """
+    Pick an output path for every source
+    
+    Outputs go next to the sources, or mirror the input layout under
+    output_dir. Sources that would collide (image.png and image.gif)
+    keep their original extension in the output name.
+    
+    Returns:
+        (source, output path) pairs
+    """
+    extension = OUTPUT_FORMATS[output_format][0]
+    
+    def target(source, relative, keep_suffix):
+        base = relative if output_dir else source
+        name = base if keep_suffix else os.path.splitext(base)[0]
+        return os.path.join(output_dir, name + extension) if output_dir else name + extension
+    
+    counts = {}
+    for source, relative in sources:
+        path = os.path.normcase(os.path.abspath(target(source, relative, False)))
+        counts[path] = counts.get(path, 0) + 1
+    
+    plan = []
+    for source, relative in sources:
+        path = target(source, relative, False)
+        if counts[os.path.normcase(os.path.abspath(path))] > 1:
+            path = target(source, relative, True)
+        plan.append((source, path))
+    return plan
+
+
+def run_batch(plan: List[Tuple[str, str]], output_format: str, settings: Dict,
+              jobs: int, console: Console) -> BatchReport:
+    """Convert every planned file across a process pool"""
+    report = BatchReport()
+    started = time.perf_counter()
+    
+    with Progress(TextColumn("Converting"), BarColumn(), MofNCompleteColumn(), TimeRemainingColumn(),
+                  console=console, transient=True) as progress, \
+            ProcessPoolExecutor(max_workers=jobs) as pool:
+        task = progress.add_task("convert", total=len(plan))
+        futures = [pool.submit(convert_file, source, output, output_format, settings)
+                   for source, output in plan]
+        for future in as_completed(futures):
+            result = future.result()
+            report.results.append(result)
+            if result.error:
+                progress.console.print(f"[red]✗ {result.source}: {result.error}[/red]")
+            progress.advance(task)
+    
+    report.seconds = time.perf_counter() - started
+    return report
+
+
+class _FileJob:
+    """A file moving through the staged pipeline"""
+    
+    def __init__(self, source: str, output: str):
+        self.result = ConversionResult(source, output)
+        self.started = time.perf_counter()
+        self.animated = source.lower().endswith(ANIMATED_EXTENSIONS)
+        self.images = None
+        self.delays = None
+        self.frames = None
+
+
+def _render_frames(images: List, columns: int, char_set: Optional[str], animated: bool) -> List[Optional[str]]:
+    """Render prepared frames to ASCII art (runs in a worker process)"""
+    if animated:
+        return [convert_frame(image, columns, char_set) for image in images]
+    return [render_image(image, columns, char_set) for image in images]
+
+
+def _guard(step):
+    """Skip jobs that already failed and record errors instead of raising"""
+    def run(job: _FileJob) -> _FileJob:
+        if job.result.error is None:
+            try:
+                step(job)
+            except Exception as e:
+                job.result.error = str(e) or type(e).__name__
+                job.images = job.frames = None
+        return job
+    return run
+
+
+def create_batch_pipeline(output_format: str, settings: Dict, render_pool: ProcessPoolExecutor,
+                          jobs: int) -> Pipeline:
+    """
+    Build a decode, preprocess, render and write pipeline for convert_file's work
+    
+    Decoding, color adjustments and writing run on threads (Pillow and file
+    I/O release the GIL); rendering runs in render_pool with jobs threads
+    feeding it. Each stage takes and returns _FileJob items.
+    """
+    char_set = get_char_set(settings['character_set'])
+    
+    def decode(job: _FileJob):
+        job.images, job.delays = load_frames(job.result.source)
+    
+    def preprocess(job: _FileJob):
+        if settings['remove_background'] and not job.animated:
+            # rembg loads an ONNX model; only import it when needed
+            from background import remove_background_from_image
+            processed_image = remove_background_from_image(job.result.source)
+            if processed_image:
+                job.images = [processed_image]
+        job.images = [preprocess_image(image, settings['brightness'], settings['contrast'],
+                                       settings['invert'], settings['aspect_ratio'])
+                      for image in job.images]
+    
+    def render(job: _FileJob):
+        frames = render_pool.submit(_render_frames, job.images, settings['width'], char_set,
+                                    job.animated).result()
+        job.images = None
+        # Frames that failed are dropped, as in iter_gif_frames
+        job.delays = [delay for frame, delay in zip(frames, job.delays) if frame]
+        job.frames = [frame for frame in frames if frame]
+        if not job.frames:
+            raise RuntimeError("no frames converted" if job.animated else "conversion failed")
+    
+    def write(job: _FileJob):
+        output_path = job.result.output
+        os.makedirs(os.path.dirname(os.path.abspath(output_path)), exist_ok=True)
+        if job.animated:
+            if not OUTPUT_FORMATS[output_format][1](job.frames, job.delays, output_path):
+                raise RuntimeError(f"{output_format} export failed")
+        else:
+            write_static(job.frames[0], output_path, output_format)
+        job.result.frames = len(job.frames)
+        job.frames = None
+    
+    return Pipeline([
+        Stage('decode', _guard(decode), workers=2),
+        Stage('preprocess', _guard(preprocess), workers=2),
+        Stage('render', _guard(render), workers=jobs),
+        Stage('write', _guard(write), workers=1),
+    ], queue_size=PIPELINE_QUEUE_SIZE)
+
+
+def run_pipeline_batch(plan: List[Tuple[str, str]], output_format: str, settings: Dict,
+                       jobs: int, console: Console) -> Tuple[BatchReport, Pipeline]:
+    """Convert every planned file through the staged pipeline (see create_batch_pipeline)"""
+    report = BatchReport()
+    started = time.perf_counter()
+    
+    # Spawn instead of fork: the pipeline's threads are already running
+    render_pool = ProcessPoolExecutor(max_workers=jobs, mp_context=multiprocessing.get_context('spawn'))
+    pipeline = create_batch_pipeline(output_format, settings, render_pool, jobs)
+    try:
+        with Progress(TextColumn("Converting"), BarColumn(), MofNCompleteColumn(), TimeRemainingColumn(),
+                      console=console, transient=True) as progress:
+            task = progress.add_task("convert", total=len(plan))
+            for job in pipeline.run(_FileJob(source, output) for source, output in plan):
+                result = job.result
+                result.seconds = time.perf_counter() - job.started
+                report.results.append(result)
+                if result.error:
+                    progress.console.print(f"[red]✗ {result.source}: {result.error}[/red]")
+                progress.advance(task)
+    finally:
+        render_pool.shutdown(wait=True, cancel_futures=True)
+    
+    report.seconds = time.perf_counter() - started
+    return report, pipeline
+
+
+def print_utilization(pipeline: Pipeline, console: Console):
+    """Print how each stage spent its time in the last run"""
+    seconds = max(pipeline.seconds, 1e-9)
+    console.print(f"{'Stage':<12}{'Workers':>8}{'Items':>8}{'Busy':>8}{'Starved':>9}{'Blocked':>9}")
+    for stage in pipeline.stages:
+        worker_seconds = seconds * stage.workers
+        console.print(
+            f"{stage.name:<12}{stage.workers:>8}{stage.items:>8}"
+            f"{stage.get_utilization(seconds):>8.0%}{stage.starved / worker_seconds:>9.0%}"
+            f"{stage.blocked / worker_seconds:>9.0%}"
+        )
+    
+    bottleneck = pipeline.get_bottleneck()
+    if bottleneck is not None:
+        console.print(f"Bottleneck: {bottleneck.name}")
+
+
+def print_report(report: BatchReport, console: Console):
+    """Print throughput and failures"""
+    converted = len(report.results) - len(report.failures)
+    seconds = max(report.seconds, 1e-9)
+    console.print(
+        f"Converted {converted}/{len(report.results)} files ({report.frame_count} frames) "
+        f"in {report.seconds:.1f}s: {converted / seconds:.1f} files/s, "
+        f"{report.frame_count / seconds:.1f} frames/s"
+    )
+    
+    if report.failures:
+        console.print(f"[red]{len(report.failures)} failed:[/red]")
+        for result in report.failures:
+            console.print(f"  {result.source}: {result.error}")
+
+
+def add_conversion_arguments(parser: argparse.ArgumentParser):
+    """Add output and conversion options; conversion defaults are SettingsManager.DEFAULT_SETTINGS"""
+    defaults = SettingsManager.DEFAULT_SETTINGS
+    parser.add_argument('-f', '--format', choices=list(OUTPUT_FORMATS), default='txt')
+    parser.add_argument('-o', '--output', help="output directory (default: next to each source)")
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--settings', help="JSON file with settings (same keys as the app's settings file)")
+    
+    parser.add_argument('--width', type=int, help=f"characters per line (default: {defaults['width']})")
+    parser.add_argument('--charset', dest='character_set',
+                        choices=[preset.value for preset in CharacterSet if preset != CharacterSet.CUSTOM],
+                        help=f"character set (default: {defaults['character_set']})")
+    parser.add_argument('--brightness', type=int, help=f"default: {defaults['brightness']}")
+    parser.add_argument('--contrast', type=int, help=f"default: {defaults['contrast']}")
+    parser.add_argument('--invert', action='store_true', default=None)
+    parser.add_argument('--remove-background', dest='remove_background', action='store_true', default=None,
+                        help="remove backgrounds of static images with rembg")
+    parser.add_argument('--aspect', dest='aspect_ratio', choices=AspectRatioMode.get_all_modes(),
+                        help=f"default: {defaults['aspect_ratio']}")
+
+
+def get_settings_from_args(args: argparse.Namespace) -> Dict:
+    """Conversion settings from defaults, the --settings file and flags (in that order)"""
+    overrides = {}
+    if args.settings:
+        with open(args.settings, 'r', encoding='utf-8') as f:
+            overrides.update(json.load(f))
+    overrides.update({key: value for key, value in vars(args).items() if value is not None})
+    return get_conversion_settings(overrides)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Convert images and GIFs to ASCII art in bulk")
+    parser.add_argument('inputs', nargs='+', help="files, glob patterns or directories")
+    parser.add_argument('--no-recursive', action='store_true', help="don't descend into subdirectories")
+    parser.add_argument('--pipeline', action='store_true',
+                        help="convert in decode/preprocess/render/write stages and report stage utilization")
+    add_conversion_arguments(parser)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    console = Console(stderr=True)
+    settings = get_settings_from_args(args)
+    
+    sources = find_sources(args.inputs, recursive=not args.no_recursive)
+    if not sources:
+        console.print("[red]No images or GIFs found[/red]")
+        return 1
+    
+    plan = plan_outputs(sources, args.format, args.output)
+    jobs = max(1, min(args.jobs, len(plan)))
+    console.print(f"Converting {len(plan)} files with {jobs} processes")
+    
+    if args.pipeline:
+        report, pipeline = run_pipeline_batch(plan, args.format, settings, jobs, console)
+        print_report(report, console)
+        print_utilization(pipeline, console)
+    else:
+        report = run_batch(plan, args.format, settings, jobs, console)
+        print_report(report, console)
+    return 1 if report.failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
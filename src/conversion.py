@@ -0,0 +1,216 @@
+"""
+Conversion Pipeline
+Qt-free image and GIF to ASCII conversion shared by the app and command-line tools
+"""
+
+import os
+import tempfile
+from typing import Callable, Iterator, List, Optional, Tuple
+
+from PIL import Image
+
+from converter import convert_image_to_ascii, convert_image_to_ascii_custom
+from character_sets import CharacterSet, CharacterSetManager
+from image_adjustments import ImageAdjustments
+from settings_manager import AspectRatioMode
+
+# Files the app can open; GIFs are converted as animations
+IMAGE_EXTENSIONS = ('.png', '.jpg', '.jpeg', '.bmp', '.gif')
+ANIMATED_EXTENSIONS = ('.gif',)
+
+
+def get_char_set(name: str, custom_chars: str = None) -> Optional[str]:
+    """
+    Get the characters for a character set setting value
+    
+    Args:
+        name: CharacterSet value (e.g. 'detailed', 'blocks')
+        custom_chars: Characters for the custom set
+    
+    Returns:
+        Character string, or None for the default ascii_magic conversion
+    """
+    try:
+        preset = CharacterSet(name)
+    except ValueError:
+        preset = CharacterSet.DETAILED
+    if preset == CharacterSet.DETAILED:
+        return None
+    return CharacterSetManager.get_character_set(preset, custom_chars)
+
+
+def apply_aspect_ratio(img: Image.Image, aspect_ratio: str) -> Image.Image:
+    """Stretch an image to an aspect ratio mode (no-op for 'original' or close ratios)"""
+    if aspect_ratio == 'original':
+        return img
+    
+    ratio = AspectRatioMode.get_ratio(aspect_ratio)
+    if ratio > 0:
+        current_ratio = img.width / img.height
+        if abs(current_ratio - ratio) > 0.1:
+            if ratio > current_ratio:
+                new_width = int(img.height * ratio)
+                img = img.resize((new_width, img.height), Image.Resampling.LANCZOS)
+            else:
+                new_height = int(img.width / ratio)
+                img = img.resize((img.width, new_height), Image.Resampling.LANCZOS)
+    return img
+
+
+def convert_image(file_path: str, columns: int, remove_bg: bool = False, char_set: str = None,
+                  brightness: int = 0, contrast: int = 100, invert: bool = False,
+                  aspect_ratio: str = 'original') -> Optional[str]:
+    """
+    Convert a static image file to colored ASCII art
+    
+    Args:
+        file_path: Image file path
+        columns: Output width in characters
+        remove_bg: Remove the background with rembg first
+        char_set: Custom characters, or None for the default conversion
+        brightness: Brightness adjustment (-100 to 100)
+        contrast: Contrast in percent
+        invert: Invert colors
+        aspect_ratio: AspectRatioMode value
+    
+    Returns:
+        ANSI ASCII art, or None if conversion failed
+    """
+    img = Image.open(file_path)
+    
+    if remove_bg:
+        # rembg loads an ONNX model; only import it when needed
+        from background import remove_background_from_image
+        processed_image = remove_background_from_image(file_path)
+        if processed_image:
+            img = processed_image
+    
+    img = preprocess_image(img, brightness, contrast, invert, aspect_ratio)
+    return render_image(img, columns, char_set)
+
+
+def preprocess_image(img: Image.Image, brightness: int = 0, contrast: int = 100, invert: bool = False,
+                     aspect_ratio: str = 'original') -> Image.Image:
+    """Apply the aspect ratio mode and color adjustments (same arguments as convert_image)"""
+    img = apply_aspect_ratio(img, aspect_ratio)
+    return ImageAdjustments.apply_all_adjustments(
+        img,
+        brightness=brightness,
+        contrast=contrast,
+        invert=invert
+    )
+
+
+def render_image(img: Image.Image, columns: int, char_set: str = None) -> Optional[str]:
+    """Convert a prepared static image to ASCII art"""
+    if char_set:
+        return convert_image_to_ascii_custom(img, columns=columns, char_set=char_set)
+    return convert_image_to_ascii(img, columns=columns)
+
+
+def convert_frame(frame_img: Image.Image, columns: int, char_set: str = None) -> Optional[str]:
+    """Convert one prepared GIF frame to ASCII art"""
+    if char_set:
+        return convert_image_to_ascii_custom(frame_img, columns, char_set)
+    
+    tmp = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
+    tmp_path = tmp.name
+    tmp.close()
+    
+    try:
+        frame_img.save(tmp_path, 'PNG')
+        return convert_image_to_ascii(tmp_path, columns=columns)
+    finally:
+        if os.path.exists(tmp_path):
+            try:
+                os.unlink(tmp_path)
+            except OSError:
+                pass
+
+
+def get_frame_count(file_path: str) -> int:
+    """Get the number of frames in an image file (1 for static images)"""
+    with Image.open(file_path) as img:
+        return getattr(img, 'n_frames', 1)
+
+
+def iter_gif_frames(gif_path: str, columns: int, char_set: str = None,
+                    brightness: int = 0, contrast: int = 100, invert: bool = False,
+                    aspect_ratio: str = 'original',
+                    progress: Optional[Callable[[int, int], None]] = None) -> Iterator[Tuple[str, int]]:
+    """
+    Convert GIF frames one at a time
+    
+    Args:
+        gif_path: Animated image file path
+        columns: Output width in characters
+        char_set: Custom characters, or None for the default conversion
+        brightness, contrast, invert, aspect_ratio: Same as convert_image()
+        progress: Optional callback, called with (frames_done, total_frames)
+    
+    Yields:
+        (ascii_frame, delay_ms) for every frame that converted
+    """
+    with Image.open(gif_path) as gif:
+        total_frames = 0
+        try:
+            while True:
+                gif.seek(total_frames)
+                total_frames += 1
+        except EOFError:
+            pass
+        
+        for frame_index in range(total_frames):
+            gif.seek(frame_index)
+            delay = gif.info.get('duration', 100)
+            frame_img = preprocess_image(gif.convert('RGB'), brightness, contrast, invert, aspect_ratio)
+            
+            ascii_frame = convert_frame(frame_img, columns, char_set)
+            if ascii_frame:
+                yield ascii_frame, delay
+            
+            if progress is not None:
+                progress(frame_index + 1, total_frames)
+
+
+def convert_gif(gif_path: str, columns: int, char_set: str = None,
+                brightness: int = 0, contrast: int = 100, invert: bool = False,
+                aspect_ratio: str = 'original',
+                progress: Optional[Callable[[int, int], None]] = None) -> Tuple[List[str], List[int]]:
+    """
+    Convert every GIF frame (see iter_gif_frames)
+    
+    Returns:
+        (frames, delays)
+    """
+    frames = []
+    delays = []
+    for frame, delay in iter_gif_frames(gif_path, columns, char_set, brightness, contrast,
+                                        invert, aspect_ratio, progress):
+        frames.append(frame)
+        delays.append(delay)
+    return frames, delays
+
+
+def load_frames(file_path: str) -> Tuple[List[Image.Image], List[int]]:
+    """
+    Decode every frame of an image file
+    
+    Animated files (ANIMATED_EXTENSIONS) give RGB frames with their delays
+    like iter_gif_frames; other images give one frame with delay 0.
+    
+    Returns:
+        (images, delays)
+    """
+    with Image.open(file_path) as img:
+        if not file_path.lower().endswith(ANIMATED_EXTENSIONS):
+            img.load()
+            return [img.copy()], [0]
+        
+        images = []
+        delays = []
+        for frame_index in range(getattr(img, 'n_frames', 1)):
+            img.seek(frame_index)
+            images.append(img.convert('RGB'))
+            delays.append(img.info.get('duration', 100))
+        return images, delays
@@ -0,0 +1,518 @@
+"""
+Conversion Server
+Local HTTP service that converts uploaded images and GIFs to ASCII art, without Qt
+
+Usage:
+    python src/conversion_server.py --port 8765 --jobs 4
+    curl --data-binary @image.png "http://127.0.0.1:8765/convert?format=html&width=100"
+"""
+
+import argparse
+import asyncio
+import contextlib
+import hashlib
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import tempfile
+import time
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from http import HTTPStatus
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlsplit
+
+from rich.console import Console
+
+from batch_convert import OUTPUT_FORMATS, convert_file, get_conversion_settings
+from character_sets import CharacterSet
+from settings_manager import AspectRatioMode
+
+CONTENT_TYPES = {
+    'txt': 'text/plain; charset=utf-8',
+    'ansi': 'text/plain; charset=utf-8',
+    'html': 'text/html; charset=utf-8',
+}
+
+# Limits per connection
+MAX_UPLOAD_BYTES = 32 * 1024 * 1024
+MAX_HEADER_BYTES = 64 * 1024
+IDLE_TIMEOUT = 30.0
+
+# Default limits for the whole server
+MAX_CONNECTIONS = 64
+RESULT_CACHE_BYTES = 64 * 1024 * 1024
+
+# Seconds running requests get to finish when the server stops
+SHUTDOWN_TIMEOUT = 30.0
+
+# Answer with 503 and this Retry-After (seconds) when the queue is full
+RETRY_AFTER = 1
+
+
+class HttpError(Exception):
+    """Error response for a request"""
+    
+    def __init__(self, status: HTTPStatus, message: str = '', close: bool = False):
+        super().__init__(message or status.phrase)
+        self.status = status
+        self.message = message or status.phrase
+        self.close = close
+
+
+class ResultCache:
+    """LRU cache of converted results, limited by total size in bytes"""
+    
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self.entries: OrderedDict = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, key: str) -> Optional[Tuple[bytes, int]]:
+        entry = self.entries.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.entries.move_to_end(key)
+        self.hits += 1
+        return entry
+    
+    def put(self, key: str, entry: Tuple[bytes, int]):
+        if key in self.entries or len(entry[0]) > self.max_bytes:
+            return
+        while self.entries and self.size + len(entry[0]) > self.max_bytes:
+            _, (evicted, _) = self.entries.popitem(last=False)
+            self.size -= len(evicted)
+        self.entries[key] = entry
+        self.size += len(entry[0])
+
+
+def _init_worker():
+    """Leave Ctrl+C to the server; it shuts the pool down"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def convert_upload(data: bytes, output_format: str, settings: Dict) -> Tuple[bytes, int]:
+    """
+    Convert uploaded image bytes (runs in a worker process)
+    
+    Uses the batch converter, so results match batch and watch-folder output.
+    
+    Returns:
+        (converted file contents, frame count)
+    
+    Raises:
+        RuntimeError: If the upload could not be converted
+    """
+    suffix = '.gif' if data[:4] == b'GIF8' else '.png'
+    with tempfile.TemporaryDirectory(prefix='ascii_server_') as directory:
+        source = os.path.join(directory, 'upload' + suffix)
+        output_path = os.path.join(directory, 'output' + OUTPUT_FORMATS[output_format][0])
+        with open(source, 'wb') as f:
+            f.write(data)
+        
+        result = convert_file(source, output_path, output_format, settings)
+        if result.error:
+            raise RuntimeError(result.error.replace(source, 'upload'))
+        with open(output_path, 'rb') as f:
+            return f.read(), result.frames
+
+
+def parse_bool(value: str) -> bool:
+    if value.lower() in ('1', 'true', 'yes', 'on'):
+        return True
+    if value.lower() in ('0', 'false', 'no', 'off'):
+        return False
+    raise ValueError(f"not a boolean: {value}")
+
+
+def parse_request_settings(query: Dict[str, List[str]], base_settings: Dict) -> Tuple[str, Dict]:
+    """
+    Read the output format and conversion settings from query parameters
+    
+    Parameters use the settings file names (width, character_set, brightness,
+    contrast, invert, remove_background, aspect_ratio); missing ones come
+    from base_settings.
+    
+    Returns:
+        (output format, settings)
+    
+    Raises:
+        HttpError: For unknown or invalid values
+    """
+    output_format = query.get('format', ['txt'])[-1]
+    if output_format not in OUTPUT_FORMATS:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"format must be one of {', '.join(OUTPUT_FORMATS)}")
+    
+    settings = dict(base_settings)
+    character_sets = [preset.value for preset in CharacterSet if preset != CharacterSet.CUSTOM]
+    for key, values in query.items():
+        if key == 'format':
+            continue
+        if key not in settings:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"unknown parameter: {key}")
+        
+        value = values[-1]
+        try:
+            if isinstance(settings[key], bool):
+                settings[key] = parse_bool(value)
+            elif isinstance(settings[key], int):
+                settings[key] = int(value)
+            else:
+                settings[key] = value
+        except ValueError as e:
+            raise HttpError(HTTPStatus.BAD_REQUEST, f"{key}: {e}")
+    
+    if not 1 <= settings['width'] <= 1000:
+        raise HttpError(HTTPStatus.BAD_REQUEST, "width must be between 1 and 1000")
+    if settings['character_set'] not in character_sets:
+        raise HttpError(HTTPStatus.BAD_REQUEST, f"character_set must be one of {', '.join(character_sets)}")
+    if settings['aspect_ratio'] not in AspectRatioMode.get_all_modes():
+        raise HttpError(HTTPStatus.BAD_REQUEST,
+                        f"aspect_ratio must be one of {', '.join(AspectRatioMode.get_all_modes())}")
+    return output_format, settings
+
+
+def format_response(status: HTTPStatus, body: bytes, content_type: str,
+                    headers: Optional[Dict[str, str]] = None, keep_alive: bool = True) -> bytes:
+    lines = [f'HTTP/1.1 {status.value} {status.phrase}',
+             f'Content-Type: {content_type}',
+             f'Content-Length: {len(body)}',
+             f'Connection: {"keep-alive" if keep_alive else "close"}']
+    lines.extend(f'{name}: {value}' for name, value in (headers or {}).items())
+    return ('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + body
+
+
+class ConversionServer:
+    """
+    Converts images and GIFs uploaded over HTTP
+    
+    Conversions run in a shared process pool, at most jobs at a time. Up
+    to max_queue more wait for a free worker; requests beyond that are
+    turned away with 503 and Retry-After, so callers back off instead of
+    piling work onto the server. Results are cached by upload contents,
+    format and settings, and identical requests arriving together share
+    one conversion. Each worker keeps its rembg session between requests.
+    
+    Endpoints:
+        POST /convert?format=txt|ansi|html&width=...  body: image or GIF bytes
+        GET /status  JSON counters
+    """
+    
+    def __init__(self, base_settings: Dict, jobs: int = 1, max_queue: int = 16,
+                 max_connections: int = MAX_CONNECTIONS, cache_bytes: int = RESULT_CACHE_BYTES,
+                 max_upload: int = MAX_UPLOAD_BYTES, console: Optional[Console] = None):
+        self.base_settings = base_settings
+        self.jobs = max(1, jobs)
+        self.max_queue = max(0, max_queue)
+        self.max_connections = max_connections
+        self.max_upload = max_upload
+        self.cache = ResultCache(cache_bytes)
+        self.console = console or Console(stderr=True)
+        
+        self.pool: Optional[ProcessPoolExecutor] = None
+        self.slots = asyncio.Semaphore(self.jobs)
+        self.in_progress: Dict[str, asyncio.Task] = {}
+        self.handlers = set()
+        self.idle = set()
+        self.stopping = False
+        self.running = 0
+        self.waiting = 0
+        self.converted = 0
+        self.failed = 0
+        self.rejected = 0
+    
+    async def start(self, host: str, port: int) -> asyncio.AbstractServer:
+        """Start the worker pool and listen for connections"""
+        # Spawn instead of fork: workers shouldn't inherit the event loop
+        self.pool = ProcessPoolExecutor(max_workers=self.jobs, mp_context=multiprocessing.get_context('spawn'),
+                                        initializer=_init_worker)
+        return await asyncio.start_server(self.handle_connection, host, port, limit=MAX_HEADER_BYTES)
+    
+    async def shutdown(self, timeout: float = SHUTDOWN_TIMEOUT):
+        """Close idle connections and let running requests finish"""
+        self.stopping = True
+        for writer in self.idle:
+            writer.close()
+        if self.handlers:
+            await asyncio.wait(self.handlers, timeout=timeout)
+    
+    def close(self):
+        """Stop the worker pool"""
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+    
+    def get_status(self) -> Dict:
+        return {
+            'jobs': self.jobs,
+            'running': self.running,
+            'waiting': self.waiting,
+            'max_queue': self.max_queue,
+            'connections': len(self.handlers),
+            'converted': self.converted,
+            'failed': self.failed,
+            'rejected': self.rejected,
+            'cache': {'entries': len(self.cache.entries), 'bytes': self.cache.size,
+                      'hits': self.cache.hits, 'misses': self.cache.misses},
+        }
+    
+    async def convert(self, data: bytes, output_format: str, settings: Dict) -> Tuple[bytes, int, str]:
+        """
+        Convert an upload, from the cache when possible
+        
+        Returns:
+            (converted contents, frame count, cache state): 'hit', 'miss', or
+            'coalesced' when the request waited on an identical conversion
+        
+        Raises:
+            HttpError: 503 when the queue is full, 422 when conversion fails
+        """
+        digest = hashlib.blake2b(data, digest_size=16)
+        digest.update(json.dumps([output_format, settings], sort_keys=True).encode('utf-8'))
+        key = digest.hexdigest()
+        
+        cached = self.cache.get(key)
+        if cached is not None:
+            return cached[0], cached[1], 'hit'
+        
+        # Identical request already converting: wait for its result
+        shared = self.in_progress.get(key)
+        if shared is not None:
+            content, frames = await asyncio.shield(shared)
+            return content, frames, 'coalesced'
+        
+        if self.slots.locked() and self.waiting >= self.max_queue:
+            self.rejected += 1
+            raise HttpError(HTTPStatus.SERVICE_UNAVAILABLE, "conversion queue is full, retry later")
+        
+        # The conversion runs in its own task, so it finishes for the other
+        # waiters even when the request that started it is cancelled
+        self.waiting += 1
+        task = asyncio.create_task(self.run_conversion(key, data, output_format, settings))
+        # Mark failures retrieved so a conversion nobody waits for anymore isn't logged
+        task.add_done_callback(lambda done: done.cancelled() or done.exception())
+        self.in_progress[key] = task
+        content, frames = await asyncio.shield(task)
+        return content, frames, 'miss'
+    
+    async def run_conversion(self, key: str, data: bytes, output_format: str,
+                             settings: Dict) -> Tuple[bytes, int]:
+        """Convert in the worker pool once a slot is free (counted in waiting until then)"""
+        try:
+            try:
+                await self.slots.acquire()
+            finally:
+                self.waiting -= 1
+            
+            self.running += 1
+            try:
+                loop = asyncio.get_running_loop()
+                content, frames = await loop.run_in_executor(self.pool, convert_upload, data,
+                                                             output_format, settings)
+            finally:
+                self.running -= 1
+                self.slots.release()
+        except Exception as e:
+            self.failed += 1
+            if isinstance(e, HttpError):
+                raise
+            raise HttpError(HTTPStatus.UNPROCESSABLE_ENTITY, f"conversion failed: {e}")
+        finally:
+            del self.in_progress[key]
+        
+        self.converted += 1
+        self.cache.put(key, (content, frames))
+        return content, frames
+    
+    async def read_request(self, reader: asyncio.StreamReader) -> Optional[Tuple[str, str, Dict, str]]:
+        """
+        Read a request line and headers
+        
+        Returns:
+            (method, target, headers, HTTP version), or None when the client closed the connection
+        """
+        try:
+            request_line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+            if not request_line.strip():
+                return None
+            method, target, version = request_line.decode('latin-1').split()
+            
+            headers = {}
+            while True:
+                line = await asyncio.wait_for(reader.readline(), IDLE_TIMEOUT)
+                if line in (b'\r\n', b'\n', b''):
+                    break
+                name, _, value = line.decode('latin-1').partition(':')
+                headers[name.strip().lower()] = value.strip()
+        except (ValueError, asyncio.LimitOverrunError):
+            raise HttpError(HTTPStatus.BAD_REQUEST, "malformed request", close=True)
+        return method.upper(), target, headers, version
+    
+    async def read_body(self, reader: asyncio.StreamReader, headers: Dict) -> bytes:
+        if 'transfer-encoding' in headers:
+            raise HttpError(HTTPStatus.LENGTH_REQUIRED, "chunked uploads are not supported", close=True)
+        try:
+            length = int(headers.get('content-length', '0'))
+        except ValueError:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "invalid Content-Length", close=True)
+        if length < 0:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "invalid Content-Length", close=True)
+        if length > self.max_upload:
+            raise HttpError(HTTPStatus.REQUEST_ENTITY_TOO_LARGE,
+                            f"uploads are limited to {self.max_upload // (1024 * 1024)} MB", close=True)
+        return await asyncio.wait_for(reader.readexactly(length), IDLE_TIMEOUT)
+    
+    async def handle_request(self, method: str, target: str, headers: Dict,
+                             reader: asyncio.StreamReader) -> Tuple[HTTPStatus, bytes, str, Dict]:
+        """
+        Route one request
+        
+        Returns:
+            (status, body, content type, extra headers)
+        """
+        url = urlsplit(target)
+        # Unread request bodies would be taken for the next request
+        has_body = 'content-length' in headers or 'transfer-encoding' in headers
+        if url.path == '/status':
+            if method != 'GET':
+                raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, close=has_body)
+            return HTTPStatus.OK, json.dumps(self.get_status()).encode('utf-8'), 'application/json', {}
+        
+        if url.path != '/convert':
+            raise HttpError(HTTPStatus.NOT_FOUND, close=has_body)
+        if method != 'POST':
+            raise HttpError(HTTPStatus.METHOD_NOT_ALLOWED, close=has_body)
+        
+        data = await self.read_body(reader, headers)
+        output_format, settings = parse_request_settings(parse_qs(url.query), self.base_settings)
+        if not data:
+            raise HttpError(HTTPStatus.BAD_REQUEST, "empty upload")
+        
+        content, frames, cache_state = await self.convert(data, output_format, settings)
+        return HTTPStatus.OK, content, CONTENT_TYPES[output_format], \
+            {'X-Frames': str(frames), 'X-Cache': cache_state}
+    
+    async def handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter):
+        """Serve requests on one connection until it closes (HTTP/1.1 keep-alive)"""
+        if len(self.handlers) >= self.max_connections:
+            self.rejected += 1
+            writer.write(format_response(HTTPStatus.SERVICE_UNAVAILABLE, b"too many connections\n",
+                                         'text/plain; charset=utf-8', {'Retry-After': str(RETRY_AFTER)},
+                                         keep_alive=False))
+            writer.close()
+            return
+        
+        task = asyncio.current_task()
+        self.handlers.add(task)
+        try:
+            keep_alive = True
+            while keep_alive and not self.stopping:
+                self.idle.add(writer)
+                try:
+                    request = await self.read_request(reader)
+                except HttpError as e:
+                    writer.write(format_response(e.status, (e.message + '\n').encode('utf-8'),
+                                                 'text/plain; charset=utf-8', keep_alive=False))
+                    break
+                finally:
+                    self.idle.discard(writer)
+                if request is None:
+                    break
+                
+                method, target, headers, version = request
+                connection = headers.get('connection', '').lower()
+                keep_alive = connection == 'keep-alive' if version == 'HTTP/1.0' else connection != 'close'
+                
+                started = time.perf_counter()
+                try:
+                    status, body, content_type, extra = await self.handle_request(method, target, headers, reader)
+                except HttpError as e:
+                    status, body, content_type = e.status, (e.message + '\n').encode('utf-8'), \
+                        'text/plain; charset=utf-8'
+                    extra = {'Retry-After': str(RETRY_AFTER)} if e.status == HTTPStatus.SERVICE_UNAVAILABLE else {}
+                    keep_alive = keep_alive and not e.close
+                keep_alive = keep_alive and not self.stopping
+                
+                writer.write(format_response(status, body, content_type, extra, keep_alive))
+                await writer.drain()
+                self.console.print(f"{method} {urlsplit(target).path} {status.value} "
+                                   f"{(time.perf_counter() - started) * 1000:.0f}ms "
+                                   f"{extra.get('X-Cache', '')}".rstrip())
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            self.handlers.discard(task)
+            writer.close()
+
+
+async def serve(server: ConversionServer, host: str, port: int):
+    """Serve until Ctrl+C or SIGTERM"""
+    listener = await server.start(host, port)
+    try:
+        addresses = ', '.join(f"http://{sock.getsockname()[0]}:{sock.getsockname()[1]}"
+                              for sock in listener.sockets)
+        server.console.print(f"Serving on {addresses} with {server.jobs} processes (Ctrl+C to stop)")
+        
+        # Stop from the loop so requests can finish (Windows has no loop
+        # signal handlers and stops with KeyboardInterrupt instead)
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        with contextlib.suppress(NotImplementedError):
+            for signal_number in (signal.SIGINT, signal.SIGTERM):
+                loop.add_signal_handler(signal_number, stop.set)
+        
+        await stop.wait()
+        listener.close()
+        await server.shutdown()
+        await listener.wait_closed()
+    finally:
+        server.close()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Serve image and GIF to ASCII art conversion over local HTTP")
+    parser.add_argument('--host', default='127.0.0.1', help="address to listen on (default: 127.0.0.1)")
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('-j', '--jobs', type=int, default=os.cpu_count() or 1,
+                        help="worker processes (default: CPU count)")
+    parser.add_argument('--queue', type=int, default=16,
+                        help="conversions that may wait for a worker before requests are refused (default: 16)")
+    parser.add_argument('--max-connections', type=int, default=MAX_CONNECTIONS)
+    parser.add_argument('--cache-mb', type=int, default=RESULT_CACHE_BYTES // (1024 * 1024),
+                        help="result cache size (default: 64)")
+    parser.add_argument('--max-upload-mb', type=int, default=MAX_UPLOAD_BYTES // (1024 * 1024))
+    parser.add_argument('--settings', help="JSON file with default settings (same keys as the app's settings file)")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    console = Console(stderr=True)
+    
+    overrides = {}
+    if args.settings:
+        with open(args.settings, 'r', encoding='utf-8') as f:
+            overrides = json.load(f)
+    
+    server = ConversionServer(
+        get_conversion_settings(overrides), jobs=args.jobs, max_queue=args.queue,
+        max_connections=args.max_connections, cache_bytes=args.cache_mb * 1024 * 1024,
+        max_upload=args.max_upload_mb * 1024 * 1024, console=console
+    )
+    try:
+        asyncio.run(serve(server, args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    except OSError as e:
+        console.print(f"[red]Cannot listen on {args.host}:{args.port}: {e}[/red]")
+        return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,16 +1,117 @@
+import contextlib
+import io
 import logging
 import ascii_magic
 from PIL import Image
 from typing import Union, List, Tuple, Optional
 
-def convert_image_to_ascii(image_source: Union[str, Image.Image], columns: int = 120, char_set: str = None) -> Optional[str]:
+# Cells whose alpha is below this value are rendered as bare spaces
+DEFAULT_ALPHA_THRESHOLD = 32
+
+ANSI_RESET = '\x1b[39m'
+
+
+def _to_terminal_string(art_object, columns: int) -> str:
+    """
+    Same as AsciiArt.to_terminal() without printing the art to stdout
+    
+    to_terminal() echoes every conversion, which floods the console for
+    GIFs and corrupts the output of command-line tools. The private
+    _img_to_art() it wraps is used when present (ascii_magic is pinned in
+    requirements.txt); otherwise the echo is captured and discarded.
+    """
+    img_to_art = getattr(art_object, '_img_to_art', None)
+    if img_to_art is not None:
+        return img_to_art(columns=columns)
+    with contextlib.redirect_stdout(io.StringIO()):
+        return art_object.to_terminal(columns=columns)
+
+
+def get_alpha_mask(image: Image.Image, size: Tuple[int, int], threshold: int = DEFAULT_ALPHA_THRESHOLD) -> Optional[bytes]:
+    """
+    Get per-cell transparency mask for an image resized to the ASCII grid
+    
+    Args:
+        image: PIL Image object
+        size: Grid size as (columns, rows)
+        threshold: Alpha value (0-255) below which a cell is transparent
+    
+    Returns:
+        Bytes with 1 for transparent cells and 0 for opaque ones,
+        or None if the image has no transparent cells
+    """
+    if threshold <= 0:
+        return None
+    
+    if image.mode not in ('RGBA', 'LA', 'PA') and 'transparency' not in image.info:
+        return None
+    
+    alpha = image.convert('RGBA').getchannel('A')
+    
+    # Fast exit for fully opaque images
+    if alpha.getextrema()[0] >= threshold:
+        return None
+    
+    alpha = alpha.resize(size)
+    mask = alpha.point(lambda a: 1 if a < threshold else 0).tobytes()
+    return mask if any(mask) else None
+
+
+def _get_ascii_magic_grid_size(image: Image.Image, columns: int, width_ratio: float = 2.2) -> Tuple[int, int]:
+    """Get the (columns, rows) grid ascii_magic produces for an image (mirrors AsciiArt._img_to_art)"""
+    scalar = image.width * width_ratio / columns
+    return int(image.width * width_ratio / scalar), int(image.height / scalar)
+
+
+def _render_character_list(lines: List[List[dict]], mask: bytes) -> str:
+    """
+    Build terminal string from ascii_magic character data, skipping transparent cells
+    
+    Args:
+        lines: Output of AsciiArt.to_character_list()
+        mask: Transparency mask from get_alpha_mask()
+    
+    Returns:
+        ASCII art string with bare spaces for transparent cells
+    """
+    rows = []
+    index = 0
+    for line in lines:
+        parts = []
+        previous_color = None
+        for character in line:
+            if mask[index]:
+                # Spaces render the same in any color, so keep the current run open
+                parts.append(' ')
+            else:
+                current_color = character['terminal-color']
+                if current_color != previous_color:
+                    previous_color = current_color
+                    parts.append(current_color)
+                parts.append(character['character'])
+            index += 1
+        
+        row = ''.join(parts).rstrip(' ')
+        if previous_color is not None:
+            row += ANSI_RESET
+        rows.append(row)
+    
+    return '\n'.join(rows) + '\n'
+
+
+def convert_image_to_ascii(image_source: Union[str, Image.Image], columns: int = 120, char_set: str = None,
+                           alpha_threshold: int = DEFAULT_ALPHA_THRESHOLD) -> Optional[str]:
     """
     Converts a single image (from a path or PIL object) into a colorful ASCII art string.
     
+    Cells whose alpha falls below alpha_threshold (e.g. after background
+    removal) are emitted as bare spaces without any color codes.
+    
     Args:
         image_source: Path to image or PIL Image object
         columns: Width in characters
         char_set: Custom character set (optional)
+        alpha_threshold: Alpha value (0-255) below which cells are empty, 0 disables
     
     Returns:
         ASCII art string or None on error
@@ -25,15 +126,23 @@ def convert_image_to_ascii(image_source: Union[str, Image.Image], columns: int =
 
         logging.info("Converter: Successfully created ascii_magic object.")
         
+        # Transparent images: render from character data so empty cells stay uncolored
+        mask = get_alpha_mask(art_object.image, _get_ascii_magic_grid_size(art_object.image, columns), alpha_threshold)
+        
+        if mask:
+            logging.info("Converter: Image has transparent cells, rendering them as bare spaces.")
+            lines = art_object.to_character_list(columns=columns)
+            ascii_art_string = _render_character_list(lines, mask)
+        
         # Use custom character set if provided
-        if char_set:
+        elif char_set:
             logging.info(f"Converter: Using custom character set: {char_set}")
             # ascii_magic doesn't directly support custom chars, so we'll do post-processing
-            ascii_art_string = art_object.to_terminal(columns=columns)
+            ascii_art_string = _to_terminal_string(art_object, columns)
             # Note: For true custom char support, we'd need to modify the algorithm
             # For now, we'll use ascii_magic's default and note this limitation
         else:
-            ascii_art_string = art_object.to_terminal(columns=columns)
+            ascii_art_string = _to_terminal_string(art_object, columns)
         
         logging.info("Converter: Successfully generated terminal string.")
         return ascii_art_string
@@ -41,7 +150,8 @@ def convert_image_to_ascii(image_source: Union[str, Image.Image], columns: int =
         logging.exception(f"Converter: An error occurred within the ascii_magic library: {e}")
         return None
 
-def convert_image_to_ascii_custom(image: Image.Image, columns: int = 120, char_set: str = "@%#*+=-:. ") -> str:
+def convert_image_to_ascii_custom(image: Image.Image, columns: int = 120, char_set: str = "@%#*+=-:. ",
+                                  alpha_threshold: int = DEFAULT_ALPHA_THRESHOLD) -> str:
     """
     Convert image to ASCII using custom character set with manual algorithm
     
@@ -49,6 +159,7 @@ def convert_image_to_ascii_custom(image: Image.Image, columns: int = 120, char_s
         image: PIL Image object
         columns: Width in characters
         char_set: Character set from dark to light
+        alpha_threshold: Alpha value (0-255) below which cells are empty, 0 disables
     
     Returns:
         ASCII art string
@@ -63,22 +174,26 @@ def convert_image_to_ascii_custom(image: Image.Image, columns: int = 120, char_s
         img_gray = img_resized.convert('L')  # Convert to grayscale
         
         # Get pixel data
-        pixels = list(img_gray.getdata())
+        pixels = img_gray.tobytes()
+        mask = get_alpha_mask(img_resized, (columns, rows), alpha_threshold)
         
-        # Convert pixels to characters
-        ascii_str = ""
+        # Map pixel brightness (0-255) to character once per value
         char_count = len(char_set) - 1
+        lookup = [char_set[int((value / 255) * char_count)] for value in range(256)]
         
-        for i, pixel in enumerate(pixels):
-            # Map pixel brightness (0-255) to character index
-            char_index = int((pixel / 255) * char_count)
-            ascii_str += char_set[char_index]
-            
-            # Add newline at end of row
-            if (i + 1) % columns == 0:
-                ascii_str += '\n'
+        # Convert pixels to characters
+        ascii_rows = []
+        for row_start in range(0, len(pixels), columns):
+            row_pixels = pixels[row_start:row_start + columns]
+            if mask:
+                row_mask = mask[row_start:row_start + columns]
+                # Trailing empty cells are trimmed, as in _render_character_list
+                row = ''.join(' ' if empty else lookup[pixel] for pixel, empty in zip(row_pixels, row_mask)).rstrip(' ')
+            else:
+                row = ''.join(lookup[pixel] for pixel in row_pixels)
+            ascii_rows.append(row + '\n')
         
-        return ascii_str
+        return ''.join(ascii_rows)
     except Exception as e:
         logging.exception(f"Converter: Error in custom conversion: {e}")
         return ""
@@ -3,11 +3,14 @@ GIF Animation Engine for ASCII Art
 Converts GIF frames to ASCII and plays them back
 """
 
-from PyQt6.QtCore import QObject, pyqtSignal, QTimer
+from PyQt6.QtCore import QObject, pyqtSignal
 from PIL import Image, ImageSequence
+from bisect import bisect_right
 import tempfile
 import os
 from converter import convert_image_to_ascii
+from animation_clock import AnimationClock
+from animation_assets import AnimationAssetRegistry
 
 
 class GifConverter(QObject):
@@ -97,10 +100,23 @@ class GifConverter(QObject):
 
 
 class GifPlayer(QObject):
-    """Plays back ASCII animation frames"""
+    """
+    Plays back ASCII animation frames
+    
+    Frames are scheduled against their intended presentation time on a
+    monotonic clock, so rendering time doesn't accumulate into the frame
+    delays. When rendering falls behind, late frames are skipped
+    (and counted) instead of slowing the animation down. Ticks come from
+    the shared AnimationClock.
+    """
     
     frame_changed = pyqtSignal(str, int)  # frame_text, frame_number
     playback_finished = pyqtSignal()
+    frames_dropped = pyqtSignal(int)  # total dropped frames
+    
+    MIN_DELAY_MS = 10
+    # Used for frames without a delay of their own
+    DEFAULT_DELAY_MS = 100
     
     def __init__(self):
         super().__init__()
@@ -110,15 +126,73 @@ class GifPlayer(QObject):
         self.is_playing = False
         self.is_looping = True
         self.playback_speed = 1.0
+        self.dropped_frames = 0
+        
+        # Suspended players keep their timeline but don't tick or emit frames
+        self.is_suspended = False
         
-        self.timer = QTimer()
-        self.timer.timeout.connect(self._next_frame)
+        # Timeline (in unscaled milliseconds)
+        self._frame_starts = [0]
+        self._total_duration = 0
+        self._position = 0.0
+        self._anchor_time = 0.0
+        
+        self.clock = AnimationClock.instance()
+        
+        # Shared asset the frames belong to
+        self.registry = AnimationAssetRegistry.instance()
+        self.asset_id = None
     
     def load_animation(self, frames, delays):
-        """Load animation data"""
-        self.frames = frames
-        self.delays = delays
+        """Load animation data, registering it as a new shared asset"""
+        self.release_asset()
+        asset = self.registry.register(frames, delays, self)
+        self._load_asset(asset)
+    
+    def load_asset(self, asset_id):
+        """
+        Load a registered animation asset by id
+        
+        Returns:
+            True if the asset is still registered
+        """
+        if asset_id == self.asset_id:
+            return True
+        
+        asset = self.registry.subscribe(asset_id, self)
+        if asset is None:
+            return False
+        
+        self.release_asset()
+        self._load_asset(asset)
+        return True
+    
+    def release_asset(self):
+        """Unsubscribe from the current asset"""
+        if self.asset_id is not None:
+            self.pause()
+            self.registry.unsubscribe(self.asset_id, self)
+            self.asset_id = None
+            self.frames = []
+            self.delays = []
+    
+    def _load_asset(self, asset):
+        """Reset playback state for a subscribed asset"""
+        self.clock.cancel(self)
+        self.asset_id = asset.asset_id
+        self.frames = asset.frames
+        self.delays = asset.delays
         self.current_frame = 0
+        self.dropped_frames = 0
+        self._position = 0.0
+        
+        # Precompute frame start times on the timeline (one per frame, even
+        # when there are fewer delays than frames)
+        self._frame_starts = [0]
+        for index in range(len(self.frames)):
+            delay = self.delays[index] if index < len(self.delays) else self.DEFAULT_DELAY_MS
+            self._frame_starts.append(self._frame_starts[-1] + max(self.MIN_DELAY_MS, delay))
+        self._total_duration = self._frame_starts[-1]
     
     def play(self):
         """Start playing animation"""
@@ -126,18 +200,22 @@ class GifPlayer(QObject):
             return
         
         self.is_playing = True
+        self._anchor_time = self.clock.now()
         self._show_current_frame()
         self._schedule_next_frame()
     
     def pause(self):
         """Pause animation"""
+        if self.is_playing:
+            self._position = self._get_position()
         self.is_playing = False
-        self.timer.stop()
+        self.clock.cancel(self)
     
     def stop(self):
         """Stop and reset animation"""
         self.pause()
         self.current_frame = 0
+        self._position = 0.0
         if self.frames:
             self._show_current_frame()
     
@@ -145,10 +223,36 @@ class GifPlayer(QObject):
         """
         Set playback speed multiplier
         
+        The current position on the timeline is kept.
+        
         Args:
             speed: 0.5 = half speed, 1.0 = normal, 2.0 = double speed
         """
+        if self.is_playing:
+            self._position = self._get_position()
+            self._anchor_time = self.clock.now()
+        
         self.playback_speed = max(0.1, min(speed, 5.0))
+        
+        if self.is_playing:
+            self._schedule_next_frame()
+    
+    def set_suspended(self, suspended):
+        """
+        Suspend or resume frame rendering (e.g. while the window is minimized)
+        
+        The timeline keeps running while suspended; on resume playback jumps
+        straight to the frame that is due now. Frames passed while suspended
+        are not counted as dropped.
+        """
+        if suspended == self.is_suspended:
+            return
+        
+        self.is_suspended = suspended
+        if suspended:
+            self.clock.cancel(self)
+        elif self.is_playing:
+            self._next_frame(count_dropped=False)
     
     def set_looping(self, loop):
         """Enable/disable looping"""
@@ -158,7 +262,20 @@ class GifPlayer(QObject):
         """Jump to specific frame"""
         if 0 <= frame_number < len(self.frames):
             self.current_frame = frame_number
+            self._position = float(self._frame_starts[frame_number])
+            self._anchor_time = self.clock.now()
             self._show_current_frame()
+            if self.is_playing:
+                self._schedule_next_frame()
+    
+    def _get_position(self, now=None):
+        """Get timeline position in unscaled milliseconds at clock time now"""
+        if not self.is_playing:
+            return self._position
+        if now is None:
+            now = self.clock.now()
+        elapsed_ms = (now - self._anchor_time) * 1000.0
+        return self._position + elapsed_ms * self.playback_speed
     
     def _show_current_frame(self):
         """Display current frame"""
@@ -166,32 +283,59 @@ class GifPlayer(QObject):
             frame_text = self.frames[self.current_frame]
             self.frame_changed.emit(frame_text, self.current_frame)
     
-    def _next_frame(self):
-        """Advance to next frame"""
-        if not self.is_playing:
+    def on_clock_tick(self, frame_time):
+        """Called by AnimationClock when the next frame is due"""
+        self._next_frame(frame_time)
+    
+    def _next_frame(self, frame_time=None, count_dropped=True):
+        """Show the frame that is due at frame_time, skipping any we are late for"""
+        if not self.is_playing or self.is_suspended or not self.frames:
             return
         
-        self.current_frame += 1
+        if frame_time is None:
+            frame_time = self.clock.now()
+        position = self._get_position(frame_time)
         
         # Check if reached end
-        if self.current_frame >= len(self.frames):
-            if self.is_looping:
-                self.current_frame = 0
+        if position >= self._total_duration:
+            if self.is_looping and self._total_duration > 0:
+                # Re-anchor inside the first loop to keep numbers small
+                position %= self._total_duration
+                self._position = position
+                self._anchor_time = frame_time
             else:
                 self.pause()
+                self.current_frame = 0
+                self._position = 0.0
                 self.playback_finished.emit()
                 return
         
+        target = bisect_right(self._frame_starts, position) - 1
+        target = min(max(target, 0), len(self.frames) - 1)
+        
+        if target == self.current_frame:
+            # Woken early, wait for the real presentation time
+            self._schedule_next_frame()
+            return
+        
+        skipped = (target - self.current_frame - 1) % len(self.frames)
+        if skipped and count_dropped:
+            self.dropped_frames += skipped
+            self.frames_dropped.emit(self.dropped_frames)
+        
+        self.current_frame = target
         self._show_current_frame()
         self._schedule_next_frame()
     
     def _schedule_next_frame(self):
-        """Schedule next frame based on delay and speed"""
-        if self.delays and self.current_frame < len(self.delays):
-            base_delay = self.delays[self.current_frame]
-            adjusted_delay = int(base_delay / self.playback_speed)
-            adjusted_delay = max(10, adjusted_delay)  # Minimum 10ms
-            self.timer.start(adjusted_delay)
+        """Schedule clock tick for the presentation time of the next frame"""
+        if not self.frames or self.current_frame >= len(self.frames) or self.is_suspended:
+            return
+        
+        now = self.clock.now()
+        next_start = self._frame_starts[self.current_frame + 1]
+        remaining_ms = (next_start - self._get_position(now)) / self.playback_speed
+        self.clock.schedule(self, now + max(1, remaining_ms) / 1000.0)
     
     def get_frame_count(self):
         """Get total number of frames"""
@@ -200,6 +344,10 @@ class GifPlayer(QObject):
     def get_current_frame_number(self):
         """Get current frame index"""
         return self.current_frame
+    
+    def get_dropped_frame_count(self):
+        """Get number of frames skipped since the animation was loaded"""
+        return self.dropped_frames
 
 
 class GifAnimationManager:
@@ -106,15 +106,69 @@ class GifExportDialog(QDialog):
         html_desc = QLabel("   Playable HTML file with JavaScript controls\n   Best for: Sharing online, interactive viewing")
         html_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
         
-        # Option 3: Folder
+        # Option 3: Compact HTML
+        self.compact_html_radio = QRadioButton("🗜 Compact HTML")
+        compact_html_desc = QLabel("   Playable HTML storing each distinct line and frame once\n   Best for: Long or large animations, small file size")
+        compact_html_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
+        
+        # Option 4: Colored HTML
+        self.colored_html_radio = QRadioButton("🎨 Colored HTML")
+        colored_html_desc = QLabel("   Playable HTML that keeps the ANSI colors\n   Best for: Sharing animations as they look in the app")
+        colored_html_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
+        
+        # Option 5: Folder
         self.folder_radio = QRadioButton("📁 Folder of Frames")
         folder_desc = QLabel("   Each frame as separate .txt file in a folder\n   Best for: Frame-by-frame editing, analysis")
         folder_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
         
+        # Option 6: ZIP archive
+        self.zip_radio = QRadioButton("📦 ZIP Archive")
+        zip_desc = QLabel("   Frame files and a JSON manifest in one .zip archive\n   Best for: Sharing frame sequences, slow or network drives")
+        zip_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
+        
+        # Option 7: Animated GIF
+        self.gif_radio = QRadioButton("🎞 Animated GIF")
+        gif_desc = QLabel("   The animation rendered as an image in the app's colors\n   Best for: Chats, forums, README files")
+        gif_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
+        
+        # Option 8: Animated PNG
+        self.apng_radio = QRadioButton("🖼 Animated PNG")
+        apng_desc = QLabel("   Full-color animated image with exact frame timing\n   Best for: Sharp, smooth rendering in browsers")
+        apng_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
+        
+        # Option 9: MP4 video
+        self.mp4_radio = QRadioButton("🎬 MP4 Video")
+        mp4_desc = QLabel("   H.264 video of the animation (needs imageio-ffmpeg)\n   Best for: Video editors, social media")
+        mp4_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
+        
+        # Option 10: Sprite sheet
+        self.sprite_sheet_radio = QRadioButton("🧩 Sprite Sheet")
+        sprite_sheet_desc = QLabel("   One PNG with each distinct frame plus a JSON frame map\n   Best for: Game engines, web animations")
+        sprite_sheet_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
+        
+        # Option 11: asciicast
+        self.cast_radio = QRadioButton("⌨ Terminal Recording")
+        cast_desc = QLabel("   asciinema .cast file replaying the animation in a terminal\n   Best for: Small, shareable terminal recordings")
+        cast_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
+        
+        # Option 12: Replay script
+        self.replay_radio = QRadioButton("▶ Terminal Replay Script")
+        replay_desc = QLabel("   Self-contained Python script that plays the colored animation\n   Best for: Terminals, slow SSH connections")
+        replay_desc.setStyleSheet(f"color: {CompactColors.TEXT_SECONDARY}; font-size: 9pt; margin-left: 30px;")
+        
         # Add to button group
         self.format_group.addButton(self.txt_radio, 1)
         self.format_group.addButton(self.html_radio, 2)
-        self.format_group.addButton(self.folder_radio, 3)
+        self.format_group.addButton(self.compact_html_radio, 3)
+        self.format_group.addButton(self.colored_html_radio, 4)
+        self.format_group.addButton(self.folder_radio, 5)
+        self.format_group.addButton(self.zip_radio, 6)
+        self.format_group.addButton(self.gif_radio, 7)
+        self.format_group.addButton(self.apng_radio, 8)
+        self.format_group.addButton(self.mp4_radio, 9)
+        self.format_group.addButton(self.sprite_sheet_radio, 10)
+        self.format_group.addButton(self.cast_radio, 11)
+        self.format_group.addButton(self.replay_radio, 12)
         
         # Add to layout
         options_layout.addWidget(self.txt_radio)
@@ -125,8 +179,44 @@ class GifExportDialog(QDialog):
         options_layout.addWidget(html_desc)
         options_layout.addSpacing(10)
         
+        options_layout.addWidget(self.compact_html_radio)
+        options_layout.addWidget(compact_html_desc)
+        options_layout.addSpacing(10)
+        
+        options_layout.addWidget(self.colored_html_radio)
+        options_layout.addWidget(colored_html_desc)
+        options_layout.addSpacing(10)
+        
         options_layout.addWidget(self.folder_radio)
         options_layout.addWidget(folder_desc)
+        options_layout.addSpacing(10)
+        
+        options_layout.addWidget(self.zip_radio)
+        options_layout.addWidget(zip_desc)
+        options_layout.addSpacing(10)
+        
+        options_layout.addWidget(self.gif_radio)
+        options_layout.addWidget(gif_desc)
+        options_layout.addSpacing(10)
+        
+        options_layout.addWidget(self.apng_radio)
+        options_layout.addWidget(apng_desc)
+        options_layout.addSpacing(10)
+        
+        options_layout.addWidget(self.mp4_radio)
+        options_layout.addWidget(mp4_desc)
+        options_layout.addSpacing(10)
+        
+        options_layout.addWidget(self.sprite_sheet_radio)
+        options_layout.addWidget(sprite_sheet_desc)
+        options_layout.addSpacing(10)
+        
+        options_layout.addWidget(self.cast_radio)
+        options_layout.addWidget(cast_desc)
+        options_layout.addSpacing(10)
+        
+        options_layout.addWidget(self.replay_radio)
+        options_layout.addWidget(replay_desc)
         
         options_frame.setLayout(options_layout)
         layout.addWidget(options_frame)
@@ -211,6 +301,30 @@ class GifExportDialog(QDialog):
                 self.output_path = file_path
                 self.accept()
         
+        elif self.compact_html_radio.isChecked():
+            self.selected_format = 'html_compact'
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save ASCII Animation",
+                "ascii_animation.html",
+                "HTML Files (*.html)"
+            )
+            if file_path:
+                self.output_path = file_path
+                self.accept()
+        
+        elif self.colored_html_radio.isChecked():
+            self.selected_format = 'html_colored'
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save ASCII Animation",
+                "ascii_animation.html",
+                "HTML Files (*.html)"
+            )
+            if file_path:
+                self.output_path = file_path
+                self.accept()
+        
         elif self.folder_radio.isChecked():
             self.selected_format = 'folder'
             folder_path = QFileDialog.getExistingDirectory(
@@ -232,6 +346,90 @@ class GifExportDialog(QDialog):
                 
                 self.output_path = output_folder
                 self.accept()
+        
+        elif self.zip_radio.isChecked():
+            self.selected_format = 'zip'
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save ASCII Animation",
+                "ascii_frames.zip",
+                "ZIP Archives (*.zip)"
+            )
+            if file_path:
+                self.output_path = file_path
+                self.accept()
+        
+        elif self.gif_radio.isChecked():
+            self.selected_format = 'gif'
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save ASCII Animation",
+                "ascii_animation.gif",
+                "GIF Images (*.gif)"
+            )
+            if file_path:
+                self.output_path = file_path
+                self.accept()
+        
+        elif self.apng_radio.isChecked():
+            self.selected_format = 'apng'
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save ASCII Animation",
+                "ascii_animation.png",
+                "PNG Images (*.png)"
+            )
+            if file_path:
+                self.output_path = file_path
+                self.accept()
+        
+        elif self.mp4_radio.isChecked():
+            self.selected_format = 'mp4'
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save ASCII Animation",
+                "ascii_animation.mp4",
+                "MP4 Videos (*.mp4)"
+            )
+            if file_path:
+                self.output_path = file_path
+                self.accept()
+        
+        elif self.sprite_sheet_radio.isChecked():
+            self.selected_format = 'sprite_sheet'
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save Sprite Sheet",
+                "ascii_sprites.png",
+                "PNG Images (*.png)"
+            )
+            if file_path:
+                self.output_path = file_path
+                self.accept()
+        
+        elif self.cast_radio.isChecked():
+            self.selected_format = 'cast'
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save Terminal Recording",
+                "ascii_animation.cast",
+                "asciicast Files (*.cast)"
+            )
+            if file_path:
+                self.output_path = file_path
+                self.accept()
+        
+        elif self.replay_radio.isChecked():
+            self.selected_format = 'replay'
+            file_path, _ = QFileDialog.getSaveFileName(
+                self,
+                "Save Replay Script",
+                "ascii_animation.py",
+                "Python Scripts (*.py)"
+            )
+            if file_path:
+                self.output_path = file_path
+                self.accept()
     
     def get_export_info(self):
         """Return selected format and output path"""
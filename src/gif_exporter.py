@@ -3,28 +3,149 @@ GIF ASCII Art Export Module
 Exports animated ASCII art in various formats
 """
 
+import html
+import json
 import os
+import shutil
+import tempfile
+import zipfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
 from pathlib import Path
-from typing import List, Tuple
-from rich.text import Text
+from typing import Callable, Dict, List, Optional, Tuple
+from ansi_parser import strip_ansi, tokenize, resolve_color
+from ansi_diff import FrameDiffer, CLEAR_SCREEN, HIDE_CURSOR, SHOW_CURSOR, RESET
+
+# Called with (frames_done, total_frames) after each frame
+ProgressCallback = Callable[[int, int], None]
+
+# Returns True when the export should be aborted
+CancelCheck = Callable[[], bool]
+
+# Buffer size for export file writes
+WRITE_BUFFER_SIZE = 1024 * 1024
+
+# Threads writing frame files in folder export
+FOLDER_WRITE_WORKERS = min(8, os.cpu_count() or 4)
+
+# Machine-readable description of frame sequence exports (folder and zip)
+MANIFEST_NAME = "manifest.json"
+
+# Lines before the frame text in each frame file
+FRAME_HEADER_LINES = 3
+
+# Terminal type recorded in asciicast headers (truecolor capable)
+ASCIICAST_TERM = "xterm-256color"
+
+# Palette for colored HTML export (standard 30-37, then bright 90-97),
+# picked to match the page theme
+HTML_ANSI_COLORS = [
+    "#45475a", "#f38ba8", "#a6e3a1", "#f9e2af", "#89b4fa", "#f5c2e7", "#94e2d5", "#bac2de",
+    "#585b70", "#f7a8bf", "#c0ecbc", "#fbeac6", "#a9c8fb", "#f8d5ee", "#b5ebe2", "#e0e4f2",
+]
+
+
+def _get_umask() -> int:
+    # os.umask can only be read by setting it
+    umask = os.umask(0)
+    os.umask(umask)
+    return umask
+
+
+# mkstemp/mkdtemp create private files (0600) and folders (0700); exports
+# get the modes a plain open()/mkdir() would have given them instead
+FILE_MODE = 0o666 & ~_get_umask()
+FOLDER_MODE = 0o777 & ~_get_umask()
+
+
+class ExportCancelled(Exception):
+    """Raised inside an export when its cancel check returns True"""
+
+
+@contextmanager
+def atomic_path(output_path: str):
+    """
+    Reserve a temporary path next to output_path for writing
+    
+    The temporary file keeps output_path's extension (for writers that
+    pick the format from it). It replaces output_path only if the block
+    completes; on error or cancellation it is deleted, so no partial
+    output is left behind.
+    """
+    directory = os.path.dirname(os.path.abspath(output_path))
+    name = os.path.basename(output_path)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix=f".{name}.", suffix=f".part{os.path.splitext(name)[1]}")
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, FILE_MODE)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.unlink(tmp_path)
+        except OSError:
+            pass
+        raise
+
+
+@contextmanager
+def atomic_write(output_path: str, binary: bool = False):
+    """Open a temporary file next to output_path for buffered writing (see atomic_path)"""
+    mode, encoding = ('wb', None) if binary else ('w', 'utf-8')
+    with atomic_path(output_path) as tmp_path:
+        with open(tmp_path, mode, encoding=encoding, buffering=WRITE_BUFFER_SIZE) as f:
+            yield f
+
+
+@contextmanager
+def atomic_folder(output_folder: str):
+    """
+    Create a temporary folder next to output_folder for writing
+    
+    Its files are moved into output_folder only if the block completes;
+    on error or cancellation the temporary folder is removed.
+    """
+    output_folder = os.path.abspath(output_folder)
+    parent = os.path.dirname(output_folder)
+    Path(parent).mkdir(parents=True, exist_ok=True)
+    tmp_dir = tempfile.mkdtemp(dir=parent, prefix=f".{os.path.basename(output_folder)}.", suffix='.part')
+    try:
+        yield tmp_dir
+        if not os.path.exists(output_folder):
+            os.chmod(tmp_dir, FOLDER_MODE)
+            os.replace(tmp_dir, output_folder)
+        else:
+            for name in os.listdir(tmp_dir):
+                os.replace(os.path.join(tmp_dir, name), os.path.join(output_folder, name))
+            os.rmdir(tmp_dir)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
 
 
 class GifExporter:
     """Handles exporting ASCII GIF animations to various formats"""
     
+    @staticmethod
+    def report_frame(index: int, total: int,
+                     progress: Optional[ProgressCallback] = None,
+                     cancel_check: Optional[CancelCheck] = None):
+        """Report a finished frame, raising ExportCancelled if the export was cancelled"""
+        if cancel_check is not None and cancel_check():
+            raise ExportCancelled()
+        if progress is not None:
+            progress(index + 1, total)
+    
     @staticmethod
     def clean_ansi(text: str) -> str:
         """Remove ANSI codes from text"""
-        try:
-            return Text.from_ansi(text).plain
-        except:
-            # Fallback: simple ANSI removal
-            import re
-            ansi_escape = re.compile(r'\x1b\[[0-9;]*m')
-            return ansi_escape.sub('', text)
+        return strip_ansi(text)
     
     @staticmethod
-    def export_to_single_txt(frames: List[str], delays: List[int], output_path: str) -> bool:
+    def export_to_single_txt(frames: List[str], delays: List[int], output_path: str,
+                             progress: Optional[ProgressCallback] = None,
+                             cancel_check: Optional[CancelCheck] = None) -> bool:
         """
         Export all frames to a single text file with separators
         
@@ -32,12 +153,14 @@ class GifExporter:
             frames: List of ASCII art frames
             delays: List of frame delays in milliseconds
             output_path: Output file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
         
         Returns:
-            True if successful, False otherwise
+            True if successful, False otherwise (including cancelled)
         """
         try:
-            with open(output_path, 'w', encoding='utf-8') as f:
+            with atomic_write(output_path) as f:
                 # Write header
                 f.write("=" * 80 + "\n")
                 f.write("ASCII ART ANIMATION\n")
@@ -54,6 +177,7 @@ class GifExporter:
                     clean_frame = GifExporter.clean_ansi(frame)
                     f.write(clean_frame)
                     f.write("\n\n")
+                    GifExporter.report_frame(i, len(frames), progress, cancel_check)
                 
                 # Write footer
                 f.write("=" * 80 + "\n")
@@ -61,12 +185,16 @@ class GifExporter:
                 f.write("=" * 80 + "\n")
             
             return True
+        except ExportCancelled:
+            return False
         except Exception as e:
             print(f"Error exporting to TXT: {e}")
             return False
     
     @staticmethod
-    def export_to_html(frames: List[str], delays: List[int], output_path: str) -> bool:
+    def export_to_html(frames: List[str], delays: List[int], output_path: str,
+                       progress: Optional[ProgressCallback] = None,
+                       cancel_check: Optional[CancelCheck] = None) -> bool:
         """
         Export as interactive HTML with JavaScript player
         
@@ -74,26 +202,543 @@ class GifExporter:
             frames: List of ASCII art frames
             delays: List of frame delays in milliseconds
             output_path: Output HTML file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            with atomic_write(output_path) as f:
+                f.write(_html_header(len(frames)))
+                f.write("        // Animation data\n        const frames = [\n")
+                
+                # Clean frames from ANSI and escape them for JavaScript
+                for i, frame in enumerate(frames):
+                    escaped = GifExporter.clean_ansi(frame).replace('\\', '\\\\').replace('`', '\\`').replace('$', '\\$')
+                    f.write(f"`{escaped}`,\n")
+                    GifExporter.report_frame(i, len(frames), progress, cancel_check)
+                
+                f.write("        ];\n        \n")
+                f.write(f"        const delays = [{','.join(str(d) for d in delays)}];\n")
+                f.write("        const frameCount = frames.length;\n")
+                f.write("        const getFrame = (index) => frames[index];\n")
+                f.write("        const frameProperty = 'textContent';\n        \n")
+                f.write(_HTML_PLAYER)
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to HTML: {e}")
+            return False
+    
+    @staticmethod
+    def export_to_compact_html(frames: List[str], delays: List[int], output_path: str,
+                               progress: Optional[ProgressCallback] = None,
+                               cancel_check: Optional[CancelCheck] = None) -> bool:
+        """
+        Export as interactive HTML that stores every distinct line and frame once
+        
+        Lines go into a shared table the first time they appear. A new frame
+        is stored as a list of line ids, or as the lines that changed since
+        the previous new frame when that is shorter; repeated frames are a
+        single index. The page decodes frames on demand during playback, and
+        the data is streamed to the file as one decoder call per frame.
+        
+        Args:
+            frames: List of ASCII art frames
+            delays: List of frame delays in milliseconds
+            output_path: Output HTML file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            with atomic_write(output_path) as f:
+                f.write(_html_header(len(frames)))
+                f.write(_COMPACT_DECODER)
+                f.write(_COMPACT_PLAIN_LINES)
+                
+                writer = _CompactFrameWriter(f)
+                for i, frame in enumerate(frames):
+                    writer.write_frame(GifExporter.clean_ansi(frame).split('\n'))
+                    GifExporter.report_frame(i, len(frames), progress, cancel_check)
+                
+                f.write(f"        const delays = [{','.join(str(d) for d in delays)}];\n")
+                f.write("        const frameCount = S.length;\n        \n")
+                f.write(_HTML_PLAYER)
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to compact HTML: {e}")
+            return False
+    
+    @staticmethod
+    def get_colored_lines(frame: str, colors: Dict[str, int]) -> List[tuple]:
+        """
+        Split an ANSI frame into lines of same-color runs
+        
+        Args:
+            frame: ANSI frame string
+            colors: Hex color -> CSS class index, extended with new colors
+        
+        Returns:
+            One (class, html_text, class, html_text, ...) tuple per line;
+            class -1 is the page's default text color
+        """
+        lines = []
+        runs = []
+        classes = {None: -1}
+        
+        # Escaping first is safe: &, < and > never occur in SGR sequences
+        for key, segment in tokenize(html.escape(frame, quote=False)):
+            css_class = classes.get(key)
+            if css_class is None:
+                color = resolve_color(key, HTML_ANSI_COLORS, '')
+                css_class = colors.get(color)
+                if css_class is None:
+                    css_class = colors[color] = len(colors)
+                classes[key] = css_class
+            
+            if '\n' in segment:
+                parts = segment.split('\n')
+                for part in parts[:-1]:
+                    if part:
+                        if runs and runs[-2] == css_class:
+                            runs[-1] += part
+                        else:
+                            runs += (css_class, part)
+                    lines.append(tuple(runs))
+                    runs = []
+                segment = parts[-1]
+                if not segment:
+                    continue
+            
+            if runs and runs[-2] == css_class:
+                runs[-1] += segment
+            else:
+                runs += (css_class, segment)
+        lines.append(tuple(runs))
+        return lines
+    
+    @staticmethod
+    def export_to_colored_html(frames: List[str], delays: List[int], output_path: str,
+                               progress: Optional[ProgressCallback] = None,
+                               cancel_check: Optional[CancelCheck] = None) -> bool:
+        """
+        Export as interactive HTML that keeps the ANSI colors
+        
+        Adjacent cells with the same color are merged into runs, and every
+        color gets one short CSS class. Lines and frames are deduplicated
+        the same way as export_to_compact_html.
+        
+        Args:
+            frames: List of ANSI frames
+            delays: List of frame delays in milliseconds
+            output_path: Output HTML file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            colors = {}
+            
+            with atomic_write(output_path) as f:
+                f.write(_html_header(len(frames)))
+                f.write(_COMPACT_DECODER)
+                f.write(_COMPACT_COLORED_LINES)
+                
+                # Held frames repeat back to back, so only the previous parse is kept;
+                # the writer already dedupes lines and frames across the whole export
+                previous_frame = lines = None
+                writer = _CompactFrameWriter(f)
+                for i, frame in enumerate(frames):
+                    color_count = len(colors)
+                    if frame != previous_frame:
+                        lines = GifExporter.get_colored_lines(frame, colors)
+                        previous_frame = frame
+                    new_colors = list(colors)[color_count:]
+                    writer.write_frame(lines, new_colors)
+                    GifExporter.report_frame(i, len(frames), progress, cancel_check)
+                
+                f.write(f"        const delays = [{','.join(str(d) for d in delays)}];\n")
+                f.write("        const frameCount = S.length;\n        \n")
+                f.write(_HTML_PLAYER)
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to colored HTML: {e}")
+            return False
+    
+    @staticmethod
+    def get_frame_file(index: int, total: int, delay: int, frame: str) -> Tuple[str, str, dict]:
+        """
+        Build one frame file of a frame sequence export
+        
+        Returns:
+            (file_name, file_text, manifest_entry)
+        """
+        clean_frame = GifExporter.clean_ansi(frame)
+        lines = clean_frame.split('\n')
+        file_name = f"frame_{index+1:04d}.txt"
+        file_text = (
+            f"Frame {index+1}/{total} | Delay: {delay}ms\n"
+            + "=" * 80 + "\n\n"
+            + clean_frame
+        )
+        entry = {
+            'file': file_name,
+            'delay': delay,
+            'columns': max(len(line) for line in lines),
+            'rows': len(lines),
+        }
+        return file_name, file_text, entry
+    
+    @staticmethod
+    def get_info_text(frames: List[str], delays: List[int]) -> str:
+        """Human-readable metadata file for frame sequence exports"""
+        return (
+            "ASCII ART ANIMATION METADATA\n"
+            + "=" * 80 + "\n\n"
+            + f"Total Frames: {len(frames)}\n"
+            + f"Frame Delays (ms): {', '.join(map(str, delays))}\n"
+            + f"\nFrames are numbered from frame_0001.txt to frame_{len(frames):04d}.txt\n"
+        )
+    
+    @staticmethod
+    def get_manifest(entries: List[dict]) -> str:
+        """
+        Machine-readable manifest for frame sequence exports
+        
+        Lists every frame file with its delay and dimensions, so an export
+        can be re-imported without parsing the text headers (frame text
+        starts after header_lines lines).
+        """
+        manifest = {
+            'format': 'ascii-frames',
+            'version': 1,
+            'frame_count': len(entries),
+            'columns': max((entry['columns'] for entry in entries), default=0),
+            'rows': max((entry['rows'] for entry in entries), default=0),
+            'total_duration': sum(entry['delay'] for entry in entries),
+            'header_lines': FRAME_HEADER_LINES,
+            'frames': entries,
+        }
+        return json.dumps(manifest, indent=2)
+    
+    @staticmethod
+    def export_to_folder(frames: List[str], delays: List[int], output_folder: str,
+                         progress: Optional[ProgressCallback] = None,
+                         cancel_check: Optional[CancelCheck] = None) -> bool:
+        """
+        Export each frame as individual text file in a folder
+        
+        Frame files are written by a small thread pool with a bounded
+        number of writes in flight, which keeps slow or network disks busy
+        without holding the whole export in memory.
+        
+        Args:
+            frames: List of ASCII art frames
+            delays: List of frame delays in milliseconds
+            output_folder: Output folder path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        def write_file(path, text):
+            with open(path, 'w', encoding='utf-8') as f:
+                f.write(text)
+        
+        try:
+            # Files are written to a temporary folder and moved in at the end
+            with atomic_folder(output_folder) as tmp_folder, \
+                    ThreadPoolExecutor(max_workers=FOLDER_WRITE_WORKERS) as pool:
+                entries = []
+                pending = deque()
+                written = 0
+                
+                for i, (frame, delay) in enumerate(zip(frames, delays)):
+                    file_name, file_text, entry = GifExporter.get_frame_file(i, len(frames), delay, frame)
+                    entries.append(entry)
+                    pending.append(pool.submit(write_file, os.path.join(tmp_folder, file_name), file_text))
+                    
+                    # Wait for the oldest write once enough are queued
+                    while len(pending) > 2 * FOLDER_WRITE_WORKERS or (pending and pending[0].done()):
+                        pending.popleft().result()
+                        GifExporter.report_frame(written, len(frames), progress, cancel_check)
+                        written += 1
+                
+                while pending:
+                    pending.popleft().result()
+                    GifExporter.report_frame(written, len(frames), progress, cancel_check)
+                    written += 1
+                
+                write_file(os.path.join(tmp_folder, "_animation_info.txt"), GifExporter.get_info_text(frames, delays))
+                write_file(os.path.join(tmp_folder, MANIFEST_NAME), GifExporter.get_manifest(entries))
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to folder: {e}")
+            return False
+    
+    @staticmethod
+    def export_to_zip(frames: List[str], delays: List[int], output_path: str,
+                      progress: Optional[ProgressCallback] = None,
+                      cancel_check: Optional[CancelCheck] = None) -> bool:
+        """
+        Export frames as text files inside a single zip archive
+        
+        Same layout as export_to_folder. Each frame is compressed and
+        streamed into the archive as soon as it is built.
+        
+        Args:
+            frames: List of ASCII art frames
+            delays: List of frame delays in milliseconds
+            output_path: Output .zip file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            with atomic_write(output_path, binary=True) as f, \
+                    zipfile.ZipFile(f, 'w', compression=zipfile.ZIP_DEFLATED) as archive:
+                entries = []
+                for i, (frame, delay) in enumerate(zip(frames, delays)):
+                    file_name, file_text, entry = GifExporter.get_frame_file(i, len(frames), delay, frame)
+                    entries.append(entry)
+                    archive.writestr(file_name, file_text)
+                    GifExporter.report_frame(i, len(frames), progress, cancel_check)
+                
+                archive.writestr("_animation_info.txt", GifExporter.get_info_text(frames, delays))
+                archive.writestr(MANIFEST_NAME, GifExporter.get_manifest(entries))
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to ZIP: {e}")
+            return False
+    
+    @staticmethod
+    def get_terminal_size(frames: List[str]) -> Tuple[int, int]:
+        """Get the (columns, rows) needed to show every frame"""
+        columns = rows = 0
+        for frame in set(frames):
+            lines = strip_ansi(frame).split('\n')
+            columns = max(columns, max(len(line) for line in lines))
+            rows = max(rows, len(lines))
+        return columns, rows
+    
+    @staticmethod
+    def export_to_asciicast(frames: List[str], delays: List[int], output_path: str,
+                            progress: Optional[ProgressCallback] = None,
+                            cancel_check: Optional[CancelCheck] = None) -> bool:
+        """
+        Export as an asciinema recording (asciicast v2 .cast file)
+        
+        The first event draws the whole first frame; every later event
+        only moves the cursor to and rewrites the cells that changed.
+        Events are written one line at a time as they are built.
+        
+        Args:
+            frames: List of ANSI frames
+            delays: List of frame delays in milliseconds
+            output_path: Output .cast file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
         
         Returns:
-            True if successful, False otherwise
+            True if successful, False otherwise (including cancelled)
         """
         try:
-            # Clean frames from ANSI
-            clean_frames = [GifExporter.clean_ansi(frame) for frame in frames]
+            count = min(len(frames), len(delays))
+            columns, rows = GifExporter.get_terminal_size(frames[:count])
+            header = {
+                'version': 2,
+                'width': max(1, columns),
+                'height': max(1, rows),
+                'env': {'TERM': ASCIICAST_TERM},
+            }
             
-            # Escape frames for JavaScript
-            js_frames = []
-            for frame in clean_frames:
-                # Escape special characters
-                escaped = frame.replace('\\', '\\\\').replace('`', '\\`').replace('$', '\\$')
-                js_frames.append(escaped)
+            differ = FrameDiffer()
+            elapsed = 0
+            with atomic_write(output_path) as f:
+                f.write(json.dumps(header) + '\n')
+                for i in range(count):
+                    output = differ.diff(frames[i])
+                    if i == 0:
+                        output = CLEAR_SCREEN + HIDE_CURSOR + output
+                    if output:
+                        f.write(json.dumps([round(elapsed / 1000, 6), 'o', output]) + '\n')
+                    elapsed += delays[i]
+                    GifExporter.report_frame(i, count, progress, cancel_check)
+                
+                # Closing event keeps the last frame on screen for its delay
+                f.write(json.dumps([round(elapsed / 1000, 6), 'o', RESET + SHOW_CURSOR]) + '\n')
             
-            # Generate JavaScript array
-            frames_js = ',\n'.join([f'`{frame}`' for frame in js_frames])
-            delays_js = ','.join([str(d) for d in delays])
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to asciicast: {e}")
+            return False
+    
+    @staticmethod
+    def export_to_ansi(frames: List[str], delays: List[int], output_path: str,
+                       progress: Optional[ProgressCallback] = None,
+                       cancel_check: Optional[CancelCheck] = None) -> bool:
+        """
+        Export as an ANSI animation (.ans) for viewing with cat or an ANSI viewer
+        
+        The first frame is drawn in full and every later frame as
+        cursor-addressed changes, like classic BBS ANSI animations. The
+        format has no timing: playback speed depends on the terminal.
+        
+        Args:
+            frames: List of ANSI frames
+            delays: List of frame delays in milliseconds (unused)
+            output_path: Output .ans file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            differ = FrameDiffer()
+            rows = 0
+            with atomic_write(output_path) as f:
+                f.write(CLEAR_SCREEN)
+                for i, frame in enumerate(frames):
+                    f.write(differ.diff(frame))
+                    rows = max(rows, len(differ.rows))
+                    GifExporter.report_frame(i, len(frames), progress, cancel_check)
+                
+                # Leave the cursor below the art
+                f.write(f"{RESET}\x1b[{rows + 1};1H")
             
-            html_content = f"""<!DOCTYPE html>
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to ANSI: {e}")
+            return False
+    
+    @staticmethod
+    def export_to_replay_script(frames: List[str], delays: List[int], output_path: str,
+                                progress: Optional[ProgressCallback] = None,
+                                cancel_check: Optional[CancelCheck] = None) -> bool:
+        """
+        Export as a self-contained Python script that plays the animation in a terminal
+        
+        The script stores the first frame once and then only the
+        cursor-addressed changes between frames (including the step from
+        the last frame back to the first), so playback writes a fraction
+        of a full redraw per frame. It needs nothing but Python 3.
+        
+        Args:
+            frames: List of ANSI frames
+            delays: List of frame delays in milliseconds
+            output_path: Output .py file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            count = min(len(frames), len(delays))
+            columns, rows = GifExporter.get_terminal_size(frames[:count])
+            
+            differ = FrameDiffer()
+            with atomic_write(output_path) as f:
+                f.write(_replay_script_header(columns, rows))
+                f.write(f"FIRST = {CLEAR_SCREEN + HIDE_CURSOR + differ.diff(frames[0])!r}\n\n")
+                
+                # Step i shows frame i + 1 after frame i's delay; the last
+                # step loops back to the first frame
+                f.write("STEPS = [\n")
+                for i in range(count):
+                    next_frame = frames[i + 1] if i + 1 < count else frames[0]
+                    f.write(f"    ({delays[i]}, {differ.diff(next_frame)!r}),\n")
+                    GifExporter.report_frame(i, count, progress, cancel_check)
+                f.write("]\n")
+                f.write(_REPLAY_PLAYER)
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting replay script: {e}")
+            return False
+
+
+class _CompactFrameWriter:
+    """
+    Streams frames to a compact HTML export as decoder calls
+    
+    Lines are added to a shared table the first time they appear; each
+    frame becomes f(new_lines, record[, new_colors]) where record is the
+    index of an earlier identical frame, [0, id, ...] or, when shorter,
+    [1, line_count, pos, id, ...] relative to the previous distinct frame.
+    """
+    
+    def __init__(self, f):
+        self.f = f
+        self.line_ids = {}
+        self.frame_ids = {}
+        self.base_ids = ()
+    
+    def write_frame(self, lines: List, new_colors: Optional[List[str]] = None):
+        """Write one frame given as a list of hashable line values"""
+        new_lines = []
+        ids = []
+        for line in lines:
+            line_id = self.line_ids.get(line)
+            if line_id is None:
+                line_id = self.line_ids[line] = len(self.line_ids)
+                new_lines.append(line)
+            ids.append(line_id)
+        ids = tuple(ids)
+        
+        record = self.frame_ids.get(ids)
+        if record is None:
+            self.frame_ids[ids] = len(self.frame_ids)
+            
+            delta = [1, len(ids)]
+            for pos, line_id in enumerate(ids):
+                if pos >= len(self.base_ids) or self.base_ids[pos] != line_id:
+                    delta += (pos, line_id)
+            record = delta if len(delta) <= len(ids) else [0, *ids]
+            self.base_ids = ids
+        
+        colors = f",{_to_js(new_colors)}" if new_colors else ""
+        self.f.write(f"f({_to_js(new_lines)},{_to_js(record)}{colors});\n")
+
+
+def _to_js(value) -> str:
+    """Serialize value as a JavaScript literal that is safe inside a script tag"""
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).replace('</', '<\\/')
+
+
+def _html_header(frame_count: int) -> str:
+    """HTML page head, styles and player controls, up to the opening script tag"""
+    return f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -260,19 +905,16 @@ class GifExporter:
                 LOOP
             </label>
             
-            <div class="frame-info" id="frameInfo">Frame: 0/{len(frames)}</div>
+            <div class="frame-info" id="frameInfo">Frame: 0/{frame_count}</div>
         </div>
     </div>
     
     <script>
-        // Animation data
-        const frames = [
-            {frames_js}
-        ];
-        
-        const delays = [{delays_js}];
-        
-        // Player state
+"""
+
+
+# Player script and page footer; expects frameCount, getFrame(index) and delays
+_HTML_PLAYER = """        // Player state
         let currentFrame = 0;
         let isPlaying = false;
         let playbackSpeed = 1.0;
@@ -289,94 +931,94 @@ class GifExporter:
         const frameInfo = document.getElementById('frameInfo');
         
         // Display frame
-        function showFrame(index) {{
-            if (index >= 0 && index < frames.length) {{
-                display.textContent = frames[index];
-                frameInfo.textContent = `Frame: ${{index + 1}}/${{frames.length}}`;
-            }}
-        }}
+        function showFrame(index) {
+            if (index >= 0 && index < frameCount) {
+                display[frameProperty] = getFrame(index);
+                frameInfo.textContent = `Frame: ${index + 1}/${frameCount}`;
+            }
+        }
         
         // Play animation
-        function play() {{
-            if (!isPlaying) {{
+        function play() {
+            if (!isPlaying) {
                 isPlaying = true;
                 playBtn.textContent = '⏸ PAUSE';
                 playBtn.classList.add('active');
                 scheduleNextFrame();
-            }}
-        }}
+            }
+        }
         
         // Pause animation
-        function pause() {{
+        function pause() {
             isPlaying = false;
             playBtn.textContent = '▶ PLAY';
             playBtn.classList.remove('active');
-            if (animationTimeout) {{
+            if (animationTimeout) {
                 clearTimeout(animationTimeout);
-            }}
-        }}
+            }
+        }
         
         // Stop animation
-        function stop() {{
+        function stop() {
             pause();
             currentFrame = 0;
             showFrame(currentFrame);
-        }}
+        }
         
         // Schedule next frame
-        function scheduleNextFrame() {{
+        function scheduleNextFrame() {
             if (!isPlaying) return;
             
             const delay = delays[currentFrame] || 100;
             const adjustedDelay = delay / playbackSpeed;
             
-            animationTimeout = setTimeout(() => {{
+            animationTimeout = setTimeout(() => {
                 currentFrame++;
                 
-                if (currentFrame >= frames.length) {{
-                    if (isLooping) {{
+                if (currentFrame >= frameCount) {
+                    if (isLooping) {
                         currentFrame = 0;
-                    }} else {{
+                    } else {
                         pause();
                         return;
-                    }}
-                }}
+                    }
+                }
                 
                 showFrame(currentFrame);
                 scheduleNextFrame();
-            }}, adjustedDelay);
-        }}
+            }, adjustedDelay);
+        }
         
         // Event listeners
-        playBtn.addEventListener('click', () => {{
-            if (isPlaying) {{
+        playBtn.addEventListener('click', () => {
+            if (isPlaying) {
                 pause();
-            }} else {{
+            } else {
                 play();
-            }}
-        }});
+            }
+        });
         
         stopBtn.addEventListener('click', stop);
         
-        speedSlider.addEventListener('input', (e) => {{
+        speedSlider.addEventListener('input', (e) => {
             playbackSpeed = e.target.value / 100;
             speedValue.textContent = playbackSpeed.toFixed(1) + 'x';
-        }});
+        });
         
-        loopCheck.addEventListener('change', (e) => {{
+        loopCheck.addEventListener('change', (e) => {
             isLooping = e.target.checked;
-        }});
+        });
         
         // Keyboard shortcuts
-        document.addEventListener('keydown', (e) => {{
-            if (e.code === 'Space') {{
+        document.addEventListener('keydown', (e) => {
+            if (e.code === 'Space') {
                 e.preventDefault();
                 if (isPlaying) pause();
                 else play();
-            }} else if (e.code === 'KeyS') {{
+            } else if (e.code === 'KeyS') {
                 stop();
-            }}
-        }});
+            }
+        });
         
         // Initialize
         showFrame(0);
@@ -384,52 +1026,139 @@ class GifExporter:
     </script>
 </body>
 </html>"""
+
+
+# Frame decoder for compact HTML exports (see _CompactFrameWriter). Needs
+# renderLine(id) and frameProperty from one of the line snippets below.
+_COMPACT_DECODER = """        // Animation data
+        const L = [];
+        const U = [];
+        const S = [];
+        const decoded = [];
+        let baseIds = [];
+        
+        function f(lines, record, colors) {
+            for (const line of lines) L.push(line);
+            if (colors) defineColors(colors);
             
-            with open(output_path, 'w', encoding='utf-8') as f:
-                f.write(html_content)
+            if (typeof record === 'number') {
+                S.push(record);
+                return;
+            }
             
-            return True
-        except Exception as e:
-            print(f"Error exporting to HTML: {e}")
-            return False
-    
-    @staticmethod
-    def export_to_folder(frames: List[str], delays: List[int], output_folder: str) -> bool:
-        """
-        Export each frame as individual text file in a folder
+            let ids;
+            if (record[0] === 0) {
+                ids = record.slice(1);
+            } else {
+                ids = baseIds.slice(0, record[1]);
+                for (let i = 2; i < record.length; i += 2) {
+                    ids[record[i]] = record[i + 1];
+                }
+            }
+            baseIds = ids;
+            S.push(U.length);
+            U.push(ids);
+        }
         
-        Args:
-            frames: List of ASCII art frames
-            delays: List of frame delays in milliseconds
-            output_folder: Output folder path
+        function getFrame(index) {
+            const u = S[index];
+            if (decoded[u] === undefined) {
+                decoded[u] = U[u].map(renderLine).join('\\n');
+            }
+            return decoded[u];
+        }
         
-        Returns:
-            True if successful, False otherwise
-        """
-        try:
-            # Create folder if it doesn't exist
-            Path(output_folder).mkdir(parents=True, exist_ok=True)
-            
-            # Export each frame
-            for i, (frame, delay) in enumerate(zip(frames, delays)):
-                frame_path = os.path.join(output_folder, f"frame_{i+1:04d}.txt")
-                clean_frame = GifExporter.clean_ansi(frame)
-                
-                with open(frame_path, 'w', encoding='utf-8') as f:
-                    f.write(f"Frame {i+1}/{len(frames)} | Delay: {delay}ms\n")
-                    f.write("=" * 80 + "\n\n")
-                    f.write(clean_frame)
-            
-            # Create metadata file
-            metadata_path = os.path.join(output_folder, "_animation_info.txt")
-            with open(metadata_path, 'w', encoding='utf-8') as f:
-                f.write("ASCII ART ANIMATION METADATA\n")
-                f.write("=" * 80 + "\n\n")
-                f.write(f"Total Frames: {len(frames)}\n")
-                f.write(f"Frame Delays (ms): {', '.join(map(str, delays))}\n")
-                f.write(f"\nFrames are numbered from frame_0001.txt to frame_{len(frames):04d}.txt\n")
-            
-            return True
-        except Exception as e:
-            print(f"Error exporting to folder: {e}")
-            return False
\ No newline at end of file
+"""
+
+# Plain-text lines for the compact decoder
+_COMPACT_PLAIN_LINES = """        const frameProperty = 'textContent';
+        const renderLine = (id) => L[id];
+        
+"""
+
+# Colored lines for the compact decoder: [class, html, class, html, ...],
+# class -1 keeps the default text color. f() passes new colors in order.
+_COMPACT_COLORED_LINES = """        const frameProperty = 'innerHTML';
+        const paletteSheet = document.head.appendChild(document.createElement('style')).sheet;
+        const lineHtml = [];
+        let colorCount = 0;
+        
+        function defineColors(colors) {
+            for (const color of colors) {
+                paletteSheet.insertRule(`.c${colorCount++} { color: ${color}; }`, paletteSheet.cssRules.length);
+            }
+        }
+        
+        function renderLine(id) {
+            if (lineHtml[id] === undefined) {
+                const runs = L[id];
+                let html = '';
+                for (let i = 0; i < runs.length; i += 2) {
+                    html += runs[i] < 0 ? runs[i + 1] : `<span class="c${runs[i]}">${runs[i + 1]}</span>`;
+                }
+                lineHtml[id] = html;
+            }
+            return lineHtml[id];
+        }
+        
+"""
+
+
+def _replay_script_header(columns: int, rows: int) -> str:
+    """Replay script shebang, docstring and terminal size constants"""
+    return f'''#!/usr/bin/env python3
+"""
+ASCII animation replay (exported from ASCII Art Generator)
+
+Run in a terminal of at least {columns}x{rows} characters:
+    python3 <this file>
+
+Press Ctrl+C to stop.
+"""
+
+import os
+import sys
+import time
+
+WIDTH = {columns}
+HEIGHT = {rows}
+
+'''
+
+
+_REPLAY_PLAYER = '''
+
+def main():
+    if os.name == 'nt':
+        os.system('')  # enable escape sequence processing in the Windows console
+    
+    try:
+        size = os.get_terminal_size()
+        if size.columns < WIDTH or size.lines < HEIGHT:
+            print(f"Terminal is {size.columns}x{size.lines}, animation needs {WIDTH}x{HEIGHT}")
+            time.sleep(2)
+    except OSError:
+        pass
+    
+    out = sys.stdout.buffer
+    steps = [(delay / 1000, diff.encode('utf-8')) for delay, diff in STEPS]
+    try:
+        out.write(FIRST.encode('utf-8'))
+        out.flush()
+        deadline = time.monotonic()
+        while True:
+            for delay, diff in steps:
+                deadline += delay
+                time.sleep(max(0, deadline - time.monotonic()))
+                out.write(diff)
+                out.flush()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        out.write(f"\\x1b[0m\\x1b[{HEIGHT + 1};1H\\x1b[?25h".encode('ascii'))
+        out.flush()
+
+
+if __name__ == '__main__':
+    main()
+'''
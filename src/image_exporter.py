@@ -0,0 +1,112 @@
+"""
+Image Export Module
+Renders static ASCII art to high-resolution PNG images
+"""
+
+import struct
+import zlib
+from typing import Optional
+
+import numpy as np
+
+from ascii_renderer import GlyphAtlas, DEFAULT_FONT_PATH, DIRECT_BYTES_PER_PIXEL
+from gif_exporter import GifExporter, ExportCancelled, ProgressCallback, CancelCheck, atomic_write
+
+PNG_SIGNATURE = b'\x89PNG\r\n\x1a\n'
+
+# PNG compression level
+PNG_COMPRESSION = 6
+
+# Font size in pixels at scale 1.0 (matches the main window output)
+BASE_FONT_SIZE = 14
+
+# Working memory for rendering one band of the image
+PNG_MEMORY_BUDGET = 64 * 1024 * 1024
+
+
+def write_png_chunk(f, chunk_type: bytes, data: bytes):
+    """Write one PNG chunk (length, type, data, CRC)"""
+    f.write(struct.pack('>I', len(data)))
+    f.write(chunk_type)
+    f.write(data)
+    f.write(struct.pack('>I', zlib.crc32(data, zlib.crc32(chunk_type))))
+
+
+def get_scanlines(pixels: np.ndarray) -> np.ndarray:
+    """Prefix each row of an RGB array with PNG filter type 0 (none)"""
+    height = pixels.shape[0]
+    scanlines = np.zeros((height, 1 + pixels.shape[1] * 3), dtype=np.uint8)
+    scanlines[:, 1:] = pixels.reshape(height, -1)
+    return scanlines
+
+
+def write_png_header(f, width: int, height: int):
+    """Write the PNG signature and IHDR for an 8-bit RGB image"""
+    f.write(PNG_SIGNATURE)
+    write_png_chunk(f, b'IHDR', struct.pack('>IIBBBBB', width, height, 8, 2, 0, 0, 0))
+
+
+class ImageExporter:
+    """Renders static ASCII art to image files"""
+    
+    @staticmethod
+    def get_band_rows(atlas: GlyphAtlas, columns: int, memory_budget: int) -> int:
+        """Number of text rows rendered at once to stay within memory_budget"""
+        row_bytes = columns * atlas.cell_width * atlas.cell_height * DIRECT_BYTES_PER_PIXEL
+        return max(1, memory_budget // max(1, row_bytes))
+    
+    @staticmethod
+    def export_to_png(text: str, output_path: str, scale: float = 2.0,
+                      progress: Optional[ProgressCallback] = None,
+                      cancel_check: Optional[CancelCheck] = None,
+                      memory_budget: int = PNG_MEMORY_BUDGET) -> bool:
+        """
+        Export colored ASCII art as a PNG image
+        
+        The image is rendered in full-width bands of text rows and each
+        band is compressed and written before the next is drawn, so only
+        one band is ever in memory regardless of the image size.
+        
+        Args:
+            text: ANSI ASCII art
+            output_path: Output .png file path
+            scale: Font size multiplier (1.0 = 14px JetBrains Mono)
+            progress: Optional callback, called with (rows_done, total_rows)
+            cancel_check: Optional callable that returns True to cancel
+            memory_budget: Approximate working memory limit in bytes
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            atlas = GlyphAtlas(DEFAULT_FONT_PATH, max(4, round(BASE_FONT_SIZE * scale)))
+            glyphs, colors = atlas.get_grid(text)
+            rows, columns = glyphs.shape
+            width = columns * atlas.cell_width
+            height = rows * atlas.cell_height
+            if width == 0 or height == 0:
+                raise ValueError("nothing to render")
+            
+            band_rows = ImageExporter.get_band_rows(atlas, columns, memory_budget)
+            compressor = zlib.compressobj(PNG_COMPRESSION)
+            
+            with atomic_write(output_path, binary=True) as f:
+                write_png_header(f, width, height)
+                
+                for start in range(0, rows, band_rows):
+                    end = min(rows, start + band_rows)
+                    scanlines = get_scanlines(atlas.blit_direct(glyphs[start:end], colors[start:end]))
+                    data = compressor.compress(scanlines)
+                    if data:
+                        write_png_chunk(f, b'IDAT', data)
+                    GifExporter.report_frame(end - 1, rows, progress, cancel_check)
+                
+                write_png_chunk(f, b'IDAT', compressor.flush())
+                write_png_chunk(f, b'IEND', b'')
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to PNG: {e}")
+            return False
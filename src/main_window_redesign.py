@@ -1,5 +1,6 @@
 import sys
 import os
+import multiprocessing
 from pathlib import Path
 
 # Fix paths
@@ -9,36 +10,28 @@ sys.path.insert(0, str(current_dir))
 sys.path.insert(0, str(root_dir))
 
 from PyQt6.QtWidgets import (QApplication, QWidget, QVBoxLayout, QHBoxLayout, QGridLayout,
-                             QTextEdit, QPushButton, QFileDialog, QCheckBox, 
+                             QPushButton, QFileDialog, QCheckBox, 
                              QSlider, QLabel, QFrame, QProgressBar, QDialog, QComboBox)
-from PyQt6.QtGui import QFont, QColor, QTextCursor, QPalette, QDragEnterEvent, QDropEvent, QShortcut, QKeySequence
+from PyQt6.QtGui import QFont, QColor, QPalette, QDragEnterEvent, QDropEvent, QShortcut, QKeySequence
+from PyQt6 import sip
 from PyQt6.QtCore import Qt, QObject, pyqtSignal, QThread, QUrl
-from rich.text import Text 
 
-from converter import convert_image_to_ascii, convert_image_to_ascii_custom
-from background import remove_background_from_image
+from conversion import convert_image, convert_gif
 from gif_animator import GifConverter, GifPlayer
 from ascii_widget import FloatingAsciiWidget
-from gif_exporter import GifExporter
+from window_visibility import WindowVisibilityWatcher
+from ascii_canvas import AsciiCanvas
+from ansi_parser import strip_ansi
+from gif_exporter import GifExporter, atomic_write
+from video_exporter import VideoExporter
+from image_exporter import ImageExporter
 from gif_export_dialog import GifExportDialog
 from character_sets import CharacterSet, CharacterSetManager
-from image_adjustments import ImageAdjustments
 from history_manager import HistoryManager
 from history_panel import HistoryPanel
 from settings_manager import SettingsManager, AspectRatioMode
-from cyberpunk_redesign import CYBERPUNK_THEME, get_cyberpunk_font, get_cyberpunk_mono_font, CyberpunkColors
+from cyberpunk_redesign import CYBERPUNK_THEME, get_cyberpunk_font, CyberpunkColors
 
-class CompactTextEdit(QTextEdit):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setFont(get_cyberpunk_mono_font())
-        self.setReadOnly(True)
-        self.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
-        
-    def append_ansi_text(self, text):
-        self.clear()
-        
-        
 class Worker(QObject):
     finished = pyqtSignal(str)
 
@@ -55,38 +48,16 @@ class Worker(QObject):
 
     def run(self):
         try:
-            from PIL import Image
-            
-            img = Image.open(self.file_path)
-            
-            if self.remove_bg:
-                processed_image = remove_background_from_image(self.file_path)
-                if processed_image:
-                    img = processed_image
-            
-            if self.aspect_ratio != 'original':
-                ratio = AspectRatioMode.get_ratio(self.aspect_ratio)
-                if ratio > 0:
-                    current_ratio = img.width / img.height
-                    if abs(current_ratio - ratio) > 0.1:
-                        if ratio > current_ratio:
-                            new_width = int(img.height * ratio)
-                            img = img.resize((new_width, img.height), Image.Resampling.LANCZOS)
-                        else:
-                            new_height = int(img.width / ratio)
-                            img = img.resize((img.width, new_height), Image.Resampling.LANCZOS)
-            
-            img = ImageAdjustments.apply_all_adjustments(
-                img,
+            ascii_result = convert_image(
+                self.file_path,
+                self.columns,
+                remove_bg=self.remove_bg,
+                char_set=self.char_set,
                 brightness=self.brightness,
                 contrast=self.contrast,
-                invert=self.invert
+                invert=self.invert,
+                aspect_ratio=self.aspect_ratio
             )
-            
-            if self.char_set:
-                ascii_result = convert_image_to_ascii_custom(img, columns=self.columns, char_set=self.char_set)
-            else:
-                ascii_result = convert_image_to_ascii(img, columns=self.columns)
 
             if ascii_result:
                 self.finished.emit(ascii_result)
@@ -113,70 +84,17 @@ class GifWorker(QObject):
         self.converter = GifConverter()
 
     def run(self):
-        from PIL import Image
-        
         try:
-            frames = []
-            delays = []
-            
-            with Image.open(self.gif_path) as gif:
-                total_frames = 0
-                try:
-                    while True:
-                        gif.seek(total_frames)
-                        total_frames += 1
-                except EOFError:
-                    pass
-                
-                gif.seek(0)
-                
-                for frame_index in range(total_frames):
-                    gif.seek(frame_index)
-                    delay = gif.info.get('duration', 100)
-                    frame_img = gif.convert('RGB')
-                    
-                    if self.aspect_ratio != 'original':
-                        ratio = AspectRatioMode.get_ratio(self.aspect_ratio)
-                        if ratio > 0:
-                            current_ratio = frame_img.width / frame_img.height
-                            if abs(current_ratio - ratio) > 0.1:
-                                if ratio > current_ratio:
-                                    new_width = int(frame_img.height * ratio)
-                                    frame_img = frame_img.resize((new_width, frame_img.height), Image.Resampling.LANCZOS)
-                                else:
-                                    new_height = int(frame_img.width / ratio)
-                                    frame_img = frame_img.resize((frame_img.width, new_height), Image.Resampling.LANCZOS)
-                    
-                    frame_img = ImageAdjustments.apply_all_adjustments(
-                        frame_img,
-                        brightness=self.brightness,
-                        contrast=self.contrast,
-                        invert=self.invert
-                    )
-                    
-                    if self.char_set:
-                        ascii_frame = convert_image_to_ascii_custom(frame_img, self.columns, self.char_set)
-                    else:
-                        import tempfile
-                        tmp = tempfile.NamedTemporaryFile(suffix='.png', delete=False)
-                        tmp_path = tmp.name
-                        tmp.close()
-                        
-                        try:
-                            frame_img.save(tmp_path, 'PNG')
-                            ascii_frame = convert_image_to_ascii(tmp_path, columns=self.columns)
-                        finally:
-                            if os.path.exists(tmp_path):
-                                try:
-                                    os.unlink(tmp_path)
-                                except:
-                                    pass
-                    
-                    if ascii_frame:
-                        frames.append(ascii_frame)
-                        delays.append(delay)
-                    
-                    self.progress.emit(frame_index + 1, total_frames)
+            frames, delays = convert_gif(
+                self.gif_path,
+                self.columns,
+                char_set=self.char_set,
+                brightness=self.brightness,
+                contrast=self.contrast,
+                invert=self.invert,
+                aspect_ratio=self.aspect_ratio,
+                progress=self.progress.emit
+            )
             
             if frames:
                 self.finished.emit(frames, delays)
@@ -187,49 +105,65 @@ class GifWorker(QObject):
             self.error.emit(f"GIF conversion error: {str(e)}")
 
 
-class CompactTextEdit(QTextEdit):
-    def __init__(self, parent=None):
-        super().__init__(parent)
-        self.setFont(get_cyberpunk_mono_font())
-        self.setReadOnly(True)
-        self.setLineWrapMode(QTextEdit.LineWrapMode.NoWrap)
-        
-    def append_ansi_text(self, text):
-        self.clear()
-        self.moveCursor(QTextCursor.MoveOperation.End)
-        parts = text.split('\x1b[')
+class ExportWorker(QObject):
+    progress = pyqtSignal(int, int)
+    finished = pyqtSignal(bool, str)  # success, output_path
+
+    EXPORTERS = {
+        'txt': GifExporter.export_to_single_txt,
+        'html': GifExporter.export_to_html,
+        'html_compact': GifExporter.export_to_compact_html,
+        'html_colored': GifExporter.export_to_colored_html,
+        'folder': GifExporter.export_to_folder,
+        'zip': GifExporter.export_to_zip,
+        'cast': GifExporter.export_to_asciicast,
+        'replay': GifExporter.export_to_replay_script,
+        'gif': VideoExporter.export_to_gif,
+        'apng': VideoExporter.export_to_apng,
+        'mp4': VideoExporter.export_to_mp4,
+        'sprite_sheet': VideoExporter.export_to_sprite_sheet,
+    }
+
+    # Exporters for a single static image, called with the text instead of frames
+    STATIC_EXPORTERS = {
+        'png': ImageExporter.export_to_png,
+    }
+
+    def __init__(self, format_type, frames, delays, output_path, **options):
+        super().__init__()
+        self.format_type = format_type
+        self.frames = frames
+        self.delays = delays
+        self.output_path = output_path
+        self.options = options
+        self.is_cancelled = False
+
+    def cancel(self):
+        # Called from the UI thread; checked by the exporter after each frame
+        self.is_cancelled = True
+
+    def run(self):
+        if self.format_type in self.STATIC_EXPORTERS:
+            success = self.STATIC_EXPORTERS[self.format_type](
+                self.frames[0],
+                self.output_path,
+                progress=self.progress.emit,
+                cancel_check=lambda: self.is_cancelled,
+                **self.options
+            )
+            self.finished.emit(success, self.output_path)
+            return
         
-        for part in parts:
-            if 'm' in part:
-                try:
-                    code_part, text_part = part.split('m', 1)
-                    if not code_part:
-                        continue
-                    
-                    color_code = int(code_part.split(';')[0])
-                    color = QColor(CyberpunkColors.TEXT_PRIMARY)
-                    
-                    if 30 <= color_code <= 37:
-                        colors = [
-                            CyberpunkColors.TEXT_DIM,
-                            "#d89aa3",
-                            CyberpunkColors.CYAN,
-                            "#e0c097",
-                            CyberpunkColors.PURPLE,
-                            "#c5a3d8",
-                            CyberpunkColors.GREEN,
-                            CyberpunkColors.TEXT_PRIMARY
-                        ]
-                        color = QColor(colors[color_code - 30])
-                    
-                    self.setTextColor(color)
-                    self.insertPlainText(text_part)
-                except (ValueError, IndexError):
-                    self.setTextColor(QColor(CyberpunkColors.TEXT_PRIMARY))
-                    self.insertPlainText(part)
-            else:
-                self.setTextColor(QColor(CyberpunkColors.TEXT_PRIMARY))
-                self.insertPlainText(part)
+        export = self.EXPORTERS.get(self.format_type)
+        success = export is not None and export(
+            self.frames,
+            self.delays,
+            self.output_path,
+            progress=self.progress.emit,
+            cancel_check=lambda: self.is_cancelled,
+            **self.options
+        )
+        self.finished.emit(success, self.output_path)
 
 
 class MainWindow(QWidget):
@@ -264,9 +198,20 @@ class MainWindow(QWidget):
         self.gif_player = GifPlayer()
         self.gif_player.frame_changed.connect(self.display_frame)
         
+        # Stop rendering frames while the window is minimized or covered
+        self.visibility = WindowVisibilityWatcher(self)
+        self.visibility.visibility_changed.connect(
+            lambda on_screen: self.gif_player.set_suspended(not on_screen)
+        )
+        
         # Floating widgets
         self.floating_widgets = []
         
+        # Running background export
+        self.export_thread = None
+        self.export_worker = None
+        self.export_unit = 'frames'
+        
         # History manager
         self.history_manager = HistoryManager()
         self.history_panel = None
@@ -797,7 +742,7 @@ class MainWindow(QWidget):
         self.output_placeholder.setLayout(placeholder_layout)
         
         # Text display
-        self.text_area = CompactTextEdit()
+        self.text_area = AsciiCanvas()
         self.text_area.setMinimumHeight(150)
         self.text_area.hide()  # Hidden initially
         
@@ -1105,6 +1050,8 @@ class MainWindow(QWidget):
     def on_gif_converted(self, frames, delays):
         self.progress_bar.hide()
         self.gif_player.load_animation(frames, delays)
+        self.text_area.frame_cache.clear()
+        self.text_area.preload_frames(frames)
         self.load_button.setDisabled(False)
         self.export_button.setDisabled(False)
         self.widget_button.setDisabled(False)
@@ -1150,7 +1097,11 @@ class MainWindow(QWidget):
         self.text_area.show()
         self.text_area.append_ansi_text(frame_text)
         total = self.gif_player.get_frame_count()
-        self.frame_label.setText(f"Frame: {frame_number + 1}/{total}")
+        dropped = self.gif_player.get_dropped_frame_count()
+        if dropped:
+            self.frame_label.setText(f"Frame: {frame_number + 1}/{total} ({dropped} dropped)")
+        else:
+            self.frame_label.setText(f"Frame: {frame_number + 1}/{total}")
 
     def toggle_playback(self):
         if self.gif_player.is_playing:
@@ -1192,6 +1143,12 @@ class MainWindow(QWidget):
                 )
 
     def on_export(self):
+        # The SAVE button doubles as CANCEL while an export is running
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+            self.export_button.setDisabled(True)
+            return
+        
         if self.is_gif_mode:
             if not self.gif_player.frames:
                 return
@@ -1207,32 +1164,7 @@ class MainWindow(QWidget):
                         return
                     
                     self.text_area.insertPlainText(f"\n\n// EXPORTING as {format_type.upper()}...")
-                    QApplication.processEvents()
-                    
-                    success = False
-                    if format_type == 'txt':
-                        success = GifExporter.export_to_single_txt(
-                            self.gif_player.frames,
-                            self.gif_player.delays,
-                            output_path
-                        )
-                    elif format_type == 'html':
-                        success = GifExporter.export_to_html(
-                            self.gif_player.frames,
-                            self.gif_player.delays,
-                            output_path
-                        )
-                    elif format_type == 'folder':
-                        success = GifExporter.export_to_folder(
-                            self.gif_player.frames,
-                            self.gif_player.delays,
-                            output_path
-                        )
-                    
-                    if success:
-                        self.text_area.insertPlainText(f"\n// ✓ SAVED: {output_path}")
-                    else:
-                        self.text_area.insertPlainText(f"\n// ✗ ERROR: Export failed")
+                    self.start_export(format_type, output_path)
             
             except Exception as e:
                 import traceback
@@ -1243,23 +1175,98 @@ class MainWindow(QWidget):
             if not self.last_ascii_result:
                 return
                 
-            file_path, _ = QFileDialog.getSaveFileName(
+            file_path, selected_filter = QFileDialog.getSaveFileName(
                 self, 
                 "SAVE ASCII", 
                 "ascii.txt", 
-                "Text (*.txt)"
+                "Text (*.txt);;ANSI Art (*.ans);;PNG Image (*.png)"
             )
             
-            if file_path:
+            if file_path and (file_path.lower().endswith('.png') or selected_filter.startswith('PNG')):
+                if not file_path.lower().endswith('.png'):
+                    file_path += '.png'
+                
+                # Rendered in the background; large scales take a few seconds
+                self.text_area.insertPlainText("\n\n// EXPORTING as PNG...")
+                self.start_export(
+                    'png', file_path,
+                    frames=[self.last_ascii_result], delays=[],
+                    unit='rows', scale=self.settings_manager.get('png_export_scale', 2.0)
+                )
+            
+            elif file_path and (file_path.lower().endswith('.ans') or selected_filter.startswith('ANSI')):
+                if not file_path.lower().endswith('.ans'):
+                    file_path += '.ans'
+                
+                try:
+                    # Keep the colors; reset at the end so the terminal isn't left colored
+                    # (written as bytes so line endings stay \n on every platform)
+                    with atomic_write(file_path, binary=True) as f:
+                        f.write((self.last_ascii_result + '\x1b[0m\n').encode('utf-8'))
+                    
+                    self.text_area.insertPlainText(f"\n\n// SAVED: {file_path}")
+                except Exception as e:
+                    self.text_area.insertPlainText(f"\n\n// ERROR: {e}")
+            
+            elif file_path:
                 try:
-                    clean_text = Text.from_ansi(self.last_ascii_result).plain
-                    with open(file_path, 'w', encoding='utf-8') as f:
+                    clean_text = strip_ansi(self.last_ascii_result)
+                    with atomic_write(file_path) as f:
                         f.write(clean_text)
                     
                     self.text_area.insertPlainText(f"\n\n// SAVED: {file_path}")
                 except Exception as e:
                     self.text_area.insertPlainText(f"\n\n// ERROR: {e}")
     
+    def start_export(self, format_type, output_path, frames=None, delays=None, unit='frames', **options):
+        self.progress_bar.show()
+        self.progress_bar.setValue(0)
+        self.export_button.setText("✗ CANCEL")
+        self.export_unit = unit
+        
+        # The previous export's thread may still be shutting down
+        if self.export_thread is not None and not sip.isdeleted(self.export_thread):
+            self.export_thread.wait()
+        
+        self.export_thread = QThread()
+        self.export_worker = ExportWorker(
+            format_type,
+            self.gif_player.frames if frames is None else frames,
+            self.gif_player.delays if delays is None else delays,
+            output_path,
+            **options
+        )
+        self.export_worker.moveToThread(self.export_thread)
+        
+        self.export_thread.started.connect(self.export_worker.run)
+        self.export_worker.progress.connect(self.update_export_progress)
+        self.export_worker.finished.connect(self.on_export_finished)
+        self.export_worker.finished.connect(self.export_thread.quit)
+        self.export_worker.finished.connect(self.export_worker.deleteLater)
+        self.export_thread.finished.connect(self.export_thread.deleteLater)
+        
+        self.export_thread.start()
+
+    def update_export_progress(self, current, total):
+        progress = int((current / total) * 100)
+        self.progress_bar.setValue(progress)
+        self.progress_bar.setFormat(f"Exporting: {current}/{total} {self.export_unit}")
+
+    def on_export_finished(self, success, output_path):
+        cancelled = self.export_worker.is_cancelled
+        self.export_worker = None
+        
+        self.progress_bar.hide()
+        self.export_button.setText("💾 SAVE")
+        self.export_button.setDisabled(False)
+        
+        if success:
+            self.text_area.insertPlainText(f"\n// ✓ SAVED: {output_path}")
+        elif cancelled:
+            self.text_area.insertPlainText("\n// ✗ EXPORT CANCELLED")
+        else:
+            self.text_area.insertPlainText("\n// ✗ ERROR: Export failed")
+    
     def open_widget(self):
         font_size = self.settings_manager.get('widget_font_size', 9)
         color_theme = self.settings_manager.get('widget_color_theme', 'grape')
@@ -1267,10 +1274,9 @@ class MainWindow(QWidget):
         widget = FloatingAsciiWidget(font_size=font_size, color_theme=color_theme)
         
         if self.is_gif_mode and self.gif_player.frames:
-            widget.set_animation(
-                self.gif_player.frames,
-                self.gif_player.delays
-            )
+            # Subscribe to the player's asset so frames and rendered
+            # pixmaps are shared instead of copied per widget
+            widget.set_animation_asset(self.gif_player.asset_id)
         elif self.last_ascii_result:
             widget.set_ascii_text(self.last_ascii_result)
         
@@ -1358,6 +1364,10 @@ class MainWindow(QWidget):
         self.settings_manager.set('window_y', self.y())
 
     def closeEvent(self, event):
+        if self.export_worker is not None:
+            self.export_worker.cancel()
+            self.export_thread.quit()
+            self.export_thread.wait()
         self.save_settings()
         event.accept()
 
@@ -1380,4 +1390,6 @@ def main():
 
 
 if __name__ == '__main__':
+    # Video exports render frames in worker processes
+    multiprocessing.freeze_support()
     main()
\ No newline at end of file
@@ -0,0 +1,137 @@
+"""
+Staged Pipeline
+Runs items through a chain of thread-backed stages connected by bounded queues
+"""
+
+import queue
+import threading
+import time
+from typing import Callable, Iterable, Iterator, List, Optional
+
+# End of input; passed on by the last worker of every stage
+_DONE = object()
+
+
+class Stage:
+    """
+    One step of a pipeline, run by one or more worker threads
+    
+    Keeps time totals over all of its workers: busy (processing),
+    starved (waiting for input) and blocked (waiting for room in the
+    next queue). A stage that is busy most of the time while the others
+    starve or block is the bottleneck.
+    """
+    
+    def __init__(self, name: str, process: Callable, workers: int = 1):
+        """
+        Args:
+            name: Name shown in utilization reports
+            process: Called with each item; its return value is passed on
+            workers: Number of threads running process
+        """
+        self.name = name
+        self.process = process
+        self.workers = max(1, workers)
+        self.items = 0
+        self.busy = 0.0
+        self.starved = 0.0
+        self.blocked = 0.0
+        self._lock = threading.Lock()
+        self._running = 0
+    
+    def get_utilization(self, seconds: float) -> float:
+        """Fraction of worker time spent processing over a run of seconds"""
+        return self.busy / max(seconds * self.workers, 1e-9)
+    
+    def _run(self, inbox: queue.Queue, outbox: queue.Queue):
+        items = 0
+        busy = starved = blocked = 0.0
+        try:
+            while True:
+                waited = time.perf_counter()
+                item = inbox.get()
+                started = time.perf_counter()
+                starved += started - waited
+                if item is _DONE:
+                    # Let the other workers of this stage see it too
+                    inbox.put(_DONE)
+                    break
+                
+                result = self.process(item)
+                finished = time.perf_counter()
+                busy += finished - started
+                items += 1
+                outbox.put(result)
+                blocked += time.perf_counter() - finished
+        finally:
+            # The pipeline still ends if process raised (the item is lost)
+            with self._lock:
+                self.items += items
+                self.busy += busy
+                self.starved += starved
+                self.blocked += blocked
+                self._running -= 1
+                last = self._running == 0
+            if last:
+                outbox.put(_DONE)
+
+
+class Pipeline:
+    """
+    Chains stages with bounded queues
+    
+    Every stage runs at the same time on its own threads, so slow I/O in
+    one stage overlaps with work in the others. Each queue holds at most
+    queue_size items, so no more than the queued items plus one per
+    worker are in memory at once, however many items are fed in. Stage
+    functions should handle their own errors; an exception stops the
+    worker that raised it and drops its item.
+    """
+    
+    def __init__(self, stages: List[Stage], queue_size: int = 2):
+        self.stages = stages
+        self.queue_size = max(1, queue_size)
+        self.seconds = 0.0
+    
+    def run(self, items: Iterable) -> Iterator:
+        """
+        Feed items through every stage
+        
+        Yields:
+            Output of the last stage, in completion order
+        """
+        queues = [queue.Queue(self.queue_size) for _ in range(len(self.stages) + 1)]
+        threads = []
+        for index, stage in enumerate(self.stages):
+            stage.items = 0
+            stage.busy = stage.starved = stage.blocked = 0.0
+            stage._running = stage.workers
+            for worker in range(stage.workers):
+                thread = threading.Thread(target=stage._run, args=(queues[index], queues[index + 1]),
+                                          name=f"{stage.name}-{worker}", daemon=True)
+                threads.append(thread)
+        
+        def feed():
+            for item in items:
+                queues[0].put(item)
+            queues[0].put(_DONE)
+        
+        started = time.perf_counter()
+        threads.append(threading.Thread(target=feed, name="feed", daemon=True))
+        for thread in threads:
+            thread.start()
+        
+        try:
+            while True:
+                item = queues[-1].get()
+                if item is _DONE:
+                    break
+                yield item
+        finally:
+            self.seconds = time.perf_counter() - started
+    
+    def get_bottleneck(self) -> Optional[Stage]:
+        """The stage with the highest utilization in the last run"""
+        if not self.stages:
+            return None
+        return max(self.stages, key=lambda stage: stage.get_utilization(self.seconds))
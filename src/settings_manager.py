@@ -26,6 +26,9 @@ class SettingsManager:
         'widget_color_theme': 'grape',  # grape, matrix, amber, cyan, custom
         'widget_opacity': 95,
         
+        # Export settings
+        'png_export_scale': 2.0,  # font size multiplier for PNG export (1.0 = 14px)
+        
         # Window geometry
         'window_width': 800,
         'window_height': 550,
@@ -0,0 +1,208 @@
+"""
+Terminal Player
+Plays images and GIFs as colored ASCII art in a terminal, without Qt or a display server
+
+Usage:
+    python src/terminal_player.py animation.gif [--width 100] [--fps 30] [--once]
+"""
+
+import argparse
+import contextlib
+import sys
+import time
+from bisect import bisect_right
+from itertools import accumulate
+from typing import List, Optional
+
+from rich.console import Console
+from rich.progress import BarColumn, MofNCompleteColumn, Progress, TextColumn
+
+from ansi_diff import (FrameDiffer, CLEAR_SCREEN, RESET, BEGIN_SYNCHRONIZED_UPDATE,
+                       END_SYNCHRONIZED_UPDATE)
+from character_sets import CharacterSet
+from conversion import convert_image, get_char_set, get_frame_count, iter_gif_frames
+from settings_manager import SettingsManager, AspectRatioMode
+
+
+class TerminalPlayer:
+    """
+    Plays ASCII animation frames in a terminal
+    
+    Frames follow their delays on a monotonic clock. Each redraw writes
+    only the cells that changed, wrapped in a synchronized update so the
+    terminal never shows half a frame. Redraws are capped at max_fps;
+    frames whose time has passed by the next redraw are skipped and
+    counted as dropped instead of slowing the animation down.
+    """
+    
+    # Same floor as GifPlayer; GIFs with 0 delays would spin otherwise
+    MIN_DELAY_MS = 10
+    
+    def __init__(self, frames: List[str], delays: List[int], console: Optional[Console] = None,
+                 max_fps: float = 30.0, speed: float = 1.0, loop: bool = True):
+        self.frames = frames
+        self.ends = list(accumulate(max(self.MIN_DELAY_MS, delay) for delay in delays[:len(frames)]))
+        self.console = console or Console()
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.speed = speed
+        self.loop = loop
+        
+        self.differ = FrameDiffer()
+        self.size = None
+        self.frames_drawn = 0
+        self.frames_dropped = 0
+        self.bytes_written = 0
+    
+    def _write(self, text: str):
+        data = text.encode('utf-8')
+        stream = self.console.file
+        if hasattr(stream, 'buffer'):
+            stream.buffer.write(data)
+        else:
+            stream.write(text)
+        stream.flush()
+        self.bytes_written += len(data)
+    
+    def _draw(self, frame: str):
+        """Redraw the changed part of the screen"""
+        output = ''
+        
+        # Start over after the terminal is resized (no cropping when piped)
+        size = tuple(self.console.size) if self.console.is_terminal else (None, None)
+        if size != self.size:
+            self.size = size
+            self.differ.set_size(*size)
+            output = CLEAR_SCREEN
+        
+        output += self.differ.diff(frame)
+        if output:
+            self._write(BEGIN_SYNCHRONIZED_UPDATE + output + END_SYNCHRONIZED_UPDATE)
+        self.frames_drawn += 1
+    
+    def play(self):
+        """Play until the animation ends (or forever when looping); Ctrl+C stops"""
+        if not self.frames:
+            return
+        
+        total = self.ends[-1]
+        count = len(self.frames)
+        shown = None
+        last_draw = float('-inf')
+        start = time.monotonic()
+        
+        while True:
+            now = time.monotonic()
+            position = (now - start) * 1000 * self.speed
+            if not self.loop and position >= total:
+                break
+            position %= total
+            
+            index = bisect_right(self.ends, position)
+            if index != shown:
+                if shown is not None:
+                    self.frames_dropped += (index - shown - 1) % count
+                self._draw(self.frames[index])
+                shown = index
+                last_draw = now
+            
+            # Wake when this frame ends, but no sooner than the fps cap allows
+            frame_end = now + (self.ends[index] - position) / 1000 / self.speed
+            wake = max(frame_end, last_draw + self.min_interval)
+            time.sleep(max(0.0, wake - time.monotonic()))
+
+
+def positive_float(value: str) -> float:
+    """argparse type for options that must be above zero"""
+    try:
+        number = float(value)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"invalid number: {value!r}")
+    if not number > 0:
+        raise argparse.ArgumentTypeError(f"must be greater than 0: {value}")
+    return number
+
+
+def build_parser(settings: SettingsManager) -> argparse.ArgumentParser:
+    """Command-line options; defaults come from the app settings"""
+    parser = argparse.ArgumentParser(description="Play an image or GIF as colored ASCII art in the terminal")
+    parser.add_argument('input', help="image or animated GIF")
+    parser.add_argument('--width', type=int, default=None,
+                        help="width in characters (default: app setting, limited to the terminal width)")
+    parser.add_argument('--charset', default=settings.get('character_set', 'detailed'),
+                        choices=[preset.value for preset in CharacterSet if preset != CharacterSet.CUSTOM])
+    parser.add_argument('--brightness', type=int, default=settings.get('brightness', 0))
+    parser.add_argument('--contrast', type=int, default=settings.get('contrast', 100))
+    parser.add_argument('--invert', action='store_true', default=settings.get('invert', False))
+    parser.add_argument('--aspect', default=settings.get('aspect_ratio', 'original'),
+                        choices=AspectRatioMode.get_all_modes())
+    parser.add_argument('--fps', type=float, default=30.0, help="maximum redraws per second (default: 30)")
+    parser.add_argument('--speed', type=positive_float, default=1.0, help="playback speed multiplier")
+    parser.add_argument('--once', action='store_true', help="play once instead of looping")
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    settings = SettingsManager()
+    args = build_parser(settings).parse_args(argv)
+    console = Console()
+    
+    columns = args.width or min(settings.get('width', 120), console.size.width)
+    char_set = get_char_set(args.charset)
+    
+    try:
+        frame_count = get_frame_count(args.input)
+    except Exception as e:
+        console.print(f"[red]Cannot open {args.input}: {e}[/red]")
+        return 1
+    
+    if frame_count <= 1:
+        art = convert_image(args.input, columns, char_set=char_set, brightness=args.brightness,
+                            contrast=args.contrast, invert=args.invert, aspect_ratio=args.aspect)
+        if not art:
+            console.print(f"[red]Could not convert {args.input}[/red]")
+            return 1
+        console.file.write(art + RESET + '\n')
+        return 0
+    
+    frames = []
+    delays = []
+    with Progress(TextColumn("Converting"), BarColumn(), MofNCompleteColumn(),
+                  console=console, transient=True) as progress:
+        task = progress.add_task("convert", total=frame_count)
+        for frame, delay in iter_gif_frames(
+            args.input, columns, char_set, args.brightness, args.contrast, args.invert, args.aspect,
+            progress=lambda done, total: progress.update(task, completed=done, total=total)
+        ):
+            frames.append(frame)
+            delays.append(delay)
+    
+    if not frames:
+        console.print(f"[red]Could not convert {args.input}[/red]")
+        return 1
+    
+    player = TerminalPlayer(frames, delays, console, max_fps=args.fps, speed=args.speed, loop=not args.once)
+    started = time.monotonic()
+    with contextlib.suppress(KeyboardInterrupt):
+        if console.is_terminal:
+            console.set_alt_screen(True)
+            console.show_cursor(False)
+        try:
+            player.play()
+        finally:
+            if console.is_terminal:
+                console.show_cursor(True)
+                console.set_alt_screen(False)
+            else:
+                console.file.write(RESET + '\n')
+    
+    elapsed = time.monotonic() - started
+    console.print(
+        f"{len(frames)} frames, drew {player.frames_drawn} in {elapsed:.1f}s, "
+        f"dropped {player.frames_dropped}, "
+        f"{player.bytes_written / max(1, player.frames_drawn) / 1024:.1f} KB per redraw"
+    )
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,496 @@
+"""
+Video Export Module
+Renders ASCII animations to GIF, APNG and MP4
+"""
+
+import json
+import math
+import multiprocessing
+import os
+import struct
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Iterable, List, Optional, Tuple
+
+import numpy as np
+from PIL import Image, GifImagePlugin
+
+from ascii_renderer import GlyphAtlas, DEFAULT_FONT_PATH, get_text_size
+from gif_exporter import (GifExporter, ExportCancelled, ProgressCallback, CancelCheck,
+                          atomic_path, atomic_write)
+from image_exporter import (PNG_COMPRESSION, PNG_MEMORY_BUDGET, get_scanlines, write_png_chunk,
+                            write_png_header)
+
+# Worker processes rendering frames
+RENDER_PROCESSES = min(8, os.cpu_count() or 2)
+
+# Rendered frames waiting to be written, per worker (bounds memory)
+FRAMES_IN_FLIGHT_PER_PROCESS = 2
+
+# Sprite sheet band memory per pixel: RGB band plus its PNG scanline copy
+SPRITE_BAND_BYTES_PER_PIXEL = 6
+
+# Highest frame rate used for MP4 (frames are repeated to match delays)
+MP4_MAX_FPS = 50
+
+
+# --- Worker process side ---------------------------------------------------
+
+_atlas: Optional[GlyphAtlas] = None
+_grid_size = (0, 0)
+
+
+def _init_worker(font_path: str, font_size: int, columns: int, rows: int):
+    """Build the glyph atlas once per worker process"""
+    global _atlas, _grid_size
+    _atlas = GlyphAtlas(font_path, font_size)
+    _grid_size = (columns, rows)
+
+
+def _render_gif_frame(text: str, delay: int) -> bytes:
+    """Render and LZW-encode one GIF frame against the shared global palette"""
+    image = Image.fromarray(_atlas.render_indexed(text, *_grid_size), 'P')
+    image.putpalette(_atlas.get_indexed_palette())
+    return b''.join(GifImagePlugin.getdata(image, duration=delay))
+
+
+def _render_png_frame(text: str) -> bytes:
+    """Render one frame as zlib-compressed PNG scanlines (filter type 0)"""
+    return zlib.compress(get_scanlines(_atlas.render(text, *_grid_size)), PNG_COMPRESSION)
+
+
+def _render_sprite(text: str) -> bytes:
+    """Render one frame as raw RGB"""
+    return _atlas.render(text, *_grid_size).tobytes()
+
+
+def _render_rgb_frame(text: str) -> bytes:
+    """Render one frame as raw RGB, padded to even dimensions for video codecs"""
+    pixels = _atlas.render(text, *_grid_size)
+    height, width = pixels.shape[:2]
+    if height % 2 or width % 2:
+        pixels = np.pad(pixels, ((0, height % 2), (0, width % 2), (0, 0)), mode='edge')
+    return pixels.tobytes()
+
+
+# --- Main process side -----------------------------------------------------
+
+class _ApngWriter:
+    """Streams an animated PNG chunk by chunk"""
+    
+    def __init__(self, f, width: int, height: int, frame_count: int):
+        self.f = f
+        self.width = width
+        self.height = height
+        self.sequence = 0
+        self.frames_written = 0
+        
+        write_png_header(f, width, height)
+        # Frame count, loop forever
+        self._write_chunk(b'acTL', struct.pack('>II', frame_count, 0))
+    
+    def _write_chunk(self, chunk_type: bytes, data: bytes):
+        write_png_chunk(self.f, chunk_type, data)
+    
+    def write_frame(self, compressed: bytes, delay: int):
+        """Write one frame of compressed scanlines shown for delay milliseconds"""
+        self._write_chunk(b'fcTL', struct.pack(
+            '>IIIIIHHBB', self.sequence, self.width, self.height, 0, 0,
+            min(delay, 65535), 1000, 0, 0
+        ))
+        self.sequence += 1
+        
+        # The first frame doubles as the default image
+        if self.frames_written == 0:
+            self._write_chunk(b'IDAT', compressed)
+        else:
+            self._write_chunk(b'fdAT', struct.pack('>I', self.sequence) + compressed)
+            self.sequence += 1
+        self.frames_written += 1
+    
+    def close(self):
+        self._write_chunk(b'IEND', b'')
+
+
+class _SpriteSheetWriter:
+    """Streams a PNG sprite sheet one row of sprites at a time"""
+    
+    def __init__(self, f, sprite_width: int, sprite_height: int, columns: int, rows: int,
+                 background: Tuple[int, int, int]):
+        self.f = f
+        self.sprite_width = sprite_width
+        self.sprite_height = sprite_height
+        self.columns = columns
+        self.background = background
+        self.sprites_written = 0
+        self.compressor = zlib.compressobj(PNG_COMPRESSION)
+        
+        self.band = np.empty((sprite_height, columns * sprite_width, 3), dtype=np.uint8)
+        self.band[:] = background
+        
+        write_png_header(f, columns * sprite_width, rows * sprite_height)
+    
+    def add_sprite(self, data: bytes):
+        """Place the next sprite (raw RGB) and flush the row once it is full"""
+        column = self.sprites_written % self.columns
+        x = column * self.sprite_width
+        self.band[:, x:x + self.sprite_width] = np.frombuffer(data, dtype=np.uint8).reshape(
+            self.sprite_height, self.sprite_width, 3
+        )
+        self.sprites_written += 1
+        if column == self.columns - 1:
+            self._flush_band()
+    
+    def _flush_band(self):
+        data = self.compressor.compress(get_scanlines(self.band))
+        if data:
+            write_png_chunk(self.f, b'IDAT', data)
+        self.band[:] = self.background
+    
+    def close(self):
+        # Last row may be partly empty
+        if self.sprites_written % self.columns:
+            self._flush_band()
+        write_png_chunk(self.f, b'IDAT', self.compressor.flush())
+        write_png_chunk(self.f, b'IEND', b'')
+
+
+class VideoExporter:
+    """Renders ASCII animations to image and video formats"""
+    
+    DEFAULT_FONT_SIZE = 14
+    
+    @staticmethod
+    def merge_repeated_frames(frames: List[str], delays: List[int]) -> List[Tuple[str, int]]:
+        """Merge runs of identical consecutive frames into one frame with the summed delay"""
+        merged = []
+        for frame, delay in zip(frames, delays):
+            if merged and merged[-1][0] == frame:
+                merged[-1] = (frame, merged[-1][1] + delay)
+            else:
+                merged.append((frame, delay))
+        return merged
+    
+    @staticmethod
+    def get_grid_size(frames: Iterable[str]) -> Tuple[int, int]:
+        """Largest (columns, rows) over all distinct frames"""
+        columns = rows = 0
+        for frame in set(frames):
+            frame_columns, frame_rows = get_text_size(frame)
+            columns = max(columns, frame_columns)
+            rows = max(rows, frame_rows)
+        return columns, rows
+    
+    @staticmethod
+    def get_sheet_layout(sprite_count: int, sprite_width: int, sprite_height: int,
+                         memory_budget: int = PNG_MEMORY_BUDGET) -> Tuple[int, int]:
+        """
+        (columns, rows) of sprites that make the sheet roughly square
+        
+        A row of sprites is held in memory while it is written, so sheets
+        whose square layout would exceed memory_budget get fewer columns
+        (and more rows) instead.
+        """
+        sprite_bytes = sprite_width * sprite_height * SPRITE_BAND_BYTES_PER_PIXEL
+        max_columns = max(1, memory_budget // max(1, sprite_bytes))
+        columns = round(math.sqrt(sprite_count * sprite_height / sprite_width))
+        columns = max(1, min(sprite_count, columns, max_columns))
+        return columns, math.ceil(sprite_count / columns)
+    
+    @staticmethod
+    def render_frames(render: Callable, tasks: List[tuple], grid_size: Tuple[int, int],
+                      consume: Callable, font_size: int,
+                      progress: Optional[ProgressCallback] = None,
+                      cancel_check: Optional[CancelCheck] = None):
+        """
+        Render frames in a process pool and hand results to consume() in order
+        
+        Only a few frames per worker are in flight at once, so memory stays
+        bounded no matter how long the animation is.
+        
+        Args:
+            render: Worker function called with each task's arguments
+            tasks: One argument tuple per frame
+            grid_size: (columns, rows) every frame is padded to
+            consume: Called with each rendered result, in frame order
+            font_size: Font size in pixels
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+        """
+        # Spawn instead of fork: the exporter runs on a Qt worker thread
+        context = multiprocessing.get_context('spawn')
+        processes = max(1, min(RENDER_PROCESSES, len(tasks)))
+        limit = processes * FRAMES_IN_FLIGHT_PER_PROCESS
+        
+        pool = ProcessPoolExecutor(
+            max_workers=processes,
+            mp_context=context,
+            initializer=_init_worker,
+            initargs=(DEFAULT_FONT_PATH, font_size, *grid_size)
+        )
+        try:
+            pending = deque()
+            written = 0
+            for args in tasks:
+                pending.append(pool.submit(render, *args))
+                while len(pending) >= limit:
+                    consume(pending.popleft().result())
+                    GifExporter.report_frame(written, len(tasks), progress, cancel_check)
+                    written += 1
+            
+            while pending:
+                consume(pending.popleft().result())
+                GifExporter.report_frame(written, len(tasks), progress, cancel_check)
+                written += 1
+        finally:
+            pool.shutdown(wait=True, cancel_futures=True)
+    
+    @staticmethod
+    def export_to_gif(frames: List[str], delays: List[int], output_path: str,
+                      progress: Optional[ProgressCallback] = None,
+                      cancel_check: Optional[CancelCheck] = None,
+                      font_size: int = DEFAULT_FONT_SIZE) -> bool:
+        """
+        Export as an animated GIF
+        
+        All frames share one global palette built from the text colors, so
+        worker processes can encode frames independently and the file is
+        streamed to disk frame by frame.
+        
+        Args:
+            frames: List of ANSI frames
+            delays: List of frame delays in milliseconds
+            output_path: Output .gif file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+            font_size: Font size in pixels
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            merged = VideoExporter.merge_repeated_frames(frames, delays)
+            columns, rows = VideoExporter.get_grid_size(frame for frame, _ in merged)
+            atlas = GlyphAtlas(DEFAULT_FONT_PATH, font_size)
+            
+            canvas = Image.new('P', (columns * atlas.cell_width, rows * atlas.cell_height))
+            canvas.putpalette(atlas.get_indexed_palette())
+            header, _ = GifImagePlugin.getheader(canvas, info={'loop': 0})
+            
+            with atomic_write(output_path, binary=True) as f:
+                for block in header:
+                    f.write(block)
+                VideoExporter.render_frames(
+                    _render_gif_frame, merged, (columns, rows), f.write,
+                    font_size, progress, cancel_check
+                )
+                f.write(b';')  # GIF trailer
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to GIF: {e}")
+            return False
+    
+    @staticmethod
+    def export_to_apng(frames: List[str], delays: List[int], output_path: str,
+                       progress: Optional[ProgressCallback] = None,
+                       cancel_check: Optional[CancelCheck] = None,
+                       font_size: int = DEFAULT_FONT_SIZE) -> bool:
+        """
+        Export as an animated PNG (full color, exact frame delays)
+        
+        Worker processes render and compress frames; the main process only
+        writes chunks, so the file is streamed to disk frame by frame.
+        
+        Args:
+            frames: List of ANSI frames
+            delays: List of frame delays in milliseconds
+            output_path: Output .png file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+            font_size: Font size in pixels
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            merged = VideoExporter.merge_repeated_frames(frames, delays)
+            columns, rows = VideoExporter.get_grid_size(frame for frame, _ in merged)
+            atlas = GlyphAtlas(DEFAULT_FONT_PATH, font_size)
+            merged_delays = iter([delay for _, delay in merged])
+            
+            with atomic_write(output_path, binary=True) as f:
+                writer = _ApngWriter(f, columns * atlas.cell_width, rows * atlas.cell_height, len(merged))
+                VideoExporter.render_frames(
+                    _render_png_frame, [(frame,) for frame, _ in merged], (columns, rows),
+                    lambda compressed: writer.write_frame(compressed, next(merged_delays)),
+                    font_size, progress, cancel_check
+                )
+                writer.close()
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to APNG: {e}")
+            return False
+    
+    @staticmethod
+    def export_to_mp4(frames: List[str], delays: List[int], output_path: str,
+                      progress: Optional[ProgressCallback] = None,
+                      cancel_check: Optional[CancelCheck] = None,
+                      font_size: int = DEFAULT_FONT_SIZE) -> bool:
+        """
+        Export as an H.264 MP4 video (needs imageio with the ffmpeg plugin)
+        
+        The video runs at a constant frame rate derived from the shortest
+        delay; frames are repeated to follow the original timeline. Frames
+        are piped to ffmpeg as they are rendered.
+        
+        Args:
+            frames: List of ANSI frames
+            delays: List of frame delays in milliseconds
+            output_path: Output .mp4 file path
+            progress: Optional per-frame progress callback
+            cancel_check: Optional callable that returns True to cancel
+            font_size: Font size in pixels
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            import imageio.v2 as imageio
+        except ImportError:
+            print("Error exporting to MP4: imageio is not installed")
+            return False
+        
+        try:
+            count = min(len(frames), len(delays))
+            columns, rows = VideoExporter.get_grid_size(frames[:count])
+            atlas = GlyphAtlas(DEFAULT_FONT_PATH, font_size)
+            width = columns * atlas.cell_width
+            height = rows * atlas.cell_height
+            shape = (height + height % 2, width + width % 2, 3)
+            
+            fps = min(MP4_MAX_FPS, max(1, round(1000 / max(1, min(delays[:count], default=100)))))
+            timeline = {'elapsed': 0, 'written': 0, 'index': 0}
+            
+            with atomic_path(output_path) as tmp_path:
+                writer = imageio.get_writer(
+                    tmp_path, format='FFMPEG', mode='I', fps=fps,
+                    codec='libx264', pixelformat='yuv420p', macro_block_size=2
+                )
+                
+                def append(data):
+                    # Repeat the frame until the video catches up with its end time
+                    timeline['elapsed'] += delays[timeline['index']]
+                    timeline['index'] += 1
+                    target = max(timeline['written'] + 1, round(timeline['elapsed'] * fps / 1000))
+                    pixels = np.frombuffer(data, dtype=np.uint8).reshape(shape)
+                    for _ in range(target - timeline['written']):
+                        writer.append_data(pixels)
+                    timeline['written'] = target
+                
+                try:
+                    VideoExporter.render_frames(
+                        _render_rgb_frame, [(frame,) for frame in frames[:count]], (columns, rows),
+                        append, font_size, progress, cancel_check
+                    )
+                finally:
+                    writer.close()
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting to MP4: {e}")
+            return False
+    
+    @staticmethod
+    def export_to_sprite_sheet(frames: List[str], delays: List[int], output_path: str,
+                               progress: Optional[ProgressCallback] = None,
+                               cancel_check: Optional[CancelCheck] = None,
+                               font_size: int = DEFAULT_FONT_SIZE,
+                               memory_budget: int = PNG_MEMORY_BUDGET) -> bool:
+        """
+        Export as a PNG sprite sheet with a JSON frame map
+        
+        Each distinct frame is packed into the sheet once; the frame map
+        (same name as the image, .json extension) lists every frame in
+        order with its sprite rectangle and delay. Sprites are rendered
+        in worker processes and composited into the sheet as one row of
+        sprites at a time, so no full-size image is held in memory; the
+        number of sprites per row is limited to fit memory_budget.
+        
+        Args:
+            frames: List of ANSI frames
+            delays: List of frame delays in milliseconds
+            output_path: Output .png file path
+            progress: Optional per-sprite progress callback
+            cancel_check: Optional callable that returns True to cancel
+            font_size: Font size in pixels
+            memory_budget: Approximate bytes for one row of sprites
+        
+        Returns:
+            True if successful, False otherwise (including cancelled)
+        """
+        try:
+            count = min(len(frames), len(delays))
+            
+            # Identical frames share one sprite
+            sprite_ids = {}
+            frame_sprites = []
+            for frame in frames[:count]:
+                sprite_id = sprite_ids.setdefault(frame, len(sprite_ids))
+                frame_sprites.append(sprite_id)
+            sprites = list(sprite_ids)
+            
+            columns, rows = VideoExporter.get_grid_size(sprites)
+            atlas = GlyphAtlas(DEFAULT_FONT_PATH, font_size)
+            sprite_width = columns * atlas.cell_width
+            sprite_height = rows * atlas.cell_height
+            sheet_columns, sheet_rows = VideoExporter.get_sheet_layout(
+                len(sprites), sprite_width, sprite_height, memory_budget
+            )
+            
+            rects = [
+                {
+                    'x': (index % sheet_columns) * sprite_width,
+                    'y': (index // sheet_columns) * sprite_height,
+                    'w': sprite_width,
+                    'h': sprite_height,
+                }
+                for index in range(len(sprites))
+            ]
+            frame_map = {
+                'image': os.path.basename(output_path),
+                'size': {'w': sheet_columns * sprite_width, 'h': sheet_rows * sprite_height},
+                'sprites': rects,
+                'frames': [
+                    dict(rects[sprite_id], sprite=sprite_id, delay=delays[index])
+                    for index, sprite_id in enumerate(frame_sprites)
+                ],
+            }
+            
+            with atomic_write(output_path, binary=True) as f:
+                writer = _SpriteSheetWriter(
+                    f, sprite_width, sprite_height, sheet_columns, sheet_rows, atlas.background
+                )
+                VideoExporter.render_frames(
+                    _render_sprite, [(sprite,) for sprite in sprites], (columns, rows),
+                    writer.add_sprite, font_size, progress, cancel_check
+                )
+                writer.close()
+            
+            with atomic_write(os.path.splitext(output_path)[0] + '.json') as f:
+                json.dump(frame_map, f, indent=2)
+            
+            return True
+        except ExportCancelled:
+            return False
+        except Exception as e:
+            print(f"Error exporting sprite sheet: {e}")
+            return False
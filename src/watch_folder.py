@@ -0,0 +1,282 @@
+"""
+Watch Folder
+Watches a folder and converts new and changed images and GIFs to ASCII art
+as they arrive, without Qt
+
+Usage:
+    python src/watch_folder.py incoming/ -f html -o out/ --interval 1 --settle 2
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import signal
+import sys
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ProcessPoolExecutor, wait
+from typing import Dict, List, Optional, Tuple
+
+from rich.console import Console
+
+from batch_convert import (ConversionResult, add_conversion_arguments, convert_file,
+                           get_settings_from_args, plan_outputs)
+from conversion import IMAGE_EXTENSIONS
+from gif_exporter import atomic_write
+
+# Remembers converted files between runs (in the output folder, or the watched folder)
+STATE_FILE_NAME = '.ascii_watch_state.json'
+STATE_VERSION = 1
+
+# File size and modification time, as seen by a poll
+Signature = Tuple[int, int]
+
+
+def get_fingerprint(source: str, output_format: str, settings: Dict) -> str:
+    """Hash a file's contents together with the output format and conversion settings"""
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(json.dumps([output_format, settings], sort_keys=True).encode('utf-8'))
+    with open(source, 'rb') as f:
+        while chunk := f.read(1024 * 1024):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _init_worker():
+    """Leave Ctrl+C to the watcher; it shuts the pool down"""
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+
+
+def convert_if_changed(source: str, output_path: str, output_format: str, settings: Dict,
+                       known_fingerprint: Optional[str]) -> Tuple[Optional[str], Optional[ConversionResult]]:
+    """
+    Convert a file unless its fingerprint matches the last conversion (runs in a worker process)
+    
+    Returns:
+        (fingerprint, result); result is None when the file was skipped.
+        Never raises; errors are returned in the result.
+    """
+    try:
+        fingerprint = get_fingerprint(source, output_format, settings)
+    except OSError as e:
+        result = ConversionResult(source, output_path)
+        result.error = str(e)
+        return None, result
+    
+    if fingerprint == known_fingerprint and os.path.exists(output_path):
+        return fingerprint, None
+    return fingerprint, convert_file(source, output_path, output_format, settings)
+
+
+class FolderWatcher:
+    """
+    Converts images and GIFs in a folder tree whenever they are added or changed
+    
+    The folder is polled (this also works on network shares, where change
+    notifications are unreliable). A file is converted only once its size
+    and modification time stayed the same for one poll and it was last
+    modified at least settle seconds ago, so files that are still being
+    copied are left alone. Conversions run in a process pool with a
+    bounded number of files queued ahead. Files whose contents, format
+    and settings match their last conversion are skipped, also across
+    restarts.
+    """
+    
+    def __init__(self, root: str, output_format: str, settings: Dict, output_dir: Optional[str] = None,
+                 jobs: int = 1, interval: float = 1.0, settle: float = 2.0,
+                 console: Optional[Console] = None):
+        self.root = root
+        self.output_format = output_format
+        self.settings = settings
+        self.output_dir = output_dir
+        self.jobs = max(1, jobs)
+        self.interval = interval
+        self.settle = settle
+        self.console = console or Console(stderr=True)
+        
+        self.state_path = os.path.join(output_dir or root, STATE_FILE_NAME)
+        self.state: Dict[str, Dict] = {}
+        self.state_changed = False
+        
+        self.seen: Dict[str, Signature] = {}
+        self.pending = deque()
+        self.queued = set()
+        self.in_flight: Dict[Future, Tuple[str, Signature]] = {}
+        self.converted = 0
+        self.failed = 0
+    
+    def load_state(self):
+        """Load what was converted by earlier runs with the same format and settings"""
+        try:
+            with open(self.state_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+        
+        if (data.get('version') == STATE_VERSION and data.get('format') == self.output_format
+                and data.get('settings') == self.settings):
+            self.state = data.get('files', {})
+    
+    def save_state(self):
+        """Write the state file if anything changed"""
+        if not self.state_changed:
+            return
+        try:
+            os.makedirs(os.path.dirname(os.path.abspath(self.state_path)), exist_ok=True)
+            with atomic_write(self.state_path) as f:
+                json.dump({'version': STATE_VERSION, 'format': self.output_format,
+                           'settings': self.settings, 'files': self.state}, f, indent=1)
+            self.state_changed = False
+        except OSError as e:
+            self.console.print(f"[red]Could not save {self.state_path}: {e}[/red]")
+    
+    def scan(self) -> Dict[str, Tuple[str, Signature]]:
+        """
+        List the image files under the watched folder
+        
+        Returns:
+            {relative path: (source path, signature)}
+        """
+        skip_dir = os.path.normcase(os.path.abspath(self.output_dir)) if self.output_dir else None
+        files = {}
+        for directory, subdirectories, names in os.walk(self.root):
+            subdirectories[:] = sorted(
+                name for name in subdirectories
+                if not name.startswith('.')
+                and os.path.normcase(os.path.abspath(os.path.join(directory, name))) != skip_dir
+            )
+            for name in sorted(names):
+                if name.startswith('.') or not name.lower().endswith(IMAGE_EXTENSIONS):
+                    continue
+                source = os.path.join(directory, name)
+                try:
+                    stat = os.stat(source)
+                except OSError:
+                    continue
+                files[os.path.relpath(source, self.root)] = (source, (stat.st_size, stat.st_mtime_ns))
+        return files
+    
+    def poll(self):
+        """Queue files that settled since the last poll and forget deleted ones"""
+        files = self.scan()
+        now = time.time_ns()
+        
+        for relative in set(self.state) - set(files):
+            del self.state[relative]
+            self.state_changed = True
+        
+        plan = dict(plan_outputs([(source, relative) for relative, (source, _) in files.items()],
+                                 self.output_format, self.output_dir))
+        for relative, (source, signature) in files.items():
+            if relative in self.queued or self.seen.get(relative) != signature:
+                continue
+            if now - signature[1] < self.settle * 1e9:
+                continue
+            
+            entry = self.state.get(relative)
+            if entry and (entry['size'], entry['mtime_ns']) == signature and \
+                    (entry['fingerprint'] is None or os.path.exists(plan[source])):
+                continue
+            
+            self.pending.append((relative, source, plan[source], signature))
+            self.queued.add(relative)
+        
+        self.seen = {relative: signature for relative, (_, signature) in files.items()}
+    
+    def submit(self, pool: ProcessPoolExecutor):
+        """Keep a couple of files per worker queued in the pool"""
+        while self.pending and len(self.in_flight) < self.jobs * 2:
+            relative, source, output_path, signature = self.pending.popleft()
+            entry = self.state.get(relative)
+            future = pool.submit(convert_if_changed, source, output_path, self.output_format,
+                                 self.settings, entry['fingerprint'] if entry else None)
+            self.in_flight[future] = (relative, signature)
+    
+    def finish(self, future: Future):
+        """Record and log a finished conversion"""
+        relative, signature = self.in_flight.pop(future)
+        self.queued.discard(relative)
+        
+        try:
+            fingerprint, result = future.result()
+        except Exception as e:
+            fingerprint, result = None, ConversionResult(relative, '')
+            result.error = str(e) or type(e).__name__
+        
+        if result is None:
+            self.console.print(f"[dim]= {relative} (unchanged)[/dim]")
+        elif result.error:
+            self.failed += 1
+            self.console.print(f"[red]✗ {relative}: {result.error}[/red]")
+        else:
+            self.converted += 1
+            self.console.print(f"[green]✓[/green] {relative} → {result.output} "
+                               f"({result.frames} frames, {result.seconds:.1f}s)")
+        
+        # Failed files are retried once they change
+        self.state[relative] = {'size': signature[0], 'mtime_ns': signature[1],
+                                'fingerprint': None if result and result.error else fingerprint}
+        self.state_changed = True
+    
+    def run(self):
+        """Watch until interrupted (Ctrl+C)"""
+        self.load_state()
+        pool = ProcessPoolExecutor(max_workers=self.jobs, initializer=_init_worker)
+        next_poll = 0.0
+        try:
+            while True:
+                if time.monotonic() >= next_poll:
+                    self.poll()
+                    next_poll = time.monotonic() + self.interval
+                self.submit(pool)
+                
+                timeout = max(0.0, next_poll - time.monotonic())
+                if self.in_flight:
+                    done, _ = wait(self.in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        self.finish(future)
+                    self.save_state()
+                else:
+                    time.sleep(timeout)
+        finally:
+            # Keep the conversions that were already running
+            pool.shutdown(cancel_futures=True)
+            for future in list(self.in_flight):
+                if not future.cancelled():
+                    self.finish(future)
+            self.save_state()
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Convert images and GIFs to ASCII art as they appear in a folder")
+    parser.add_argument('folder', help="folder to watch (including subfolders)")
+    parser.add_argument('--interval', type=float, default=1.0, help="seconds between polls (default: 1)")
+    parser.add_argument('--settle', type=float, default=2.0,
+                        help="seconds a file must stay unmodified before it is converted (default: 2)")
+    add_conversion_arguments(parser)
+    return parser
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    args = build_parser().parse_args(argv)
+    console = Console(stderr=True)
+    settings = get_settings_from_args(args)
+    
+    if not os.path.isdir(args.folder):
+        console.print(f"[red]Not a folder: {args.folder}[/red]")
+        return 1
+    
+    watcher = FolderWatcher(args.folder, args.format, settings, output_dir=args.output, jobs=args.jobs,
+                            interval=args.interval, settle=args.settle, console=console)
+    console.print(f"Watching {args.folder} with {watcher.jobs} processes (Ctrl+C to stop)")
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    console.print(f"Converted {watcher.converted} files, {watcher.failed} failed")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,68 @@
+"""
+Window Visibility
+Tracks whether a top-level window is actually on screen so animations can
+stop rendering while nobody can see them
+"""
+
+from PyQt6 import sip
+from PyQt6.QtCore import QObject, QEvent, pyqtSignal
+
+
+class WindowVisibilityWatcher(QObject):
+    """
+    Watches a top-level widget for hide, minimize and occlusion
+    
+    Occlusion is detected through the platform window's exposed state,
+    which most window systems clear when the window is fully covered.
+    Emits visibility_changed only when the on-screen state flips. Window
+    opacity is not checked: the widgets' opacity sliders stop at 30%,
+    so a window is never effectively invisible that way.
+    """
+    
+    visibility_changed = pyqtSignal(bool)  # on_screen
+    
+    WATCHED_EVENTS = (
+        QEvent.Type.Show,
+        QEvent.Type.Hide,
+        QEvent.Type.WindowStateChange,
+        QEvent.Type.Expose,
+    )
+    
+    def __init__(self, window):
+        super().__init__(window)
+        self.window = window
+        self.is_on_screen = True
+        self._handle = None
+        window.installEventFilter(self)
+    
+    def eventFilter(self, obj, event):
+        # Hide events still arrive while the window is being destroyed
+        if sip.isdeleted(self.window):
+            return False
+        if event.type() in self.WATCHED_EVENTS:
+            if event.type() == QEvent.Type.Show:
+                self._watch_handle()
+            self.refresh()
+        return False
+    
+    def _watch_handle(self):
+        """Install the filter on the platform window to receive expose events"""
+        handle = self.window.windowHandle()
+        if handle is not None and handle is not self._handle:
+            handle.installEventFilter(self)
+            self._handle = handle
+    
+    def check_on_screen(self) -> bool:
+        """Check if any part of the window can currently be seen"""
+        window = self.window
+        if not window.isVisible() or window.isMinimized():
+            return False
+        handle = window.windowHandle()
+        return handle is None or handle.isExposed()
+    
+    def refresh(self):
+        """Re-check visibility"""
+        on_screen = self.check_on_screen()
+        if on_screen != self.is_on_screen:
+            self.is_on_screen = on_screen
+            self.visibility_changed.emit(on_screen)
@@ -0,0 +1,204 @@
+"""
+Tests for the local HTTP conversion service
+
+Every test starts a ConversionServer on 127.0.0.1 with an ephemeral port
+and talks to it over a real socket.
+
+Usage:
+    python -m pytest tests
+"""
+
+import asyncio
+import io
+import json
+import os
+import sys
+import unittest
+
+from PIL import Image
+from rich.console import Console
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from batch_convert import get_conversion_settings
+from conversion_server import ConversionServer
+
+
+def make_png() -> bytes:
+    image = Image.new('RGB', (32, 16))
+    image.putdata([(x * 8, y * 16, 128) for y in range(16) for x in range(32)])
+    buffer = io.BytesIO()
+    image.save(buffer, 'PNG')
+    return buffer.getvalue()
+
+
+def make_gif(frame_count: int = 3) -> bytes:
+    frames = [Image.new('RGB', (16, 16), (80 * index, 40, 200 - 60 * index)) for index in range(frame_count)]
+    buffer = io.BytesIO()
+    frames[0].save(buffer, 'GIF', save_all=True, append_images=frames[1:], duration=100, loop=0)
+    return buffer.getvalue()
+
+
+class ConversionServerTest(unittest.IsolatedAsyncioTestCase):
+    
+    MAX_UPLOAD = 64 * 1024
+    
+    async def asyncSetUp(self):
+        self.server = ConversionServer(get_conversion_settings({'width': 20}), jobs=1, max_queue=4,
+                                       max_upload=self.MAX_UPLOAD, console=Console(file=io.StringIO()))
+        self.listener = await self.server.start('127.0.0.1', 0)
+        self.port = self.listener.sockets[0].getsockname()[1]
+    
+    async def asyncTearDown(self):
+        self.listener.close()
+        await self.server.shutdown(timeout=5)
+        await self.listener.wait_closed()
+        self.server.close()
+    
+    async def request(self, method: str, path: str, body: bytes = b'', headers: dict = None):
+        """Send one request and return (status, headers, body)"""
+        reader, writer = await asyncio.open_connection('127.0.0.1', self.port)
+        try:
+            headers = {'Content-Length': str(len(body)), 'Connection': 'close', **(headers or {})}
+            head = f'{method} {path} HTTP/1.1\r\nHost: 127.0.0.1\r\n'
+            head += ''.join(f'{name}: {value}\r\n' for name, value in headers.items())
+            writer.write(head.encode('latin-1') + b'\r\n' + body)
+            await writer.drain()
+            
+            response = await asyncio.wait_for(reader.read(), 60)
+        finally:
+            writer.close()
+        
+        head, _, content = response.partition(b'\r\n\r\n')
+        lines = head.decode('latin-1').split('\r\n')
+        response_headers = {}
+        for line in lines[1:]:
+            name, _, value = line.partition(':')
+            response_headers[name.strip().lower()] = value.strip()
+        return int(lines[0].split()[1]), response_headers, content
+    
+    async def wait_until(self, condition, timeout: float = 10.0):
+        deadline = asyncio.get_running_loop().time() + timeout
+        while not condition():
+            if asyncio.get_running_loop().time() > deadline:
+                self.fail("condition not reached")
+            await asyncio.sleep(0.01)
+    
+    async def test_convert_txt(self):
+        status, headers, body = await self.request('POST', '/convert?format=txt', make_png())
+        self.assertEqual(status, 200)
+        self.assertTrue(headers['content-type'].startswith('text/plain'))
+        self.assertEqual(headers['x-frames'], '1')
+        self.assertNotIn(b'\x1b', body)
+        self.assertTrue(body.strip())
+    
+    async def test_convert_ansi(self):
+        status, headers, body = await self.request('POST', '/convert?format=ansi', make_png())
+        self.assertEqual(status, 200)
+        self.assertIn(b'\x1b[', body)
+    
+    async def test_convert_html_animation(self):
+        status, headers, body = await self.request('POST', '/convert?format=html', make_gif(3))
+        self.assertEqual(status, 200)
+        self.assertTrue(headers['content-type'].startswith('text/html'))
+        self.assertEqual(headers['x-frames'], '3')
+        self.assertIn(b'<html', body.lower())
+    
+    async def test_status_counters(self):
+        png = make_png()
+        await self.request('POST', '/convert?format=txt', png)
+        await self.request('POST', '/convert?format=txt', png)
+        
+        status, headers, body = await self.request('GET', '/status')
+        self.assertEqual(status, 200)
+        self.assertEqual(headers['content-type'], 'application/json')
+        counters = json.loads(body)
+        self.assertEqual(counters['converted'], 1)
+        self.assertEqual(counters['failed'], 0)
+        self.assertEqual(counters['cache']['entries'], 1)
+        self.assertEqual(counters['cache']['hits'], 1)
+        self.assertEqual(counters['cache']['misses'], 1)
+    
+    async def test_bad_parameters(self):
+        png = make_png()
+        for query in ('format=pdf', 'width=abc', 'width=0', 'invert=maybe', 'character_set=nope', 'colour=red'):
+            with self.subTest(query=query):
+                status, _, _ = await self.request('POST', f'/convert?{query}', png)
+                self.assertEqual(status, 400)
+        
+        status, _, _ = await self.request('POST', '/convert', b'')
+        self.assertEqual(status, 400)
+        status, _, _ = await self.request('POST', '/convert', png, {'Content-Length': '-1'})
+        self.assertEqual(status, 400)
+    
+    async def test_upload_too_large(self):
+        # Only the headers are sent; the server must refuse before reading the body
+        status, headers, _ = await self.request('POST', '/convert',
+                                                headers={'Content-Length': str(self.MAX_UPLOAD + 1)})
+        self.assertEqual(status, 413)
+        self.assertEqual(headers['connection'], 'close')
+    
+    async def test_queue_full(self):
+        self.server.max_queue = 0
+        # Occupy the only worker slot
+        await self.server.slots.acquire()
+        try:
+            status, headers, _ = await self.request('POST', '/convert', make_png())
+        finally:
+            self.server.slots.release()
+        
+        self.assertEqual(status, 503)
+        self.assertEqual(headers['retry-after'], '1')
+        self.assertEqual(self.server.rejected, 1)
+    
+    async def test_cache_hit_and_miss(self):
+        png = make_png()
+        _, first, _ = await self.request('POST', '/convert?format=ansi', png)
+        _, second, _ = await self.request('POST', '/convert?format=ansi', png)
+        _, other_settings, _ = await self.request('POST', '/convert?format=ansi&invert=true', png)
+        self.assertEqual(first['x-cache'], 'miss')
+        self.assertEqual(second['x-cache'], 'hit')
+        self.assertEqual(other_settings['x-cache'], 'miss')
+    
+    async def test_identical_requests_share_conversion(self):
+        png = make_png()
+        # Hold the worker slot until all three requests are waiting
+        await self.server.slots.acquire()
+        requests = [asyncio.create_task(self.request('POST', '/convert?format=txt', png)) for _ in range(3)]
+        try:
+            await self.wait_until(lambda: self.server.cache.misses == 3)
+        finally:
+            self.server.slots.release()
+        responses = await asyncio.gather(*requests)
+        
+        self.assertEqual([status for status, _, _ in responses], [200, 200, 200])
+        self.assertEqual(sorted(headers['x-cache'] for _, headers, _ in responses),
+                         ['coalesced', 'coalesced', 'miss'])
+        self.assertEqual(len({body for _, _, body in responses}), 1)
+        self.assertEqual(self.server.converted, 1)
+    
+    async def test_cancelled_request_leaves_waiters_served(self):
+        png = make_png()
+        settings = get_conversion_settings({'width': 20})
+        await self.server.slots.acquire()
+        first = asyncio.create_task(self.server.convert(png, 'txt', settings))
+        second = asyncio.create_task(self.server.convert(png, 'txt', settings))
+        try:
+            await self.wait_until(lambda: self.server.cache.misses == 2)
+            # The request that started the conversion goes away
+            first.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await first
+        finally:
+            self.server.slots.release()
+        
+        content, frames, cache_state = await asyncio.wait_for(second, 60)
+        self.assertEqual(cache_state, 'coalesced')
+        self.assertEqual(frames, 1)
+        self.assertTrue(content.strip())
+        self.assertEqual(self.server.converted, 1)
+        self.assertEqual(self.server.in_progress, {})
+
+
+if __name__ == '__main__':
+    unittest.main()